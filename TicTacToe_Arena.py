@@ -0,0 +1,268 @@
+"""
+Self-play arena for comparing two configurations of the TicTacToe engine.
+
+Each configuration is a set of keyword arguments for TicTacToeGame, such as a time budget or a fixed depth, and plays
+without the opening book and tablebase unless it turns them on. The arena plays many headless games between the two,
+alternating which one plays X (who always moves first), and spreads the games over a process pool. Every finished
+game is appended to a JSON lines log as soon as it comes in, and at the end a report per board size gives win, draw,
+and loss rates, mean and 99th percentile move latency, and points scored per CPU-second of search for each
+configuration.
+
+    python TicTacToe_Arena.py --engine-a '{"time_budget": 1.0}' --engine-b '{"time_budget": 0.2}' --sizes 3 4 5
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter, process_time
+
+import argparse
+import json
+import random
+
+from TicTacToe_Bitboard import GAME_VALS, BOARD_SIZES
+from TicTacToe_Engine import new_game, GAME_STATUS
+from TicTacToe_SearchStats import percentile
+
+ENGINE_NAMES = ('A', 'B')
+
+# Points per game, for strength per CPU-second
+GAME_POINTS = {
+    'win': 1.0,
+    'draw': 0.5,
+    'loss': 0.0
+}
+
+ARENA_SEED = 2022
+
+# Settings both configurations play with unless theirs say otherwise. Without them both would play the small boards
+# from the same tablebase and book, and the games would only measure those, not the settings being compared.
+DEFAULT_ENGINE_SETTINGS = {
+    'use_opening_book': False,
+    'use_tablebase': False
+}
+
+
+def play_arena_game(game_number, game_size, engine_settings, x_engine, opening_plies, seed):
+    """
+    Plays one game between the two configurations. Runs in a worker process of run_arena.
+
+    Args:
+        game_number (integer): Number of the game within the run
+        game_size (integer): Length of one side of the board
+        engine_settings (dict): Keys are ENGINE_NAMES, values are keyword arguments for TicTacToeGame
+        x_engine (string): Name of the configuration playing X
+        opening_plies (integer): Moves played at random before the engines take over, so games differ
+        seed (integer): Seed for the random opening moves, and the engines' random choices
+
+    Returns:
+        (dict): The game's result, with every move and the time each engine took for its moves
+    """
+
+    random.seed(seed)
+    o_engine = ENGINE_NAMES[1] if x_engine == ENGINE_NAMES[0] else ENGINE_NAMES[0]
+    players = {GAME_VALS['X']: x_engine, GAME_VALS['O']: o_engine}
+
+    # Each engine keeps its own copy of the game, both are told every move
+    games = {name: new_game(game_size, first_player=GAME_VALS['X'], **dict(DEFAULT_ENGINE_SETTINGS, **settings))
+             for name, settings in engine_settings.items()}
+    latencies = {name: [] for name in ENGINE_NAMES}
+    cpu_seconds = {name: 0.0 for name in ENGINE_NAMES}
+    nodes = {name: 0 for name in ENGINE_NAMES}
+    moves = []
+
+    try:
+        status = GAME_STATUS['IN_PROGRESS']
+        while status == GAME_STATUS['IN_PROGRESS']:
+            mover = players[games[x_engine].get_turn()]
+            if len(moves) < opening_plies:
+                coordinates = random.choice([coords for coords, vals in games[mover].game_data.items()
+                                             if vals == GAME_VALS['EMPTY']])
+            else:
+                start_time = perf_counter()
+                start_cpu = process_time()
+                coordinates, search_stats = games[mover].find_next_move_for_computer()
+                cpu_seconds[mover] += process_time() - start_cpu
+                latencies[mover].append(perf_counter() - start_time)
+                nodes[mover] += search_stats.nodes
+
+            moves.append(list(coordinates))
+            for game in games.values():
+                status = game.play_move(coordinates)
+    finally:
+        for game in games.values():
+            game.shutdown_workers()
+
+    if status == GAME_STATUS['X_WON']:
+        winner = x_engine
+    elif status == GAME_STATUS['O_WON']:
+        winner = o_engine
+    else:
+        winner = None
+
+    return {
+        'game': game_number,
+        'game_size': game_size,
+        'seed': seed,
+        'x_engine': x_engine,
+        'status': status,
+        'winner': winner,
+        'moves': moves,
+        'latencies': latencies,
+        'cpu_seconds': cpu_seconds,
+        'nodes': nodes
+    }
+
+
+def summarize_results(results):
+    """
+    Totals game results per board size
+
+    Args:
+        results (list): Results from play_arena_game
+
+    Returns:
+        (dict): Keys are board sizes, values hold the game count, draws, and per configuration its wins, losses,
+            points, move latencies, CPU-seconds, and points per CPU-second
+    """
+
+    summary = {}
+    for result in results:
+        size_summary = summary.setdefault(result['game_size'], {
+            'games': 0,
+            'draws': 0,
+            'engines': {name: {'wins': 0, 'losses': 0, 'points': 0.0, 'latencies': [], 'cpu_seconds': 0.0,
+                               'nodes': 0}
+                        for name in ENGINE_NAMES}
+        })
+        size_summary['games'] += 1
+        if result['winner'] is None:
+            size_summary['draws'] += 1
+
+        for name, engine_summary in size_summary['engines'].items():
+            if result['winner'] is None:
+                engine_summary['points'] += GAME_POINTS['draw']
+            elif result['winner'] == name:
+                engine_summary['wins'] += 1
+                engine_summary['points'] += GAME_POINTS['win']
+            else:
+                engine_summary['losses'] += 1
+                engine_summary['points'] += GAME_POINTS['loss']
+
+            engine_summary['latencies'].extend(result['latencies'][name])
+            engine_summary['cpu_seconds'] += result['cpu_seconds'][name]
+            engine_summary['nodes'] += result['nodes'][name]
+
+    for size_summary in summary.values():
+        for engine_summary in size_summary['engines'].values():
+            latencies = engine_summary.pop('latencies')
+            engine_summary['moves'] = len(latencies)
+            engine_summary['mean_latency'] = sum(latencies) / len(latencies) if latencies else 0.0
+            engine_summary['p99_latency'] = percentile(latencies, 0.99)
+            if engine_summary['cpu_seconds']:
+                engine_summary['points_per_cpu_second'] = engine_summary['points'] / engine_summary['cpu_seconds']
+            else:
+                engine_summary['points_per_cpu_second'] = None
+
+    return summary
+
+
+def format_summary(summary):
+    """
+    Args:
+        summary (dict): Output of summarize_results
+
+    Returns:
+        (string): Report with a few lines per board size
+    """
+
+    lines = []
+    for game_size in sorted(summary):
+        size_summary = summary[game_size]
+        games = size_summary['games']
+        engines = size_summary['engines']
+        lines.append(f"{game_size}x{game_size}: {games} games, A won {engines['A']['wins'] / games:.1%}, "
+                     f"drew {size_summary['draws'] / games:.1%}, lost {engines['A']['losses'] / games:.1%}")
+
+        for name, engine_summary in engines.items():
+            strength = engine_summary['points_per_cpu_second']
+            strength = f"{strength:.2f} points/CPU-s" if strength is not None else "no CPU time used"
+            lines.append(f"    {name}: {engine_summary['points']:.1f} points, "
+                         f"mean move {engine_summary['mean_latency'] * 1000:.1f} ms, "
+                         f"p99 move {engine_summary['p99_latency'] * 1000:.1f} ms, "
+                         f"{engine_summary['cpu_seconds']:.2f} CPU-s, {strength}")
+
+    return '\n'.join(lines)
+
+
+def run_arena(engine_settings, sizes, games_per_size, opening_plies=2, workers=None, log_path=None,
+              seed=ARENA_SEED):
+    """
+    Plays every game across a process pool, logging each result as it finishes
+
+    Args:
+        engine_settings (dict): Keys are ENGINE_NAMES, values are keyword arguments for TicTacToeGame
+        sizes (list): Board sizes to play on
+        games_per_size (integer): Games per board size, each configuration plays X in half of them
+        opening_plies (integer): Moves played at random at the start of each game
+        workers (integer): Games played at once, None for one per CPU
+        log_path (string): JSON lines file to append each game's result to, None for no log
+        seed (integer): Seed the games' seeds are drawn from, so a run can be repeated
+
+    Returns:
+        (list): Results from play_arena_game, in the order they finished
+    """
+
+    rng = random.Random(seed)
+    tasks = []
+    for game_size in sizes:
+        for game_index in range(games_per_size):
+            x_engine = ENGINE_NAMES[game_index % 2]
+            tasks.append((len(tasks), game_size, engine_settings, x_engine, opening_plies, rng.getrandbits(32)))
+
+    results = []
+    log_file = open(log_path, 'a') if log_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as process_pool:
+            futures = [process_pool.submit(play_arena_game, *task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if log_file is not None:
+                    log_file.write(json.dumps(result) + '\n')
+                    log_file.flush()
+    finally:
+        if log_file is not None:
+            log_file.close()
+
+    return results
+
+
+def main():
+    """Runs the arena with the settings given on the command line"""
+
+    parser = argparse.ArgumentParser(description="Play two TicTacToe engine configurations against each other")
+    parser.add_argument('--engine-a', default='{}', help="TicTacToeGame keyword arguments for A, as JSON")
+    parser.add_argument('--engine-b', default='{}', help="TicTacToeGame keyword arguments for B, as JSON")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 4], choices=BOARD_SIZES,
+                        help="board sizes to play on")
+    parser.add_argument('--games', type=int, default=20, help="games per board size")
+    parser.add_argument('--opening-plies', type=int, default=2,
+                        help="moves played at random at the start of each game, so games differ")
+    parser.add_argument('--workers', type=int, default=None, help="games played at once, defaults to one per CPU")
+    parser.add_argument('--log', default='arena_results.jsonl', help="JSON lines file to append game results to")
+    parser.add_argument('--from-log', help="only report on the results already in this JSON lines file")
+    parser.add_argument('--seed', type=int, default=ARENA_SEED, help="seed for the games' random moves")
+    arguments = parser.parse_args()
+
+    if arguments.from_log:
+        with open(arguments.from_log) as log_file:
+            results = [json.loads(line) for line in log_file if line.strip()]
+    else:
+        engine_settings = {'A': json.loads(arguments.engine_a), 'B': json.loads(arguments.engine_b)}
+        results = run_arena(engine_settings, arguments.sizes, arguments.games, arguments.opening_plies,
+                            arguments.workers, arguments.log, arguments.seed)
+
+    print(format_summary(summarize_results(results)))
+
+
+if __name__ == "__main__":
+    main()
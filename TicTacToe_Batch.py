@@ -0,0 +1,265 @@
+"""
+Batch evaluation of many TicTacToe boards at once, with NumPy.
+
+Boards come in as an (N, n, n) int8 array, using the GAME_VALS encoding: 1 for X, -1 for O, 0 for EMPTY. Every
+board is flattened row-major, and one matrix product with a (spots x lines) membership matrix counts each player's
+marks on every row, column, and diagonal of every board together. Statuses, heuristic scores, and immediate winning
+and blocking moves are then read from the counts with array operations, without a Python loop per board.
+
+Needs NumPy, which the rest of the game doesn't:
+
+    boards = stack_game_data([game_data, ...], 3)
+    evaluation = evaluate_boards(boards)
+    evaluation['status'], evaluation['winning_moves']
+"""
+
+import numpy as np
+
+from TicTacToe_Bitboard import GAME_VALS, BOARD_SIZES, build_line_masks
+from TicTacToe_Engine import GAME_STATUS
+
+# Status codes in the arrays returned, STATUS_NAMES maps them back to the engine's GAME_STATUS values
+STATUS_CODES = {
+    GAME_STATUS['IN_PROGRESS']: 0,
+    GAME_STATUS['X_WON']: 1,
+    GAME_STATUS['O_WON']: 2,
+    GAME_STATUS['TIE']: 3,
+    GAME_STATUS['NO_WIN_POSSIBLE']: 4
+}
+STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+
+_line_matrices = {} # Per board size, (spots x lines) float32 matrix with a 1 where a spot lies on a line
+
+
+def line_matrix(game_size):
+    """
+    Args:
+        game_size (integer): Length of one side of the board
+
+    Returns:
+        (np.ndarray): (game_size ** 2, lines) float32 matrix, 1 where a spot lies on a line. Lines are in the order
+            of build_line_masks: rows, then columns, then the diagonal and anti-diagonal.
+    """
+
+    if game_size not in _line_matrices:
+        line_masks = build_line_masks(game_size)
+        matrix = np.zeros((game_size ** 2, len(line_masks)), dtype=np.float32)
+        for line, mask in enumerate(line_masks):
+            for index in range(game_size ** 2):
+                if mask >> index & 1:
+                    matrix[index, line] = 1
+        _line_matrices[game_size] = matrix
+
+    return _line_matrices[game_size]
+
+
+def stack_game_data(game_datas, game_size):
+    """
+    Adapter from the GUI's dictionary view of boards to the batch array
+
+    Args:
+        game_datas (list): Dictionaries with keys = coordinates of spots, vals are -1 if O spot, 0 if EMPTY, 1 if X
+        game_size (integer): Length of one side of every board
+
+    Returns:
+        (np.ndarray): (N, game_size, game_size) int8 array of the boards
+    """
+
+    boards = np.zeros((len(game_datas), game_size, game_size), dtype=np.int8)
+    for board_number, game_data in enumerate(game_datas):
+        for (row, col), vals in game_data.items():
+            boards[board_number, row, col] = vals
+
+    return boards
+
+
+def check_boards(boards):
+    """
+    Args:
+        boards (array like): (N, n, n) boards in the GAME_VALS encoding
+
+    Raises:
+        ValueError: The boards aren't a stack of square boards of a playable size
+
+    Returns:
+        (np.ndarray): The boards as int8, not copied if they already were
+    """
+
+    boards = np.asarray(boards, dtype=np.int8)
+    if boards.ndim != 3 or boards.shape[1] != boards.shape[2] or boards.shape[1] not in BOARD_SIZES:
+        raise ValueError(f"Expected an (N, n, n) array of boards with n from {BOARD_SIZES[0]} to {BOARD_SIZES[-1]}, "
+                         f"got shape {boards.shape}")
+
+    return boards
+
+
+def line_counts(boards):
+    """
+    Counts each player's marks on every line of every board, with one matrix product per player
+
+    Args:
+        boards (np.ndarray): (N, n, n) int8 boards
+
+    Returns:
+        (tuple): (x_counts, o_counts), each an (N, lines) int8 array in build_line_masks order
+    """
+
+    game_size = boards.shape[1]
+    spots = boards.reshape(len(boards), game_size ** 2)
+    matrix = line_matrix(game_size)
+
+    x_counts = ((spots == GAME_VALS['X']).astype(np.float32) @ matrix).astype(np.int8)
+    o_counts = ((spots == GAME_VALS['O']).astype(np.float32) @ matrix).astype(np.int8)
+
+    return x_counts, o_counts
+
+
+def board_status(boards, x_counts, o_counts):
+    """
+    Finds whether each board is won, tied, can no longer be won, or still in play. A board with lines filled by both
+    players can't come up in a game, and is reported as won by X.
+
+    Args:
+        boards (np.ndarray): (N, n, n) int8 boards
+        x_counts (np.ndarray): X's marks per line, from line_counts
+        o_counts (np.ndarray): O's marks per line, from line_counts
+
+    Returns:
+        (np.ndarray): (N,) int8 array of STATUS_CODES
+    """
+
+    game_size = boards.shape[1]
+    status = np.full(len(boards), STATUS_CODES[GAME_STATUS['IN_PROGRESS']], dtype=np.int8)
+
+    # Later assignments take priority, so they go from least to most decisive
+    every_line_blocked = ((x_counts > 0) & (o_counts > 0)).all(axis=1)
+    status[every_line_blocked] = STATUS_CODES[GAME_STATUS['NO_WIN_POSSIBLE']]
+    board_full = (boards != GAME_VALS['EMPTY']).all(axis=(1, 2))
+    status[board_full] = STATUS_CODES[GAME_STATUS['TIE']]
+    status[(o_counts == game_size).any(axis=1)] = STATUS_CODES[GAME_STATUS['O_WON']]
+    status[(x_counts == game_size).any(axis=1)] = STATUS_CODES[GAME_STATUS['X_WON']]
+
+    return status
+
+
+def heuristic_scores(boards, x_counts, o_counts):
+    """
+    The depth cutoff heuristic of the search, for every board, counted as Bitboard.score_open_lines counts it. Each
+    line holding X's and no O's is 2 points for X (maximizer), each line holding O's and no X's is -2 points for O
+    (minimizer). A filled line counts too, so won boards score as the bitboard scores them.
+
+    Args:
+        boards (np.ndarray): (N, n, n) int8 boards
+        x_counts (np.ndarray): X's marks per line, from line_counts
+        o_counts (np.ndarray): O's marks per line, from line_counts
+
+    Returns:
+        (tuple): (x_scores, o_scores), each an (N,) int16 array
+    """
+
+    x_scores = (2 * ((x_counts > 0) & (o_counts == 0)).sum(axis=1)).astype(np.int16)
+    o_scores = (-2 * ((o_counts > 0) & (x_counts == 0)).sum(axis=1)).astype(np.int16)
+
+    return x_scores, o_scores
+
+
+def whose_turn_on(boards):
+    """
+    Args:
+        boards (np.ndarray): (N, n, n) int8 boards
+
+    Returns:
+        (np.ndarray): (N,) int8 array, 1 where X is to move, -1 where O is. X moves when both players have played
+            the same number of spots.
+    """
+
+    x_spots = (boards == GAME_VALS['X']).sum(axis=(1, 2))
+    o_spots = (boards == GAME_VALS['O']).sum(axis=(1, 2))
+
+    return np.where(x_spots <= o_spots, GAME_VALS['X'], GAME_VALS['O']).astype(np.int8)
+
+
+def completing_spots(boards, own_counts, other_counts):
+    """
+    Finds the empty spots that would complete a line for a player, on every board
+
+    Args:
+        boards (np.ndarray): (N, n, n) int8 boards
+        own_counts (np.ndarray): The player's marks per line, from line_counts
+        other_counts (np.ndarray): The other player's marks per line, from line_counts
+
+    Returns:
+        (np.ndarray): (N, n, n) boolean array, True at every spot that wins for the player
+    """
+
+    game_size = boards.shape[1]
+    one_short = ((own_counts == game_size - 1) & (other_counts == 0)).astype(np.float32)
+    # Spots on at least one line the player is a single mark short of, that are still empty
+    on_open_line = (one_short @ line_matrix(game_size).T) > 0
+
+    return on_open_line.reshape(boards.shape) & (boards == GAME_VALS['EMPTY'])
+
+
+def immediate_moves(boards, x_counts, o_counts, whose_turn):
+    """
+    Finds the moves that win right away for the player to move, and the moves that block the other player from
+    winning on their next turn
+
+    Args:
+        boards (np.ndarray): (N, n, n) int8 boards
+        x_counts (np.ndarray): X's marks per line, from line_counts
+        o_counts (np.ndarray): O's marks per line, from line_counts
+        whose_turn (np.ndarray): (N,) array, 1 where X is to move, -1 where O is
+
+    Returns:
+        (tuple): (winning_moves, blocking_moves), each an (N, n, n) boolean array
+    """
+
+    x_wins = completing_spots(boards, x_counts, o_counts)
+    o_wins = completing_spots(boards, o_counts, x_counts)
+    x_to_move = (whose_turn == GAME_VALS['X'])[:, np.newaxis, np.newaxis]
+
+    winning_moves = np.where(x_to_move, x_wins, o_wins)
+    blocking_moves = np.where(x_to_move, o_wins, x_wins)
+
+    return winning_moves, blocking_moves
+
+
+def evaluate_boards(boards, whose_turn=None):
+    """
+    Evaluates a whole batch of boards
+
+    Args:
+        boards (array like): (N, n, n) boards in the GAME_VALS encoding
+        whose_turn (array like): 1 for X or -1 for O, per board or one for all of them. None to work it out from
+            the number of marks each player has played.
+
+    Raises:
+        ValueError: The boards aren't a stack of square boards of a playable size
+
+    Returns:
+        (dict): Arrays over the N boards, keyed by
+            'status': STATUS_CODES of each board
+            'x_score', 'o_score': the depth cutoff heuristic, as in heuristic_scores
+            'whose_turn': the player to move on each board
+            'winning_moves', 'blocking_moves': boolean (N, n, n) masks, as in immediate_moves
+    """
+
+    boards = check_boards(boards)
+    if whose_turn is None:
+        whose_turn = whose_turn_on(boards)
+    else:
+        whose_turn = np.broadcast_to(np.asarray(whose_turn, dtype=np.int8), (len(boards),))
+
+    x_counts, o_counts = line_counts(boards)
+    x_scores, o_scores = heuristic_scores(boards, x_counts, o_counts)
+    winning_moves, blocking_moves = immediate_moves(boards, x_counts, o_counts, whose_turn)
+
+    return {
+        'status': board_status(boards, x_counts, o_counts),
+        'x_score': x_scores,
+        'o_score': o_scores,
+        'whose_turn': whose_turn,
+        'winning_moves': winning_moves,
+        'blocking_moves': blocking_moves
+    }
@@ -0,0 +1,296 @@
+"""
+Benchmark for the TicTacToe search engine.
+
+Times TicTacToeGame.find_next_move_for_computer over a fixed set of positions: the 3x3 TEST_CASES from
+Minimax_for_TicTacToe.py, plus mid-game positions for every board size, reached by random moves from a fixed seed so
+every run searches the same boards. For each position it reports the wall time, positions searched, positions
+searched per second, and the peak memory allocated by the game and its search.
+
+Results can be saved as JSON, and compared against an earlier run to flag regressions:
+
+    python TicTacToe_Benchmark.py --output baseline.json
+    python TicTacToe_Benchmark.py --compare baseline.json
+"""
+
+from time import perf_counter
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+
+from TicTacToe_Bitboard import Bitboard, GAME_VALS, BOARD_SIZES
+from TicTacToe_Engine import TicTacToeGame, SEARCH_ALGORITHMS
+from Minimax_for_TicTacToe import TEST_CASES
+
+BENCHMARK_SEED = 2022
+SEEDED_POSITIONS_PER_SIZE = 3
+
+# Moves played before the first seeded position of each size. Larger boards start past the random opening, so the
+# search is what gets timed.
+SEEDED_POSITION_FIRST_PLY = {
+    3: 1,
+    4: 5,
+    5: 6,
+    6: 7,
+    7: 8,
+    8: 9,
+    9: 10,
+    10: 11
+}
+
+DEFAULT_REGRESSION_THRESHOLD = 0.10 # Fractional slowdown or growth allowed before a result is flagged
+
+COMPARED_MEASUREMENTS = ('seconds', 'nodes', 'peak_memory_bytes')
+
+
+def whose_turn_in(game_data):
+    """
+    Args:
+        game_data (dict): Keys = coordinates of spots, vals are -1 if O spot, 0 if EMPTY, 1 if X spot
+
+    Returns:
+        (int): -1 for O's turn, 1 for X's turn. X moves when both players have played the same number of spots.
+    """
+
+    x_spots = sum(1 for vals in game_data.values() if vals == GAME_VALS['X'])
+    o_spots = sum(1 for vals in game_data.values() if vals == GAME_VALS['O'])
+
+    return GAME_VALS['X'] if x_spots <= o_spots else GAME_VALS['O']
+
+
+def seeded_position(game_size, plies, seed):
+    """
+    Plays random moves from an empty board, never one that wins, so the game is still going at the end
+
+    Args:
+        game_size (integer): Length of one side of the board
+        plies (integer): Number of moves to play
+        seed (integer): Seed for the random moves
+
+    Returns:
+        (tuple): (x_bits, o_bits, whose_turn) of the position reached
+    """
+
+    rng = random.Random(seed)
+    board = Bitboard(game_size)
+    whose_turn = GAME_VALS['X']
+
+    for _ in range(plies):
+        safe_moves = []
+        for moves in board.available_moves():
+            board.make_move(moves, whose_turn)
+            if not board.last_move_won():
+                safe_moves.append(moves)
+            board.unmake_move()
+
+        board.make_move(rng.choice(safe_moves), whose_turn)
+        whose_turn *= -1
+
+    return board.x_bits, board.o_bits, whose_turn
+
+
+def benchmark_positions(sizes=BOARD_SIZES):
+    """
+    Builds the fixed set of positions to time
+
+    Args:
+        sizes (list): Board sizes to include seeded positions for. TEST_CASES are included when 3 is among them.
+
+    Returns:
+        (list): (name, game_size, x_bits, o_bits, whose_turn) for each position
+    """
+
+    positions = []
+
+    if 3 in sizes:
+        for case_number, game_data in enumerate(TEST_CASES):
+            board = Bitboard.from_game_data(game_data, 3)
+            if board.has_winner() or board.is_full():
+                # Nothing left to search
+                continue
+            positions.append((f"test_case_{case_number}", 3, board.x_bits, board.o_bits, whose_turn_in(game_data)))
+
+    for game_size in sizes:
+        for position_number in range(SEEDED_POSITIONS_PER_SIZE):
+            plies = SEEDED_POSITION_FIRST_PLY[game_size] + position_number
+            x_bits, o_bits, whose_turn = seeded_position(game_size, plies,
+                                                         BENCHMARK_SEED + game_size * 100 + position_number)
+            positions.append((f"seeded_{game_size}x{game_size}_ply_{plies}", game_size, x_bits, o_bits, whose_turn))
+
+    return positions
+
+
+def time_position(game_size, x_bits, o_bits, whose_turn, game_settings):
+    """
+    Runs one computer move search
+
+    Args:
+        game_size (integer): Length of one side of the board
+        x_bits (int): Mask of X's spots
+        o_bits (int): Mask of O's spots
+        whose_turn (int): -1 for O's turn, 1 for X's turn
+        game_settings (dict): Keyword arguments for TicTacToeGame
+
+    Returns:
+        (tuple): (seconds taken, positions searched, coordinates of the move picked)
+    """
+
+    game = TicTacToeGame(game_size, **game_settings)
+    game.set_position(x_bits, o_bits, whose_turn)
+    # Ties between equally scored moves are broken at random, keep the pick the same from run to run
+    random.seed(BENCHMARK_SEED)
+
+    try:
+        start_time = perf_counter()
+        move, search_stats = game.find_next_move_for_computer()
+        seconds = perf_counter() - start_time
+    finally:
+        game.shutdown_workers()
+
+    return seconds, search_stats.nodes, move
+
+
+def run_benchmark(sizes=BOARD_SIZES, repeat=3, measure_memory=True, game_settings=None):
+    """
+    Times every position in the benchmark set
+
+    Args:
+        sizes (list): Board sizes to include
+        repeat (integer): Times each position is searched, the fastest is reported
+        measure_memory (boolean): True to search each position once more under tracemalloc for its peak memory
+        game_settings (dict): Keyword arguments for TicTacToeGame, the opening book and tablebase are always left out
+
+    Returns:
+        (dict): Run settings and a list of results, one per position
+    """
+
+    game_settings = dict(game_settings or {}, use_opening_book=False, use_tablebase=False)
+    results = []
+
+    for name, game_size, x_bits, o_bits, whose_turn in benchmark_positions(sizes):
+        timings = [time_position(game_size, x_bits, o_bits, whose_turn, game_settings) for _ in range(repeat)]
+        seconds, nodes, move = min(timings)
+
+        result = {
+            'name': name,
+            'game_size': game_size,
+            'whose_turn': 'X' if whose_turn == GAME_VALS['X'] else 'O',
+            'move': list(move),
+            'seconds': seconds,
+            'nodes': nodes,
+            'nodes_per_second': nodes / seconds if seconds else 0.0
+        }
+
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                time_position(game_size, x_bits, o_bits, whose_turn, game_settings)
+                result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        results.append(result)
+        print(format_result(result))
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'game_settings': game_settings,
+        'results': results
+    }
+
+
+def format_result(result):
+    """
+    Args:
+        result (dict): One position's result from run_benchmark
+
+    Returns:
+        (string): One line summary of the result
+    """
+
+    line = (f"{result['name']:<26} {result['seconds'] * 1000:>10.1f} ms {result['nodes']:>10} nodes "
+            f"{result['nodes_per_second']:>12,.0f} nodes/s")
+    if 'peak_memory_bytes' in result:
+        line += f" {result['peak_memory_bytes'] / 1024 ** 2:>8.1f} MiB"
+
+    return line
+
+
+def compare_results(baseline, current, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Finds the positions where a measurement grew by more than the threshold since the baseline. Positions missing
+    from either run are skipped.
+
+    Args:
+        baseline (dict): Earlier output of run_benchmark
+        current (dict): Output of run_benchmark to check
+        threshold (float): Fractional growth allowed, 0.1 for 10%
+
+    Returns:
+        (list): (position name, measurement, baseline value, current value) for each regression
+    """
+
+    baseline_results = {result['name']: result for result in baseline['results']}
+    regressions = []
+
+    for result in current['results']:
+        baseline_result = baseline_results.get(result['name'])
+        if baseline_result is None:
+            continue
+
+        for measurement in COMPARED_MEASUREMENTS:
+            if measurement not in result or measurement not in baseline_result:
+                continue
+            if result[measurement] > baseline_result[measurement] * (1 + threshold):
+                regressions.append((result['name'], measurement, baseline_result[measurement], result[measurement]))
+
+    return regressions
+
+
+def main():
+    """Runs the benchmark with the settings given on the command line"""
+
+    parser = argparse.ArgumentParser(description="Benchmark the TicTacToe search engine")
+    parser.add_argument('--sizes', type=int, nargs='+', default=BOARD_SIZES, choices=BOARD_SIZES,
+                        help="board sizes to benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="searches per position, the fastest is reported")
+    parser.add_argument('--no-memory', action='store_true', help="skip the extra search that measures peak memory")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="seconds per move, by default each board size searches to its fixed depth")
+    parser.add_argument('--workers', type=int, default=1, help="processes to split each search across")
+    parser.add_argument('--algorithm', choices=SEARCH_ALGORITHMS, default='minimax', help="search algorithm to time")
+    parser.add_argument('--output', help="file to save the results to as JSON")
+    parser.add_argument('--compare', help="JSON results of an earlier run to check for regressions against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="fractional growth in time, nodes, or memory flagged as a regression")
+    arguments = parser.parse_args()
+
+    game_settings = {'time_budget': arguments.time_budget, 'workers': arguments.workers,
+                     'search_algorithm': arguments.algorithm}
+    current = run_benchmark(arguments.sizes, arguments.repeat, not arguments.no_memory, game_settings)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output_file:
+            json.dump(current, output_file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = compare_results(baseline, current, arguments.threshold)
+        for name, measurement, baseline_value, current_value in regressions:
+            growth = f"{current_value / baseline_value - 1:+.0%}" if baseline_value else "new"
+            print(f"REGRESSION {name}: {measurement} {baseline_value:,.4g} -> {current_value:,.4g} ({growth})")
+
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions over {arguments.threshold:.0%} against {arguments.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,687 @@
+"""
+Integer bitmask board used by the TicTacToe search engine.
+
+Each player's marks are stored in a single integer, with the spot at (row, col) being bit (row * game_size + col).
+Moves are made and unmade with bit operations. Alongside the masks, the board keeps a count of X's and O's on every
+row, column, diagonal, and anti-diagonal, updated only for the lines through the spot being changed. Wins and the
+depth cutoff heuristic are then read from the counts instead of rescanning the board.
+
+The board also carries a Zobrist hash of its position, XOR-ed with a fixed random key per (spot, player) on every make
+and unmake, for keying the transposition table. A square board has 8 symmetries (4 rotations, each optionally
+reflected), so the hashes of all 8 transformed positions are kept packed into one integer, 64 bits per symmetry. The
+smallest of them is the canonical hash shared by every mirror image of the position, and any symmetry whose hash
+matches the untransformed one leaves the position unchanged, making the moves it swaps equivalent.
+
+Bits are laid out row-major, so walking the set bits from lowest to highest visits spots in the same order as the
+game data dictionary built by the GUI.
+"""
+
+import random
+
+GAME_VALS = {
+    'X': 1,
+    'EMPTY': 0,
+    'O': -1
+}
+
+MAX_BOARD_SIZE = 10
+BOARD_SIZES = list(range(3, MAX_BOARD_SIZE + 1))
+
+
+def build_line_masks(game_size):
+    """
+    Builds a mask for every line a player can win on
+
+    Args:
+        game_size (int): Length of one side of the board
+
+    Returns:
+        (list): Masks for each row, then each column, then the diagonal and anti-diagonal
+    """
+
+    rows = []
+    cols = []
+    diag = 0
+    anti_diag = 0
+
+    for row in range(game_size):
+        row_mask = 0
+        col_mask = 0
+        for col in range(game_size):
+            row_mask |= 1 << (row * game_size + col)
+            col_mask |= 1 << (col * game_size + row)
+
+        rows.append(row_mask)
+        cols.append(col_mask)
+        diag |= 1 << (row * game_size + row)
+        anti_diag |= 1 << (row * game_size + game_size - row - 1)
+
+    return rows + cols + [diag, anti_diag]
+
+
+def build_cell_lines(game_size, line_masks):
+    """
+    For each spot on the board, finds the lines that run through it
+
+    Args:
+        game_size (int): Length of one side of the board
+        line_masks (list): Line masks from build_line_masks
+
+    Returns:
+        (tuple): Indexed by spot, each entry a tuple of the positions in line_masks of the lines through that spot
+    """
+
+    return tuple(tuple(line for line, mask in enumerate(line_masks) if mask >> index & 1)
+                 for index in range(game_size ** 2))
+
+
+def build_column_masks(game_size):
+    """
+    Builds the masks that stop a mask shifted one spot sideways from wrapping round onto the next or previous row
+
+    Args:
+        game_size (int): Length of one side of the board
+
+    Returns:
+        (tuple): Mask of every spot not in the first column, and mask of every spot not in the last column
+    """
+
+    not_first_column = 0
+    not_last_column = 0
+    for row in range(game_size):
+        for col in range(game_size):
+            if col != 0:
+                not_first_column |= 1 << (row * game_size + col)
+            if col != game_size - 1:
+                not_last_column |= 1 << (row * game_size + col)
+
+    return not_first_column, not_last_column
+
+
+def build_zobrist_keys(game_size):
+    """
+    Builds the random keys hashed into a position for each player's mark on each spot.
+    Seeded by board size, so a position hashes the same in every process and on every run.
+
+    Args:
+        game_size (int): Length of one side of the board
+
+    Returns:
+        (tuple): Indexed by spot, each entry a dict of {player value : 64 bit key}
+    """
+
+    rng = random.Random(game_size)
+
+    return tuple({GAME_VALS['X']: rng.getrandbits(64), GAME_VALS['O']: rng.getrandbits(64)}
+                 for _ in range(game_size ** 2))
+
+
+def build_symmetries(game_size):
+    """
+    Builds the 8 rotations and reflections of the board as permutations of spot indexes
+
+    Args:
+        game_size (int): Length of one side of the board
+
+    Returns:
+        (tuple): 8 tuples, each mapping a spot index to the index it moves to. The first is the identity.
+    """
+
+    last = game_size - 1
+    transforms = (
+        lambda row, col: (row, col),
+        lambda row, col: (col, last - row),
+        lambda row, col: (last - row, last - col),
+        lambda row, col: (last - col, row),
+        lambda row, col: (last - row, col),
+        lambda row, col: (row, last - col),
+        lambda row, col: (col, row),
+        lambda row, col: (last - col, last - row),
+    )
+
+    symmetries = []
+    for transform in transforms:
+        permutation = []
+        for index in range(game_size ** 2):
+            row, col = transform(*divmod(index, game_size))
+            permutation.append(row * game_size + col)
+        symmetries.append(tuple(permutation))
+
+    return tuple(symmetries)
+
+
+def build_symmetry_keys(game_size, zobrist_keys, symmetries):
+    """
+    Packs the Zobrist keys a mark would have under each of the 8 symmetries into a single integer,
+    so one XOR updates the hashes of all 8 transformed positions
+
+    Args:
+        game_size (int): Length of one side of the board
+        zobrist_keys (tuple): Keys from build_zobrist_keys
+        symmetries (tuple): Permutations from build_symmetries
+
+    Returns:
+        (tuple): Indexed by spot, each entry a dict of {player value : packed key}
+    """
+
+    symmetry_keys = []
+    for index in range(game_size ** 2):
+        packed_keys = {}
+        for player in (GAME_VALS['X'], GAME_VALS['O']):
+            packed_keys[player] = 0
+            for slot, permutation in enumerate(symmetries):
+                packed_keys[player] |= zobrist_keys[permutation[index]][player] << (64 * slot)
+        symmetry_keys.append(packed_keys)
+
+    return tuple(symmetry_keys)
+
+
+def invert_symmetries(symmetries):
+    """
+    Args:
+        symmetries (tuple): Permutations from build_symmetries
+
+    Returns:
+        (tuple): For each permutation, the permutation that undoes it
+    """
+
+    inverses = []
+    for permutation in symmetries:
+        inverse = [0] * len(permutation)
+        for index, moved_to in enumerate(permutation):
+            inverse[moved_to] = index
+        inverses.append(tuple(inverse))
+
+    return tuple(inverses)
+
+
+# Tables per board size, built the first time a Bitboard of that size is made, so importing the module stays cheap
+LINE_MASKS = {}
+CELL_LINES = {}
+COLUMN_MASKS = {}
+ZOBRIST_KEYS = {}
+ZOBRIST_O_TO_MOVE = random.Random(0).getrandbits(64) # XOR-ed into a hash when it is O's turn
+SYMMETRIES = {}
+INVERSE_SYMMETRIES = {}
+SYMMETRY_KEYS = {}
+
+HASH_MASK = (1 << 64) - 1
+
+
+class Bitboard:
+    """
+    Two integer bitmasks, one for X and one for O, plus a stack of moves made so they can be unmade.
+
+    Also tracks per line counts of each player's marks, how many lines are open for only one player, and how many
+    are dead, holding both an X and an O.
+    """
+
+    def __init__(self, game_size: int):
+        """
+        Constructor. Starts an empty board.
+
+        Args:
+            game_size (integer): Assuming square board, length of one side of tictactoe board.
+        """
+
+        self.game_size = game_size
+        self.full_mask = (1 << game_size ** 2) - 1
+
+        if game_size not in LINE_MASKS:
+            LINE_MASKS[game_size] = build_line_masks(game_size)
+            CELL_LINES[game_size] = build_cell_lines(game_size, LINE_MASKS[game_size])
+            COLUMN_MASKS[game_size] = build_column_masks(game_size)
+            ZOBRIST_KEYS[game_size] = build_zobrist_keys(game_size)
+            SYMMETRIES[game_size] = build_symmetries(game_size)
+            INVERSE_SYMMETRIES[game_size] = invert_symmetries(SYMMETRIES[game_size])
+            SYMMETRY_KEYS[game_size] = build_symmetry_keys(game_size, ZOBRIST_KEYS[game_size], SYMMETRIES[game_size])
+
+        self.line_masks = LINE_MASKS[game_size]
+        self.cell_lines = CELL_LINES[game_size]
+        self.not_first_column, self.not_last_column = COLUMN_MASKS[game_size]
+        self.zobrist_keys = ZOBRIST_KEYS[game_size]
+        self.symmetries = SYMMETRIES[game_size]
+        self.inverse_symmetries = INVERSE_SYMMETRIES[game_size]
+        self.symmetry_keys = SYMMETRY_KEYS[game_size]
+        self.hash = 0
+        self.symmetry_hash = 0 # Hashes of all 8 transformed positions, 64 bits each
+
+        self.x_bits = 0
+        self.o_bits = 0
+        self.move_stack = []
+
+        self.x_counts = [0] * len(self.line_masks)
+        self.o_counts = [0] * len(self.line_masks)
+        self.x_open_lines = 0 # Lines with X's and no O's
+        self.o_open_lines = 0 # Lines with O's and no X's
+        self.dead_lines = 0 # Lines with both X's and O's, which nobody can win on
+
+    @classmethod
+    def from_game_data(cls, game_data, game_size):
+        """
+        Adapter from the GUI's dictionary view of the board
+
+        Args:
+            game_data (dict): Keys = coordinates of spots, vals are -1 if O spot, 0 if EMPTY, 1 if X spot
+            game_size (int): Length of one side of the board
+
+        Returns:
+            (Bitboard): Board with the same spots filled
+        """
+
+        board = cls(game_size)
+        for coordinates, value in game_data.items():
+            if value != GAME_VALS['EMPTY']:
+                board.make_move(board.index_of(coordinates), value)
+
+        # Dictionary order is not the order the moves were played in, so there is no last move to report on
+        board.move_stack.clear()
+
+        return board
+
+    @classmethod
+    def from_bits(cls, game_size, x_bits, o_bits):
+        """
+        Rebuilds a board from its two masks, for boards passed between processes
+
+        Args:
+            game_size (int): Length of one side of the board
+            x_bits (int): Mask of X's spots
+            o_bits (int): Mask of O's spots
+
+        Returns:
+            (Bitboard): Board with the same spots filled
+        """
+
+        board = cls(game_size)
+        for bits, player in ((x_bits, GAME_VALS['X']), (o_bits, GAME_VALS['O'])):
+            while bits:
+                lowest_bit = bits & -bits
+                board.make_move(lowest_bit.bit_length() - 1, player)
+                bits ^= lowest_bit
+
+        # Bit order is not the order the moves were played in, so there is no last move to report on
+        board.move_stack.clear()
+
+        return board
+
+    def to_game_data(self):
+        """
+        Adapter back to the GUI's dictionary view of the board
+
+        Returns:
+            (dict): Keys = coordinates of spots, vals are -1 if O spot, 0 if EMPTY, 1 if X spot
+        """
+
+        return {self.coordinates_of(index): self.get_spot(index) for index in range(self.game_size ** 2)}
+
+    def copy(self):
+        """
+        Returns:
+            (Bitboard): Independent copy of this board, including its move stack
+        """
+
+        board = Bitboard(self.game_size)
+        board.x_bits = self.x_bits
+        board.o_bits = self.o_bits
+        board.hash = self.hash
+        board.symmetry_hash = self.symmetry_hash
+        board.move_stack = self.move_stack.copy()
+        board.x_counts = self.x_counts.copy()
+        board.o_counts = self.o_counts.copy()
+        board.x_open_lines = self.x_open_lines
+        board.o_open_lines = self.o_open_lines
+        board.dead_lines = self.dead_lines
+
+        return board
+
+    def index_of(self, coordinates):
+        """
+        Args:
+            coordinates (tuple): Defined as (row, column)
+
+        Returns:
+            (int): Bit index of the spot
+        """
+
+        return coordinates[0] * self.game_size + coordinates[1]
+
+    def coordinates_of(self, index):
+        """
+        Args:
+            index (int): Bit index of the spot
+
+        Returns:
+            (tuple): Coordinates of the spot, defined as (row, column)
+        """
+
+        return divmod(index, self.game_size)
+
+    def get_spot(self, index):
+        """
+        Args:
+            index (int): Bit index of the spot
+
+        Returns:
+            (int): 1 if X spot, -1 if O spot, 0 if EMPTY
+        """
+
+        if self.x_bits >> index & 1:
+            return GAME_VALS['X']
+        elif self.o_bits >> index & 1:
+            return GAME_VALS['O']
+        else:
+            return GAME_VALS['EMPTY']
+
+    def make_move(self, index, whose_turn):
+        """
+        Marks a spot for a player, and updates the counts for the lines through it
+
+        Args:
+            index (int): Bit index of an empty spot
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+        """
+
+        x_counts = self.x_counts
+        o_counts = self.o_counts
+
+        if whose_turn == GAME_VALS['X']:
+            self.x_bits |= 1 << index
+            for line in self.cell_lines[index]:
+                if not x_counts[line]:
+                    if o_counts[line]:
+                        self.o_open_lines -= 1
+                        self.dead_lines += 1
+                    else:
+                        self.x_open_lines += 1
+                x_counts[line] += 1
+        else:
+            self.o_bits |= 1 << index
+            for line in self.cell_lines[index]:
+                if not o_counts[line]:
+                    if x_counts[line]:
+                        self.x_open_lines -= 1
+                        self.dead_lines += 1
+                    else:
+                        self.o_open_lines += 1
+                o_counts[line] += 1
+
+        self.hash ^= self.zobrist_keys[index][whose_turn]
+        self.symmetry_hash ^= self.symmetry_keys[index][whose_turn]
+        self.move_stack.append(index)
+
+    def unmake_move(self):
+        """Clears the most recently made move, and restores the counts for the lines through it"""
+
+        index = self.move_stack.pop()
+        bit = 1 << index
+        x_counts = self.x_counts
+        o_counts = self.o_counts
+
+        if self.x_bits & bit:
+            self.x_bits ^= bit
+            self.hash ^= self.zobrist_keys[index][GAME_VALS['X']]
+            self.symmetry_hash ^= self.symmetry_keys[index][GAME_VALS['X']]
+            for line in self.cell_lines[index]:
+                x_counts[line] -= 1
+                if not x_counts[line]:
+                    if o_counts[line]:
+                        self.o_open_lines += 1
+                        self.dead_lines -= 1
+                    else:
+                        self.x_open_lines -= 1
+        else:
+            self.o_bits ^= bit
+            self.hash ^= self.zobrist_keys[index][GAME_VALS['O']]
+            self.symmetry_hash ^= self.symmetry_keys[index][GAME_VALS['O']]
+            for line in self.cell_lines[index]:
+                o_counts[line] -= 1
+                if not o_counts[line]:
+                    if x_counts[line]:
+                        self.x_open_lines += 1
+                        self.dead_lines -= 1
+                    else:
+                        self.o_open_lines -= 1
+
+    def available_moves(self):
+        """
+        Returns:
+            (list): Bit indexes of the empty spots, in row-major order
+        """
+
+        empty = self.full_mask & ~(self.x_bits | self.o_bits)
+        moves = []
+        while empty:
+            lowest_bit = empty & -empty
+            moves.append(lowest_bit.bit_length() - 1)
+            empty ^= lowest_bit
+
+        return moves
+
+    def live_spots(self):
+        """
+        Returns:
+            (int): Mask of the spots on at least one line that doesn't hold both an X and an O. A move anywhere else
+                can't help either player complete a line.
+        """
+
+        if not self.dead_lines:
+            return self.full_mask
+
+        live = 0
+        x_counts = self.x_counts
+        o_counts = self.o_counts
+        for line, line_mask in enumerate(self.line_masks):
+            if not (x_counts[line] and o_counts[line]):
+                live |= line_mask
+
+        return live
+
+    def spots_near_marks(self, radius):
+        """
+        Args:
+            radius (int): Most rows or columns away from a mark a spot may be
+
+        Returns:
+            (int): Mask of the spots within radius of an X or O, in any direction, including the marks themselves
+        """
+
+        near = self.x_bits | self.o_bits
+        for _ in range(radius):
+            # Spread one spot sideways without wrapping round onto another row, then one spot up and down
+            near |= (near << 1 & self.not_first_column) | (near >> 1 & self.not_last_column)
+            near |= near << self.game_size | near >> self.game_size
+
+        return near & self.full_mask
+
+    def candidate_moves(self, self_symmetries, prune_dead_spots=True, neighborhood=None):
+        """
+        The moves worth searching: unique_moves, without the spots whose every line already holds both an X and an O,
+        and optionally only those near a mark. If no move is near a mark, the neighborhood is ignored.
+
+        Args:
+            self_symmetries (list): Symmetries that leave the position unchanged, from canonical_form
+            prune_dead_spots (boolean): True to drop spots that are on no live line
+            neighborhood (int): Most rows or columns away from a mark a move may be, None for anywhere
+
+        Returns:
+            (list): Bit indexes of the moves, in row-major order. Empty if every empty spot is dead.
+        """
+
+        moves = self.unique_moves(self_symmetries)
+
+        if prune_dead_spots:
+            live = self.live_spots()
+            moves = [index for index in moves if live >> index & 1]
+
+        if neighborhood is not None and (self.x_bits | self.o_bits):
+            near = self.spots_near_marks(neighborhood)
+            near_moves = [index for index in moves if near >> index & 1]
+            if near_moves:
+                moves = near_moves
+
+        return moves
+
+    def hash_for_turn(self, whose_turn):
+        """
+        Args:
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+
+        Returns:
+            (int): Zobrist hash of the position together with the player to move
+        """
+
+        if whose_turn == GAME_VALS['O']:
+            return self.hash ^ ZOBRIST_O_TO_MOVE
+
+        return self.hash
+
+    def canonical_form(self, whose_turn):
+        """
+        Finds the canonical hash of the position, and the symmetries that leave it unchanged
+
+        Args:
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+
+        Returns:
+            (tuple): (canonical hash together with the player to move, index of the symmetry that produces it,
+                list of symmetries other than the identity that map the position onto itself)
+        """
+
+        packed = self.symmetry_hash
+        identity_hash = packed & HASH_MASK
+        canonical_hash = identity_hash
+        canonical_symmetry = 0
+        self_symmetries = []
+
+        for symmetry in range(1, 8):
+            packed >>= 64
+            symmetry_hash = packed & HASH_MASK
+            if symmetry_hash < canonical_hash:
+                canonical_hash = symmetry_hash
+                canonical_symmetry = symmetry
+            if symmetry_hash == identity_hash and self.is_unchanged_by(symmetry):
+                self_symmetries.append(symmetry)
+
+        if whose_turn == GAME_VALS['O']:
+            canonical_hash ^= ZOBRIST_O_TO_MOVE
+
+        return canonical_hash, canonical_symmetry, self_symmetries
+
+    def is_unchanged_by(self, symmetry):
+        """
+        Exact check that a symmetry maps every mark onto a matching mark, to rule out a hash collision
+
+        Args:
+            symmetry (int): Index into self.symmetries
+
+        Returns:
+            True (boolean): The transformed position is identical
+            False (boolean): The transformed position differs
+        """
+
+        permutation = self.symmetries[symmetry]
+        for bits in (self.x_bits, self.o_bits):
+            remaining = bits
+            while remaining:
+                lowest_bit = remaining & -remaining
+                if not bits >> permutation[lowest_bit.bit_length() - 1] & 1:
+                    return False
+                remaining ^= lowest_bit
+
+        return True
+
+    def unique_moves(self, self_symmetries):
+        """
+        Collapses moves that are mirror images of each other into the lowest index of each group
+
+        Args:
+            self_symmetries (list): Symmetries that leave the position unchanged, from canonical_form
+
+        Returns:
+            (list): Bit indexes of the empty spots, one per group of equivalent moves, in row-major order
+        """
+
+        moves = self.available_moves()
+        if not self_symmetries:
+            return moves
+
+        unique = []
+        for index in moves:
+            if all(self.symmetries[symmetry][index] >= index for symmetry in self_symmetries):
+                unique.append(index)
+
+        return unique
+
+    def is_win_possible(self):
+        """
+        Returns:
+            True (boolean): At least one line doesn't hold both an X and an O
+            False (boolean): Every line is dead, the game can only end in a tie
+        """
+
+        return self.dead_lines < len(self.line_masks)
+
+    def is_full(self):
+        """
+        Returns:
+            True (boolean): If no spots are left
+            False (boolean): If spots are available
+        """
+
+        return (self.x_bits | self.o_bits) == self.full_mask
+
+    def last_move_won(self):
+        """
+        Checks only the lines through the most recent move, since any win on the board must have been made by it
+
+        Returns:
+            True (boolean): The last move completed a line
+            False (boolean): No win, or no moves made yet
+        """
+
+        if not self.move_stack:
+            return False
+
+        return self.is_winning_spot(self.move_stack[-1])
+
+    def is_winning_spot(self, index):
+        """
+        Checks whether the mark on a spot completes any of the lines through it
+
+        Args:
+            index (int): Bit index of a filled spot
+
+        Returns:
+            True (boolean): A line through the spot is filled by its owner
+            False (boolean): No line through the spot is filled by its owner
+        """
+
+        counts = self.x_counts if self.x_bits >> index & 1 else self.o_counts
+        for line in self.cell_lines[index]:
+            if counts[line] == self.game_size:
+                return True
+
+        return False
+
+    def has_winner(self):
+        """
+        Checks every line on the board, for boards built from game data without a move history
+
+        Returns:
+            True (boolean): A line is filled by one player
+            False (boolean): No line is filled by one player
+        """
+
+        return self.game_size in self.x_counts or self.game_size in self.o_counts
+
+    def score_open_lines(self):
+        """
+        Scores the rows, columns, and diagonals from the running line counts. Each line holding only X's (and empty
+        spots) is a point for X (maximizer), each line holding only O's is a negative point for O (minimizer).
+
+        Return:
+            score (tuple) : Tuple containing max score for X, and min score for O
+        """
+
+        return 2 * self.x_open_lines, -2 * self.o_open_lines
@@ -0,0 +1,1878 @@
+"""
+Headless TicTacToe engine: the game rules and the computer's search, without any GUI.
+
+TicTacToe_In_Python.py's window is one client of this module. Other programs can import it without pulling in
+tkinter, or run it from the command line:
+
+    python TicTacToe_Engine.py best-move --board "X.O/.X./..O" --turn X
+    python TicTacToe_Engine.py play --size 4 --human O
+
+Playing a game from code:
+
+    game = new_game(3, first_player=GAME_VALS['X'])
+    game.play_move((1, 1))
+    coordinates, search_stats = game.find_next_move_for_computer()
+    status = game.play_move(coordinates)
+"""
+
+from functools import partial
+from time import time, perf_counter
+
+import random
+import threading
+
+from TicTacToe_Bitboard import Bitboard, GAME_VALS, BOARD_SIZES
+from TicTacToe_Transposition import TranspositionTable, DEFAULT_TABLE_SIZE, EXACT, LOWER_BOUND, UPPER_BOUND
+from TicTacToe_OpeningBook import OpeningBook
+from TicTacToe_SearchCache import DEFAULT_CACHE_MEMORY, CACHE_MIN_DEPTH
+from TicTacToe_SearchStats import SearchStats
+
+GAME_STATUS = {
+    'IN_PROGRESS': 'in_progress',
+    'X_WON': 'x_won',
+    'O_WON': 'o_won',
+    'TIE': 'tie', # Every spot is filled
+    'NO_WIN_POSSIBLE': 'no_win_possible' # Every line holds both an X and an O
+}
+
+WORKER_POLL_SECONDS = 0.05 # How often a parallel search checks for finished moves and cancellation
+
+# Depth cutoff evaluator used by each board size when none is asked for, see TicTacToe_Evaluation.py. The small
+# boards are searched close to the end of the game and keep the flat open line count, on the larger boards most
+# positions searched are at the depth cutoff, and scoring their moves together with NumPy pays off.
+DEFAULT_LEAF_EVALUATORS = {
+    3: 'open_lines',
+    4: 'open_lines',
+    5: 'numpy',
+    6: 'numpy',
+    7: 'numpy',
+    8: 'numpy',
+    9: 'numpy',
+    10: 'numpy'
+}
+
+# How the computer searches: 'minimax' is the original search, whose scores fold in the turn count. 'pvs' is a
+# negamax search with principal variation search, and 'mtdf' drives the same negamax search with MTD(f). Both score
+# a win by how soon it comes, so their bounds prune soundly. 'mcts' is Monte Carlo tree search, see TicTacToe_MCTS.py.
+SEARCH_ALGORITHMS = ('minimax', 'pvs', 'mtdf', 'mcts')
+
+# Search algorithm used by each board size when none is asked for. From 8x8 up minimax only sees a turn or two
+# ahead, and random playouts judge a move better than that.
+DEFAULT_SEARCH_ALGORITHMS = {
+    3: 'minimax',
+    4: 'minimax',
+    5: 'minimax',
+    6: 'minimax',
+    7: 'minimax',
+    8: 'mcts',
+    9: 'mcts',
+    10: 'mcts'
+}
+
+BOARD_SYMBOLS = {
+    'X': GAME_VALS['X'],
+    'O': GAME_VALS['O'],
+    '.': GAME_VALS['EMPTY']
+}
+
+class SearchTimeout(Exception):
+    """Raised inside the search when it runs past its time or node budget"""
+
+
+class SearchCancelled(Exception):
+    """Raised inside the search when TicTacToeGame.search_cancelled is set, it is not caught by the search"""
+
+
+class TicTacToeGame:
+    """Manages the game data for TicTacToe"""
+
+    BUDGET_CHECK_INTERVAL = 512 # Nodes searched between checks of the time and node budget
+    ORDERING_MIN_DEPTH = 2 # Closer to the depth cutoff, sorting costs more than the cutoffs it buys
+    # Smaller boards are searched deep enough that a tie found early scores differently to one at a full board,
+    # and skipping dead spots there changes which moves look best
+    PRUNING_MIN_SIZE = 8
+    # Moves at the depth cutoff tried one at a time before the rest are scored together, as most cutoffs come early
+    FRONTIER_BATCH_AFTER = 2
+    # Negamax score of a win on the move. A win found further down scores less by the turns it takes, so sooner wins
+    # and later losses are preferred, and anything beyond NEGAMAX_WIN_BOUND is a forced win or loss.
+    NEGAMAX_WIN_SCORE = 10000
+    NEGAMAX_WIN_BOUND = NEGAMAX_WIN_SCORE - 1000
+    NEGAMAX_INFINITY = 1000000
+
+    def __init__(self, game_size: int, table_size: int = DEFAULT_TABLE_SIZE, use_symmetry: bool = True,
+                 time_budget: float = None, node_budget: int = None, use_move_ordering: bool = None,
+                 workers: int = 1, use_opening_book: bool = True, search_log_path: str = None,
+                 max_depth: int = None, prune_dead_spots: bool = None, neighborhood: int = None,
+                 leaf_evaluator: str = None, search_algorithm: str = None, use_search_cache: bool = False,
+                 search_cache_memory: int = DEFAULT_CACHE_MEMORY, use_tablebase: bool = True):
+        """
+        Constructor. Starts empty game data dictionary, and initializes turn count.
+
+        Without a time or node budget the computer searches to a fixed depth picked by board size. With either
+        budget it deepens one turn at a time until the budget runs out, and plays the best move of the deepest
+        search that finished.
+        
+        Args:
+            game_size (integer): Assuming square board, length of one side of tictactoe board.
+            table_size (integer): Most entries kept in the transposition table, 0 to search without one. The
+                minimax search can score moves differently with a table than without, see minimax_score_this_turn.
+            use_symmetry (boolean): True to share table entries between mirror images of a position, and to only
+                search one of each group of moves that are mirror images of each other
+            time_budget (float): Seconds allowed per computer move, None for no time limit
+            node_budget (integer): Positions allowed to be searched per computer move, None for no limit
+            use_move_ordering (boolean): True to try the moves most likely to cause a cutoff first, False to try them
+                in row-major order (for comparing the two). None to order them for the 'pvs' and 'mtdf' search
+                algorithms only, as the minimax search's scores depend on the order its moves are tried in.
+            workers (integer): Processes to split the computer's moves across, 1 to search them all in this process
+            use_opening_book (boolean): True to play the opening from the board size's book when one has been built
+            search_log_path (string): File to append the search stats of every computer move to as JSON lines, None
+                to keep only the latest in self.search_stats
+            max_depth (integer): Fixed search depth to use in place of the one picked by board size
+            prune_dead_spots (boolean): True to skip moves on spots whose every line holds both an X and an O, as
+                they can't help either player win. None to skip them on boards of PRUNING_MIN_SIZE and up.
+            neighborhood (integer): Only search moves at most this many rows or columns from a mark, None to search
+                moves anywhere
+            leaf_evaluator (string): How positions past the depth cutoff are scored, one of 'open_lines' (2 points
+                per open line), 'weighted' (open lines weighted by their marks), or 'numpy' (weighted, with every
+                move at the depth cutoff scored at once). None for the board size's entry in DEFAULT_LEAF_EVALUATORS.
+                'numpy' falls back to 'weighted' when NumPy isn't installed.
+            search_algorithm (string): One of SEARCH_ALGORITHMS, None for the board size's entry in
+                DEFAULT_SEARCH_ALGORITHMS. 'mcts' searches for time_budget seconds, or node_budget playouts, and for
+                DEFAULT_MCTS_TIME_BUDGET seconds when neither is set.
+            use_search_cache (boolean): True to keep search results on disk between games and processes, see
+                TicTacToe_SearchCache.py. Only for the 'pvs' and 'mtdf' search algorithms.
+            search_cache_memory (integer): Bytes of the search cache to hold in memory, when the cache is first
+                opened in this process
+            use_tablebase (boolean): True to play every move from the board size's tablebase when one has been built,
+                see TicTacToe_Tablebase.py
+
+        Raises:
+            ValueError: leaf_evaluator isn't one of the evaluators above, search_algorithm isn't one of
+                SEARCH_ALGORITHMS, or the search cache is asked for without the 'pvs' or 'mtdf' search algorithm
+        """
+
+        self.game_data = {}
+        self.board = Bitboard(game_size) # Bitmask view of self.game_data, used by the search
+        self.turn_count = 0
+        self.status = GAME_STATUS['IN_PROGRESS']
+        self.game_size = game_size
+        self.computer_player = False
+        self.use_symmetry = use_symmetry
+
+        if self.game_size == 3:
+            self.max_minimax_depth = self.game_size ** 2
+        elif 4 <= self.game_size <= 7:
+            self.max_minimax_depth = (-self.game_size + 9)
+        elif self.game_size == 8:
+            self.max_minimax_depth = 2
+        else:
+            self.max_minimax_depth = 1
+
+        if max_depth is not None:
+            self.max_minimax_depth = max_depth
+
+        self.search_depth = self.max_minimax_depth
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        if prune_dead_spots is None:
+            prune_dead_spots = game_size >= self.PRUNING_MIN_SIZE
+        self.prune_dead_spots = prune_dead_spots
+        self.neighborhood = neighborhood
+        self.set_leaf_evaluator(leaf_evaluator)
+        if search_algorithm is None:
+            search_algorithm = DEFAULT_SEARCH_ALGORITHMS.get(game_size, 'minimax')
+        if search_algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm {search_algorithm!r}, expected one of {SEARCH_ALGORITHMS}")
+        self.search_algorithm = search_algorithm
+        if use_move_ordering is None:
+            use_move_ordering = search_algorithm in ('pvs', 'mtdf')
+        self.use_move_ordering = use_move_ordering
+        self.mtdf_guess = 0 # Root score of MTD(f)'s last pass, its first guess at the next one
+
+        self.search_cache = None
+        if use_search_cache:
+            if search_algorithm not in ('pvs', 'mtdf'):
+                raise ValueError("The search cache needs the 'pvs' or 'mtdf' search algorithm, the minimax search's "
+                                 "scores depend on the position it started from")
+            # Imported here, so games without the cache don't load SQLite
+            from TicTacToe_SearchCache import SearchCache
+
+            self.search_cache = SearchCache.load(game_size, self.search_cache_signature(), search_cache_memory)
+        self.table_size = table_size
+        self.workers = workers
+        self.process_pool = None
+        self.monte_carlo = None # MonteCarloSearch of the 'mcts' search algorithm, built by its first search
+
+        # Set from another thread to stop a search in progress, the caller clears it before starting the next one
+        self.search_cancelled = threading.Event()
+        self.enforce_search_budget = False
+
+        # Spots nearer the middle lie on more lines, so they are tried earlier among otherwise equal moves
+        middle = (self.game_size - 1) / 2
+        self.center_distance = [abs(row - middle) + abs(col - middle)
+                                for row in range(self.game_size) for col in range(self.game_size)]
+
+        if table_size:
+            self.transposition_table = TranspositionTable(table_size)
+        else:
+            self.transposition_table = None
+
+        self.reset_move_ordering()
+        self.reset_search_counts()
+        self.search_log_path = search_log_path
+        self.search_stats = None # SearchStats of the computer's last move
+
+        if use_opening_book:
+            self.opening_book = OpeningBook.load(game_size)
+        else:
+            self.opening_book = None
+
+        if use_tablebase:
+            # Imported here, so games without a tablebase don't load it
+            from TicTacToe_Tablebase import Tablebase
+
+            self.tablebase = Tablebase.load(game_size)
+        else:
+            self.tablebase = None
+    
+    def set_leaf_evaluator(self, leaf_evaluator):
+        """
+        Picks how positions past the depth cutoff are scored
+
+        Args:
+            leaf_evaluator (string): 'open_lines', 'weighted', 'numpy', or None for the board size's default
+
+        Raises:
+            ValueError: leaf_evaluator isn't one of the evaluators above
+        """
+
+        if leaf_evaluator is None:
+            leaf_evaluator = DEFAULT_LEAF_EVALUATORS.get(self.game_size, 'open_lines')
+
+        self.score_leaf = Bitboard.score_open_lines
+        self.frontier_evaluator = None # Scores all moves out of a position at the depth cutoff together
+
+        if leaf_evaluator != 'open_lines':
+            # Imported here, so NumPy is only loaded by games that use it
+            from TicTacToe_Evaluation import (LEAF_EVALUATORS, FrontierEvaluator, build_line_weights,
+                                              score_weighted_lines, np)
+
+            if leaf_evaluator not in LEAF_EVALUATORS:
+                raise ValueError(f"Unknown leaf evaluator {leaf_evaluator!r}, expected one of {LEAF_EVALUATORS}")
+            if leaf_evaluator == 'numpy' and np is None:
+                leaf_evaluator = 'weighted'
+
+            line_weights = build_line_weights(self.game_size)
+            self.score_leaf = partial(score_weighted_lines, weights=line_weights)
+            if leaf_evaluator == 'numpy':
+                self.frontier_evaluator = FrontierEvaluator(self.game_size, line_weights)
+
+        self.leaf_evaluator = leaf_evaluator
+
+    def search_cache_signature(self):
+        """
+        Returns:
+            (string): The settings search results depend on, besides the board size, to keep caches apart by
+        """
+
+        # 'numpy' scores leaves just as 'weighted' does
+        signature = 'weighted' if self.leaf_evaluator == 'numpy' else self.leaf_evaluator
+        if not self.use_symmetry:
+            signature += "_no_symmetry"
+        if self.prune_dead_spots:
+            signature += "_pruned"
+        if self.neighborhood is not None:
+            signature += f"_neighborhood_{self.neighborhood}"
+
+        return signature
+
+    def search_settings(self):
+        """
+        Returns:
+            (dict): Keyword arguments for TicTacToeGame that build a game searching just as this one does, without its
+                search log
+        """
+
+        return {
+            'table_size': self.table_size,
+            'use_symmetry': self.use_symmetry,
+            'time_budget': self.time_budget,
+            'node_budget': self.node_budget,
+            'use_move_ordering': self.use_move_ordering,
+            'workers': self.workers,
+            'use_opening_book': self.opening_book is not None,
+            'max_depth': self.max_minimax_depth,
+            'prune_dead_spots': self.prune_dead_spots,
+            'neighborhood': self.neighborhood,
+            'leaf_evaluator': self.leaf_evaluator,
+            'search_algorithm': self.search_algorithm,
+            'use_search_cache': self.search_cache is not None,
+            'use_tablebase': self.tablebase is not None
+        }
+
+    def flush_search_cache(self):
+        """Writes the results found since the last flush to the search cache's file, if there is a cache"""
+
+        if self.search_cache is not None:
+            self.search_cache.flush()
+
+    def reset_move_ordering(self):
+        """Clears the killer moves and history table learned by the last search"""
+
+        # Up to two moves per turn count that most recently caused a cutoff at that depth
+        self.killer_moves = [[None, None] for _ in range(self.game_size ** 2 + 1)]
+        # Per player, per spot, credit for cutoffs the move has caused anywhere in the search
+        self.history_table = {GAME_VALS['X']: [0] * self.game_size ** 2, GAME_VALS['O']: [0] * self.game_size ** 2}
+        self.ordering_turn_count = self.turn_count # Turn count of the position the killer moves count turns from
+
+    def age_move_ordering(self):
+        """
+        Carries the killer moves and history table over to a search from the game's current position. Killer moves
+        are shifted by the turns played since, so each stays with the turn it was found at, and history credit is
+        halved, so the latest cutoffs count for more.
+        """
+
+        turns_played = self.turn_count - self.ordering_turn_count
+        if not 0 <= turns_played < len(self.killer_moves):
+            # The position was set from somewhere else, nothing learned carries over
+            self.reset_move_ordering()
+            return
+
+        self.killer_moves = self.killer_moves[turns_played:] + [[None, None] for _ in range(turns_played)]
+        for history in self.history_table.values():
+            history[:] = [credit >> 1 for credit in history]
+        self.ordering_turn_count = self.turn_count
+
+    def reset_search_counts(self):
+        """Zeroes the counts of positions searched, expanded, and cut off, read back by search_counts"""
+
+        self.minimax_count = 0
+        self.expanded_count = 0
+        self.table_return_count = 0 # Positions answered from the transposition table without being expanded
+        self.children_count = 0 # Moves searched across all expanded positions
+        self.cutoff_count = 0
+        self.first_move_cutoff_count = 0
+        self.cutoffs_per_ply = [0] * (self.game_size ** 2 + 1) # Indexed by plies below the computer's position
+        self.table_probe_count = 0
+        self.table_hit_count = 0
+        self.max_depth_reached = 0
+        self.completed_depth = None
+
+        if self.transposition_table is not None:
+            self.transposition_table.probes = 0
+            self.transposition_table.hits = 0
+
+    def collect_table_counts(self):
+        """Moves the transposition table's probe and hit counts into the search counts, before it is cleared"""
+
+        table = self.transposition_table
+        if table is not None:
+            self.table_probe_count += table.probes
+            self.table_hit_count += table.hits
+            table.probes = 0
+            table.hits = 0
+
+    def search_counts(self):
+        """
+        Returns:
+            (tuple): Counts kept by the search since reset_search_counts, in the order add_search_counts takes them
+        """
+
+        self.collect_table_counts()
+
+        return (self.minimax_count, self.expanded_count, self.table_return_count, self.children_count,
+                self.cutoff_count, self.first_move_cutoff_count, self.cutoffs_per_ply, self.table_probe_count,
+                self.table_hit_count, self.max_depth_reached)
+
+    def add_search_counts(self, counts):
+        """
+        Adds counts from a search run elsewhere, such as a worker process, to this game's
+
+        Args:
+            counts (tuple): Output of search_counts
+        """
+
+        (nodes, expanded, table_returns, children, cutoffs, first_move_cutoffs, cutoffs_per_ply, table_probes,
+         table_hits, max_depth) = counts
+
+        self.minimax_count += nodes
+        self.expanded_count += expanded
+        self.table_return_count += table_returns
+        self.children_count += children
+        self.cutoff_count += cutoffs
+        self.first_move_cutoff_count += first_move_cutoffs
+        for ply, ply_cutoffs in enumerate(cutoffs_per_ply):
+            self.cutoffs_per_ply[ply] += ply_cutoffs
+        self.table_probe_count += table_probes
+        self.table_hit_count += table_hits
+        self.max_depth_reached = max(self.max_depth_reached, max_depth)
+
+    def start_root_move_search(self):
+        """
+        Clears what was learned searching the computer's other moves, so each move is scored the same whichever
+        order the moves are searched in, or whichever process searches them
+        """
+
+        if self.transposition_table is not None:
+            # Scores include the turn count from the root, so entries from another search don't apply
+            self.collect_table_counts()
+            self.transposition_table.clear()
+
+        self.reset_move_ordering()
+
+    def start_next_search(self):
+        """
+        Keeps what the negamax searches learned for the next move of the game. Their scores don't depend on the path
+        to a position, so the transposition table carries over, with the entries aged so the new search replaces
+        them first, along with the move ordering (see age_move_ordering). MTD(f) starts from the score the table
+        holds for the position, if it holds one.
+        """
+
+        self.age_move_ordering()
+
+        self.mtdf_guess = 0
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+            root_entry = self.probe_root()
+            if root_entry is not None:
+                # The children of the computer's position are searched at turn count 0, so it sits at -1
+                self.mtdf_guess = self.score_from_table(root_entry[0], -1)
+
+    def probe_root(self):
+        """
+        Returns:
+            (tuple): (score, bit index of the best move or None) from the transposition table's entry for the
+                computer's position, there when an earlier search looked ahead to it. None without an entry.
+        """
+
+        if self.transposition_table is None:
+            return None
+
+        if self.use_symmetry:
+            table_key, symmetry, _ = self.board.canonical_form(self.turn)
+        else:
+            table_key = self.board.hash_for_turn(self.turn)
+            symmetry = 0
+
+        entry = self.transposition_table.probe(table_key)
+        if entry is None:
+            return None
+
+        _, _, _, entry_score, _, entry_move = entry
+        if entry_move is not None:
+            # Stored moves are in the canonical position's frame, map it back onto this board
+            entry_move = self.board.inverse_symmetries[symmetry][entry_move]
+
+        return entry_score, entry_move
+
+    def clear_search_state(self):
+        """Forgets everything the searches learned, for a new game"""
+
+        if self.transposition_table is not None:
+            self.transposition_table.clear()
+        self.reset_move_ordering()
+        self.mtdf_guess = 0
+        if self.monte_carlo is not None:
+            self.monte_carlo.clear()
+
+    def set_player(self, computer_player: bool):
+        """
+        Setter for player option
+
+        Args:
+            computer_player (boolean): True for an AI player, False for 2 player
+        """
+
+        self.computer_player = computer_player
+    
+    def add_game_spot(self, coordinates: tuple):
+        """
+        Appends spot to self.game_data dictionary with key being coordinates of new spot, and value being EMPTY game value
+
+        Args:
+            coordinates (tuple): Coordinates of spot to add
+        """
+
+        self.game_data[coordinates] = GAME_VALS["EMPTY"]
+        
+    def set_position(self, x_bits, o_bits, whose_turn):
+        """
+        Replaces the game in progress with a given position, for searching positions that weren't played to
+
+        Args:
+            x_bits (int): Mask of X's spots
+            o_bits (int): Mask of O's spots
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+        """
+
+        self.board = Bitboard.from_bits(self.game_size, x_bits, o_bits)
+        self.game_data = self.board.to_game_data()
+        self.turn_count = bin(x_bits | o_bits).count('1')
+        self.turn = whose_turn
+
+        if self.game_size in self.board.x_counts:
+            self.status = GAME_STATUS['X_WON']
+        elif self.game_size in self.board.o_counts:
+            self.status = GAME_STATUS['O_WON']
+        elif self.board.is_full():
+            self.status = GAME_STATUS['TIE']
+        else:
+            self.status = GAME_STATUS['IN_PROGRESS']
+
+    def play_move(self, coordinates):
+        """
+        Plays a move for whoever's turn it is, then checks for a win, a game that can no longer be won, or a full
+        board. The turn passes to the other player unless the move won. When the game ends, the search results found
+        during it are written to the search cache.
+
+        Args:
+            coordinates (tuple): Coordinates of the spot to play
+
+        Raises:
+            ValueError: The game is over, or the spot is off the board or already taken
+
+        Returns:
+            (string): The game's status after the move, one of GAME_STATUS
+        """
+
+        if self.status != GAME_STATUS['IN_PROGRESS']:
+            raise ValueError(f"The game is over: {self.status}")
+        if self.game_data.get(coordinates) != GAME_VALS['EMPTY']:
+            raise ValueError(f"{coordinates} is not an empty spot on the board")
+
+        self.update_game_spot(coordinates)
+        self.update_turn_count()
+
+        if self.player_check_for_win(coordinates):
+            if self.turn == GAME_VALS['X']:
+                self.status = GAME_STATUS['X_WON']
+            else:
+                self.status = GAME_STATUS['O_WON']
+            self.flush_search_cache()
+            return self.status
+
+        self.update_turn()
+
+        if self.turn_count > (self.game_size * 2) + 2 and not self.check_if_win_possible():
+            self.status = GAME_STATUS['NO_WIN_POSSIBLE']
+        elif not self.check_spots_available():
+            self.status = GAME_STATUS['TIE']
+
+        if self.status != GAME_STATUS['IN_PROGRESS']:
+            self.flush_search_cache()
+
+        return self.status
+
+    def update_game_spot(self, coordinates):
+        """
+        Updates the gamespot with either X's or O's spot
+
+        Args:
+            coordinates (tuple): Coordinates of spot to update
+        """
+
+        if self.turn == 1:
+            # Was X's turn, update with X's marker
+            self.game_data[coordinates] = GAME_VALS["X"]
+        else:
+            self.game_data[coordinates] = GAME_VALS["O"]
+
+        self.board.make_move(self.board.index_of(coordinates), self.turn)
+    
+    def check_spots_available(self, game_board=None):
+        """
+        Checks if cat's game or not by tracking move counts, or checking available moves on gameboard
+        
+        Returns:
+            True (boolean): if spots available
+            False (boolean): if spots not available
+        """
+        
+        if self.turn_count >= self.game_size ** 2:
+            return False
+        
+        if game_board:
+            available_spaces = [coords for coords, vals in game_board.items() if vals == GAME_VALS["EMPTY"]]
+    
+        else:
+            available_spaces = [coords for coords, vals in self.game_data.items() if vals == 0]
+
+        if available_spaces:
+            return True
+
+        else:
+            return False
+    
+    def check_if_win_possible(self):
+        """
+        Check if a win is even possible - if all rows, columns, and diagonals contain one of each X and O, no wins are possible.
+        
+        The instance's board counts the lines holding both marks as moves are made, so this is a single comparison.
+        
+        Returns:
+            True (boolean) : If win is still possible
+            False (boolean) : If win is not possible
+        """
+        
+        return self.board.is_win_possible()
+               
+    def find_first_player(self):
+        """Randomly get first player based on current time being even or odd"""
+
+        if (round(time()) % 2) == 0:
+            self.turn = GAME_VALS["X"]
+        else:
+            self.turn = GAME_VALS["O"]
+
+    def update_turn_count(self):
+        """Update the turn count for this instance via updating self.turn_count"""
+
+        self.turn_count += 1
+        
+    def update_turn(self):
+        """Update whose turn it is via updating self.turn"""
+
+        if self.turn == GAME_VALS["X"]:
+            self.turn = GAME_VALS["O"]
+        else:
+            self.turn = GAME_VALS["X"]
+    
+    def get_turn(self):
+        """
+        Getter for self.turn.
+        
+        Returns:
+            self.turn (integer): 1 for X's turn, -1 for O's turn.
+        """
+
+        return self.turn
+    
+    def get_turn_count(self):
+        """
+        Getter for self.turn_count, number of turns played
+        
+        Returns:
+            self.turn_count (integer): Number of turns played
+        """
+
+        return self.turn_count
+        
+    def player_check_for_win(self, coordinates):
+        """
+        Checks if one of the player's won! Reads the line counts kept by the instance's board, so only the lines
+        through the chosen spot are looked at.
+        Only checks for win after first player has made 3 possible moves
+
+        Args:
+            coordinates (tuple): Tuple of coordinates of location player chose
+            
+        Returns:
+            True (boolean): A win
+            False (boolean): A loss
+        """
+        
+        if self.turn_count < (2 * self.game_size) - 1:
+            # Not enough moves to win a game
+            return
+
+        else:
+            return self.board.is_winning_spot(self.board.index_of(coordinates))
+       
+    def random_move_supplier(self):
+        """
+        Provides a random set of coordinates for the computer to choose 
+        
+        Return:
+            (tuple): Coordinates that are currently unoccupied
+        """
+
+        self.empty_spots = [coords for coords, vals in self.game_data.items() if vals == GAME_VALS["EMPTY"]]
+        
+        return random.choice(self.empty_spots)
+
+    def find_next_move_for_computer(self):
+        """Picks the computer's next move, from the tablebase if there is one for the board size, otherwise from the
+        opening book if the position is in it, otherwise at random early on in larger games, otherwise by searching.
+        How the move was picked is kept in self.search_stats, and appended to the search log if there is one.
+
+        Returns:
+            (tuple): Coordinates of best available next move, and the SearchStats of picking it
+        """
+
+        start_time = perf_counter()
+        self.reset_search_counts()
+
+        next_move = self.tablebase_move()
+        source = 'tablebase'
+
+        if next_move is None:
+            next_move = self.opening_book_move()
+            source = 'book'
+
+        if next_move is None and self.game_size > 4 and self.search_algorithm != 'mcts':
+            # 4x4 openings are searched, as symmetry leaves only a few distinct moves to try
+            if self.turn_count <= (self.game_size):
+                next_move = self.random_move_supplier()
+                source = 'random'
+
+        if next_move is None and self.search_algorithm == 'mcts':
+            next_move = self.monte_carlo_move()
+            source = 'mcts'
+
+        if next_move is None:
+            next_move = self.search_next_move()
+            source = 'search'
+
+        self.search_stats = self.make_search_stats(next_move, source, perf_counter() - start_time)
+        if self.search_log_path is not None:
+            self.search_stats.write_json_line(self.search_log_path)
+
+        return next_move, self.search_stats
+
+    def make_search_stats(self, next_move, source, elapsed):
+        """
+        Args:
+            next_move (tuple): Coordinates of the move picked
+            source (string): One of MOVE_SOURCES
+            elapsed (float): Seconds taken to pick the move
+
+        Returns:
+            (SearchStats): The search counts since reset_search_counts, for the move picked
+        """
+
+        (nodes, expanded, table_returns, children, cutoffs, first_move_cutoffs, cutoffs_per_ply, table_probes,
+         table_hits, max_depth) = self.search_counts()
+
+        if nodes and not max_depth:
+            # Nothing was expanded, only the computer's own moves were searched
+            max_depth = 1
+
+        return SearchStats(self.game_size, self.turn_count, self.turn, next_move, source, elapsed, nodes=nodes,
+                           expanded=expanded, table_returns=table_returns, children=children, cutoffs=cutoffs,
+                           first_move_cutoffs=first_move_cutoffs, cutoffs_per_ply=cutoffs_per_ply,
+                           table_probes=table_probes, table_hits=table_hits, max_depth=max_depth,
+                           completed_depth=self.completed_depth)
+
+    def tablebase_move(self):
+        """
+        Plays the position perfectly from the tablebase: a win if there is one, taking it at once when it can, otherwise
+        a draw. Moves of the same value are told apart by static_move_score.
+
+        Returns:
+            (tuple): Coordinates of the tablebase's move, or None if there is no tablebase for the board size
+        """
+
+        if self.tablebase is None:
+            return None
+
+        from TicTacToe_Tablebase import DRAW, UNKNOWN
+
+        board = self.board
+        move_values = self.tablebase.move_values(board.x_bits, board.o_bits, self.turn)
+        if not move_values or UNKNOWN in move_values.values():
+            # Only positions no game reaches are left unsolved
+            return None
+
+        def move_rank(space):
+            board.make_move(space, self.turn)
+            wins_now = board.last_move_won()
+            board.unmake_move()
+            return (move_values[space], wins_now, self.static_move_score(board, space))
+
+        best_move = max(move_values, key=move_rank)
+
+        # Scored as the other searches score them, higher for X
+        self.possible_final_moves = {board.coordinates_of(space): (value - DRAW) * self.turn
+                                     for space, value in move_values.items()}
+        return board.coordinates_of(best_move)
+
+    def opening_book_move(self):
+        """
+        Looks the current position up in the opening book
+
+        Returns:
+            (tuple): Coordinates of the book's move, or None if there is no book or the position isn't in it
+        """
+
+        if self.opening_book is None or self.turn_count >= self.opening_book.plies:
+            return None
+
+        table_key, symmetry, _ = self.board.canonical_form(self.turn)
+        entry = self.opening_book.lookup(table_key)
+        if entry is None:
+            return None
+
+        # Book moves are in the canonical position's frame, map it back onto this board
+        book_move, book_score = entry
+        book_move = self.board.inverse_symmetries[symmetry][book_move]
+        if self.board.get_spot(book_move) != GAME_VALS['EMPTY']:
+            # Hash collision with a position that isn't this one
+            return None
+
+        coordinates = self.board.coordinates_of(book_move)
+        self.possible_final_moves = {coordinates: book_score}
+        return coordinates
+
+    def monte_carlo_move(self):
+        """
+        Picks the move by Monte Carlo tree search, the move tried most often. The tree is kept for the next move.
+
+        Raises:
+            SearchCancelled: search_cancelled was set during the search
+
+        Returns:
+            (tuple): Coordinates of the move
+        """
+
+        if self.monte_carlo is None:
+            # Imported here, so games that never use it don't load it
+            from TicTacToe_MCTS import MonteCarloSearch
+
+            self.monte_carlo = MonteCarloSearch(self.game_size, workers=self.workers, neighborhood=self.neighborhood)
+
+        monte_carlo = self.monte_carlo
+        move_stats = monte_carlo.search(self.board.x_bits, self.board.o_bits, self.turn, self.time_budget,
+                                        self.node_budget, self.search_cancelled)
+
+        self.minimax_count = monte_carlo.playouts
+        self.expanded_count = monte_carlo.nodes_added
+        self.max_depth_reached = monte_carlo.max_depth
+
+        # Average results run from 0 to 1 for the computer, scored from -1 to 1 as the other searches score them,
+        # higher for X
+        self.possible_final_moves = {self.board.coordinates_of(move): (2 * average - 1) * self.turn
+                                     for move, (_, average) in move_stats.items()}
+        best_move = max(move_stats, key=lambda move: move_stats[move])
+        return self.board.coordinates_of(best_move)
+
+    def search_next_move(self):
+        """Function runs each possible move available through MINIMAX algorithm to determine a score for the next move.
+
+        Returns:
+            (tuple): Coordinates of best available next move
+        """
+
+        self.reset_search_counts()
+        self.next_budget_check = self.BUDGET_CHECK_INTERVAL
+        self.enforce_search_budget = False
+        if self.search_algorithm != 'minimax':
+            # Negamax scores don't depend on the path to a position, so one set of tables serves every root move,
+            # every pass of iterative deepening, and every move of the game
+            self.start_next_search()
+
+        if self.time_budget is None and self.node_budget is None:
+            self.search_depth = self.max_minimax_depth
+            self.possible_final_moves = self.search_root_moves()
+            self.completed_depth = self.search_depth
+        else:
+            self.possible_final_moves = self.iterative_deepening()
+                
+        return self.find_best_turn(self.possible_final_moves)
+
+    def iterative_deepening(self):
+        """
+        Searches one turn deeper each pass, until the whole game has been searched or the time or node budget runs
+        out. Each pass tries the root moves in the order the last pass ranked them, so the strongest replies are
+        searched first.
+
+        The first pass is always allowed to finish, so there is a move to play however small the budget.
+
+        Returns:
+            (dict): Keys are coordinates of next available moves, values are their scores from the deepest pass
+                that finished
+        """
+
+        if self.time_budget is not None:
+            self.search_deadline = time() + self.time_budget
+        else:
+            self.search_deadline = None
+
+        # From the marks, not the move stack, which is empty for positions set with set_position or from_bits
+        empty_spots = self.game_size ** 2 - bin(self.board.x_bits | self.board.o_bits).count('1')
+        completed_moves = None
+        move_order = None
+
+        # Depth of empty_spots - 1 or more never reaches the depth cutoff, and searches the whole game
+        for depth in range(empty_spots):
+            self.search_depth = depth
+            try:
+                completed_moves = self.search_root_moves(move_order)
+            except SearchTimeout:
+                break
+
+            self.completed_depth = depth
+            ranked_moves = sorted(completed_moves, key=completed_moves.get, reverse=(self.turn == GAME_VALS['X']))
+            move_order = [self.board.index_of(coordinates) for coordinates in ranked_moves]
+
+            if self.search_budget_spent():
+                break
+
+            self.enforce_search_budget = True
+
+        return completed_moves
+
+    def search_budget_spent(self):
+        """
+        Returns:
+            True (boolean): If the search has run past its deadline or node budget
+            False (boolean): If there is budget left
+        """
+
+        if self.search_deadline is not None and time() >= self.search_deadline:
+            return True
+
+        if self.node_budget is not None and self.minimax_count >= self.node_budget:
+            return True
+
+        return False
+
+    def check_search_budget(self):
+        """
+        Called by the search every BUDGET_CHECK_INTERVAL positions
+
+        Raises:
+            SearchCancelled: search_cancelled has been set
+            SearchTimeout: The search is held to its budget, and has run past it
+        """
+
+        if self.search_cancelled.is_set():
+            raise SearchCancelled()
+        if self.enforce_search_budget and self.search_budget_spent():
+            raise SearchTimeout()
+        self.next_budget_check += self.BUDGET_CHECK_INTERVAL
+
+    def search_root_moves(self, move_order=None):
+        """
+        Scores every move available to the computer to the current search depth. Each move is searched from fresh
+        tables (see start_root_move_search), in this process or spread over a process pool when workers > 1. The
+        negamax searches share one set of tables across the moves when run in this process.
+
+        Args:
+            move_order (list): Bit indexes of moves to try first, in order
+
+        Returns:
+            (dict): Keys are coordinates of next available moves, values are the score for that move
+        """
+
+        alpha = -1000000
+        beta = 1000000
+        
+        possible_final_moves = {}
+        gameboard_for_next_move = self.board.copy()
+
+        if self.use_symmetry:
+            _, _, self_symmetries = gameboard_for_next_move.canonical_form(self.turn)
+        else:
+            self_symmetries = []
+
+        root_moves = gameboard_for_next_move.candidate_moves(self_symmetries, self.prune_dead_spots, self.neighborhood)
+        if not root_moves:
+            # Every spot is dead and the game is a tie whatever is played, but the computer still has to move
+            root_moves = gameboard_for_next_move.unique_moves(self_symmetries)
+        if self.search_algorithm != 'minimax':
+            # Only strictly better moves replace the first one searched, so ties go to the most promising spot
+            root_moves.sort(key=partial(self.static_move_score, gameboard_for_next_move), reverse=True)
+            if not move_order:
+                # The best move an earlier search found here, on the principal variation it expected
+                root_entry = self.probe_root()
+                if root_entry is not None and root_entry[1] in root_moves:
+                    move_order = [root_entry[1]]
+        if move_order:
+            root_moves = [moves for moves in move_order if moves in root_moves] + \
+                         [moves for moves in root_moves if moves not in move_order]
+
+        if self.workers > 1:
+            root_scores = self.search_root_moves_in_parallel(gameboard_for_next_move, root_moves)
+            if self.search_algorithm != 'minimax':
+                self.break_root_ties(root_scores, root_moves)
+        elif self.search_algorithm == 'pvs':
+            root_scores = self.principal_variation_root_scores(gameboard_for_next_move, root_moves)
+        elif self.search_algorithm == 'mtdf':
+            root_scores = self.mtdf_root_scores(gameboard_for_next_move, root_moves)
+        else:
+            root_scores = {}
+            for moves in root_moves:
+                self.start_root_move_search()
+                gameboard_for_next_move.make_move(moves, self.turn)
+                # _ is returned turn count from minimax, and is ignored
+                root_scores[moves], _ = self.minimax_score_this_turn(self.turn * -1, gameboard_for_next_move, 0,
+                                                                     alpha, beta)
+                gameboard_for_next_move.unmake_move()
+
+        for moves in root_moves:
+            # Mirror images of this move score the same, keep them all so ties are still picked from at random
+            for symmetry in [0] + self_symmetries:
+                equivalent_move = gameboard_for_next_move.symmetries[symmetry][moves]
+                possible_final_moves[gameboard_for_next_move.coordinates_of(equivalent_move)] = root_scores[moves]
+
+        return possible_final_moves
+
+    def break_root_ties(self, root_scores, root_moves):
+        """
+        Gives ties for the best score to the move searched first, as the single process negamax searches do, by
+        lowering the others' scores below it
+
+        Args:
+            root_scores (dict): Keys are bit indexes of the moves, values are scores for X (maximizer), updated in
+                place
+            root_moves (list): Bit indexes of the moves, in the order they were searched
+        """
+
+        whose_turn = self.turn
+        best = max(root_scores[moves] * whose_turn for moves in root_moves)
+        first_best = next(moves for moves in root_moves if root_scores[moves] * whose_turn == best)
+        for moves in root_moves:
+            if moves != first_best and root_scores[moves] * whose_turn == best:
+                root_scores[moves] = (best - 1) * whose_turn
+
+    def principal_variation_root_scores(self, root_board, root_moves):
+        """
+        Scores the computer's moves with principal variation search. The first move is searched with a full window,
+        every other move with a null window just above the best score so far, which only tells whether it beats it,
+        and is searched again with a full window when it does.
+
+        Args:
+            root_board (Bitboard): The computer's position, moves are made and unmade on it in place
+            root_moves (list): Bit indexes of the moves to score, best guess first
+
+        Returns:
+            (dict): Keys are bit indexes of the moves, values are scores for X (maximizer). Only the best move gets its
+                exact score, the others get an upper bound below it, even when they tie it.
+        """
+
+        infinity = self.NEGAMAX_INFINITY
+        whose_turn = self.turn
+        root_scores = {}
+        best = -infinity
+
+        for moves_tried, moves in enumerate(root_moves):
+            root_board.make_move(moves, whose_turn)
+            if not moves_tried:
+                score = -self.negamax_score(whose_turn * -1, root_board, 0, -infinity, infinity)
+            else:
+                score = -self.negamax_score(whose_turn * -1, root_board, 0, -best - 1, -best)
+                if score > best:
+                    score = -self.negamax_score(whose_turn * -1, root_board, 0, -infinity, -best)
+                else:
+                    # At most a tie, which goes to the move searched first
+                    score = min(score, best - 1)
+            root_board.unmake_move()
+
+            root_scores[moves] = score * whose_turn
+            best = max(best, score)
+
+        return root_scores
+
+    def mtdf_root_scores(self, root_board, root_moves):
+        """
+        Scores the computer's moves with MTD(f). The score of the position is closed in on with null window searches
+        only, starting from the score of the last pass of iterative deepening, or of a win on the move when there is
+        one, and leaning on the transposition table to not search the same positions over again. The moves keep the
+        scores of the last pass that failed high, where the move that reached the final score was found.
+
+        Args:
+            root_board (Bitboard): The computer's position, moves are made and unmade on it in place
+            root_moves (list): Bit indexes of the moves to score, best guess first
+
+        Returns:
+            (dict): Keys are bit indexes of the moves, values are scores for X (maximizer). Only the best move gets its
+                exact score, the others get an upper bound below it, even when they tie it.
+        """
+
+        infinity = self.NEGAMAX_INFINITY
+        whose_turn = self.turn
+        score = self.mtdf_guess
+        for moves in root_moves:
+            root_board.make_move(moves, whose_turn)
+            won = root_board.last_move_won()
+            root_board.unmake_move()
+            if won:
+                # Nothing beats a win on the move, so start from its score rather than closing in on it from below
+                score = self.NEGAMAX_WIN_SCORE
+                break
+        # No move scores more than a win on the move, so closing in on one needs no pass to prove nothing beats it
+        lower = -self.NEGAMAX_WIN_SCORE
+        upper = self.NEGAMAX_WIN_SCORE
+        root_scores = {}
+
+        while lower < upper:
+            beta = score + 1 if score == lower else score
+            score = -infinity
+            pass_scores = {}
+            for moves in root_moves:
+                root_board.make_move(moves, whose_turn)
+                move_score = -self.negamax_score(whose_turn * -1, root_board, 0, -beta, -beta + 1)
+                root_board.unmake_move()
+
+                pass_scores[moves] = move_score
+                score = max(score, move_score)
+                if score >= beta:
+                    break
+
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+                # The move that failed high reaches lower, and the ones before it fell short of beta, which is no
+                # higher. Once upper comes down to lower, no move beats it, so this pass holds the scores to keep.
+                root_scores = pass_scores
+
+        self.mtdf_guess = lower
+        best_move = max(root_scores, key=root_scores.get)
+        root_scores = {moves: min(root_scores.get(moves, lower - 1), lower - 1) * whose_turn for moves in root_moves}
+        root_scores[best_move] = lower * whose_turn
+        return root_scores
+
+    def search_root_moves_in_parallel(self, root_board, root_moves):
+        """
+        Hands each of the computer's moves to a process pool, and collects the scores as they finish.
+
+        The minimax search scores every move with the same full window and the same fresh tables the single process
+        search uses. Its scores fold in the turn count, so narrowing the window with the best score found so far
+        would change the scores of the other moves. Scores, and so the move played, match the single process search
+        at the same depth.
+
+        The negamax scores don't depend on the path to a position, so those searches share the best score found as
+        results arrive, as principal variation search does in one process. The first move is searched alone with a
+        full window. Each later move is handed out with a null window just above the best score when it is handed
+        out, and searched again above the best score if it beats it. Only the best move gets its exact score, the
+        others an upper bound below it.
+
+        Args:
+            root_board (Bitboard): Board the computer is moving on
+            root_moves (list): Bit indexes of the moves to search, best guess first
+
+        Returns:
+            (dict): Keys are bit indexes of the moves, values are their scores
+        """
+
+        # Imported here, so processes that never search in parallel don't load multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+        if self.process_pool is None:
+            self.process_pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        settings = (self.game_size, self.table_size, self.use_symmetry, self.use_move_ordering, self.prune_dead_spots,
+                    self.neighborhood, self.leaf_evaluator, self.search_algorithm, self.search_cache is not None)
+        if self.enforce_search_budget:
+            deadline = self.search_deadline
+        else:
+            deadline = None
+
+        whose_turn = self.turn
+        infinity = self.NEGAMAX_INFINITY
+        share_bounds = self.search_algorithm != 'minimax'
+
+        def submit(moves, window):
+            future = self.process_pool.submit(search_root_move_in_worker, settings, root_board.x_bits,
+                                              root_board.o_bits, whose_turn, moves, self.search_depth, deadline,
+                                              window)
+            pending[future] = (moves, window)
+
+        pending = {} # Keyed by future, values are (move, window it was searched with, None for a full window)
+        waiting_moves = list(root_moves)
+        root_scores = {}
+        best = -infinity # Best score for the computer so far, exact, negamax searches only
+
+        if share_bounds:
+            # The first move sets the bound the others are searched against
+            submit(waiting_moves.pop(0), None)
+        else:
+            while waiting_moves:
+                submit(waiting_moves.pop(0), None)
+
+        try:
+            while pending:
+                finished, _ = wait(pending, timeout=WORKER_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                if self.search_cancelled.is_set():
+                    raise SearchCancelled()
+
+                for future in finished:
+                    moves, window = pending.pop(future)
+                    score, counts = future.result()
+                    self.add_search_counts(counts)
+                    if not share_bounds:
+                        root_scores[moves] = score
+                        continue
+
+                    score *= whose_turn
+                    if window is None or (window[1] == infinity and score > window[0]):
+                        # Exact: a full window, or a search above a bound that it beat
+                        if score > best:
+                            best = score
+                            root_scores[moves] = score * whose_turn
+                            continue
+                    elif window[1] != infinity and score > window[0]:
+                        # Beat the null window, the score is only a lower bound. Find out if it beats the best so far.
+                        submit(moves, (best, infinity))
+                        continue
+
+                    # At most a tie, which goes to the move already holding the best score
+                    root_scores[moves] = min(score, best - 1) * whose_turn
+
+                # Nothing is handed out until the first move's exact score is in, a null window below it would
+                # always fail high and have the move searched twice
+                while share_bounds and best > -infinity and waiting_moves and len(pending) < self.workers:
+                    submit(waiting_moves.pop(0), (best, best + 1))
+
+                if self.enforce_search_budget and self.search_budget_spent():
+                    raise SearchTimeout()
+        finally:
+            for future in pending:
+                future.cancel()
+
+        return root_scores
+
+    def shutdown_workers(self):
+        """Stops the process pools used by the parallel searches, if any were started"""
+
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
+            self.process_pool = None
+        if self.monte_carlo is not None:
+            self.monte_carlo.shutdown()
+
+    def minimax_score_this_turn(self, whose_turn, game_board, turn_count, alpha, beta):
+        """
+        Implements minimax algorithm, reads in a TicTacToe gameboard, performs algorithm to find potential best move
+        This involves determining whether best move is offensive or defensive
+        It creates a 'game tree', with each branch being a different possible game option
+        It scores each tree based on its final state, per the score key below
+        Scores assigned for gameboard positions:
+        
+        -10 for O win
+        10 for X win
+        Add # of turns to O score
+        Subtract # of turns to X score
+
+        Positions already searched to at least the same depth are read back from the transposition table. Results
+        that caused a cutoff are stored as bounds, and only reused when they would cause the same cutoff again.
+        This search's scores depend on the alpha and beta a position was searched with, so a score read back can
+        differ from the one searching the position again would give, and with a table the root scores can differ
+        from a search without one (table_size=0). The best moves are the same or equally strong in the positions
+        checked, but the scores aren't comparable between the two.
+        With symmetry on, the table is keyed by the canonical hash, so mirror images of a position share an entry,
+        and of any moves that are mirror images of each other only one is searched.
+        With move ordering on, moves are tried best guess first (see order_moves), so alpha-beta cuts off sooner.
+        
+        Args:
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+            game_board (Bitboard): Board being searched, moves are made and unmade on it in place
+            turn_count (int): Initialized at 0, counts the # of turns needed for a win in order to find optimal move
+            alpha (int): Begins at negative infinity, starts low and is used as comparison in max evaluation
+            beta (int): Begings at positive infinity, starts high and is used as comparison in min evaluation
+        """
+
+        self.minimax_count += 1
+
+        if self.minimax_count >= self.next_budget_check:
+            self.check_search_budget()
+        
+        if whose_turn == GAME_VALS["X"]:
+            best = float('-inf')
+        else:
+            best = float('inf')
+        
+        if game_board.last_move_won():
+            if whose_turn == GAME_VALS["X"]:
+                return -10, turn_count
+            else:
+                return 10, turn_count
+
+        if turn_count > self.search_depth:
+            # Insert heuristic here to give some points depending on situation of the board
+            max_depth_score = self.score_leaf(game_board)
+            if whose_turn == GAME_VALS["X"]:
+                return max_depth_score[0], turn_count
+            else:
+                return max_depth_score[1], turn_count
+            
+        if game_board.is_full():
+            return 0, turn_count
+
+        table = self.transposition_table
+        if self.use_symmetry:
+            table_key, symmetry, self_symmetries = game_board.canonical_form(whose_turn)
+        else:
+            table_key = game_board.hash_for_turn(whose_turn)
+            symmetry = 0
+            self_symmetries = []
+
+        available_spaces = game_board.candidate_moves(self_symmetries, self.prune_dead_spots, self.neighborhood)
+        if not available_spaces:
+            # Every empty spot is dead, so nobody can win from here
+            return 0, turn_count
+
+        depth_left = self.search_depth - turn_count
+        if self.use_move_ordering and depth_left >= self.ORDERING_MIN_DEPTH:
+            self.order_moves(game_board, available_spaces, whose_turn, turn_count)
+
+        if table is not None:
+            entry = table.probe(table_key)
+            if entry is not None:
+                _, entry_depth, bound, entry_score, entry_turns, entry_move = entry
+                if entry_depth >= depth_left and (bound == EXACT or
+                                                  (bound == LOWER_BOUND and entry_score >= beta) or
+                                                  (bound == UPPER_BOUND and entry_score <= alpha)):
+                    self.table_return_count += 1
+                    return entry_score, entry_turns
+
+                if entry_move is not None:
+                    # Stored moves are in the canonical position's frame, map it back onto this board
+                    entry_move = game_board.inverse_symmetries[symmetry][entry_move]
+                    if entry_move in available_spaces:
+                        # Try the best move from the earlier search first, it is the most likely to cause a cutoff
+                        available_spaces.remove(entry_move)
+                        available_spaces.insert(0, entry_move)
+
+            original_alpha = alpha
+            original_beta = beta
+                
+        self.expanded_count += 1
+        if turn_count + 2 > self.max_depth_reached:
+            # The moves searched from here are turn_count + 2 plies below the computer's position
+            self.max_depth_reached = turn_count + 2
+
+        # Every move from here reaches the depth cutoff, so once the first few haven't caused a cutoff, the rest are
+        # scored together
+        frontier_scores = None
+        if depth_left == 0 and self.frontier_evaluator is not None:
+            batch_from = self.FRONTIER_BATCH_AFTER
+        else:
+            batch_from = -1
+
+        scores = {}
+        turns = {}
+        for moves_tried, space in enumerate(available_spaces):
+            if moves_tried == batch_from:
+                frontier_scores = self.frontier_evaluator.score_moves(game_board, whose_turn)
+
+            if frontier_scores is not None:
+                self.minimax_count += 1
+                final_score = frontier_scores[space]
+                final_turn_count = turn_count + 1
+            else:
+                game_board.make_move(space, whose_turn)
+                final_score, final_turn_count = self.minimax_score_this_turn(whose_turn * -1, game_board, turn_count + 1, alpha, beta)
+                game_board.unmake_move()
+
+            scores[space] = final_score
+            turns[space] = final_turn_count
+            
+            if whose_turn == GAME_VALS['X']:
+                best = max(best, final_score)
+                alpha = max(alpha, best)
+            else:
+                best = min(best, final_score)
+                beta = min(beta, best)
+
+            if beta <= alpha:
+                self.record_cutoff(space, whose_turn, turn_count, depth_left, moves_tried)
+                break
+
+        self.children_count += len(scores)
+            
+        if whose_turn == GAME_VALS["O"]:
+            best_space = min(scores, key=scores.get)
+            final_score = min(scores.values()) + min(turns.values())
+        else:
+            best_space = max(scores, key=scores.get)
+            final_score = max(scores.values()) - min(turns.values())
+
+        if table is not None:
+            if final_score <= original_alpha:
+                bound = UPPER_BOUND
+            elif final_score >= original_beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            table.store(table_key, depth_left, bound, final_score, min(turns.values()),
+                        game_board.symmetries[symmetry][best_space])
+
+        return final_score, min(turns.values())
+
+    def negamax_score(self, whose_turn, game_board, turn_count, alpha, beta):
+        """
+        Negamax search with principal variation search, used by the 'pvs' and 'mtdf' search algorithms. Scores are
+        for the player to move, so each player maximizes the negated score of the position their move leads to.
+
+        A win scores NEGAMAX_WIN_SCORE less the turns it takes, so it is folded into the score rather than returned
+        beside it, and scores stay comparable across the window. Positions past the depth cutoff score the
+        difference between the two players' open lines. Only the first move of a position is searched with the full
+        window, the rest with a null window that only tells whether they beat it, and are searched again when they
+        do. Scores are fail-soft, and the transposition table, move ordering, and symmetry work as in
+        minimax_score_this_turn.
+
+        Args:
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+            game_board (Bitboard): Board being searched, moves are made and unmade on it in place
+            turn_count (int): Turns searched below the computer's move, 0 for the position right after it
+            alpha (int): Score the player to move is already sure of
+            beta (int): Score the other player is already sure of holding the player to move to
+
+        Returns:
+            (int): Score of the position for the player to move
+        """
+
+        self.minimax_count += 1
+
+        if self.minimax_count >= self.next_budget_check:
+            self.check_search_budget()
+
+        if game_board.last_move_won():
+            return turn_count - self.NEGAMAX_WIN_SCORE
+
+        if turn_count > self.search_depth:
+            x_score, o_score = self.score_leaf(game_board)
+            return (x_score + o_score) * whose_turn
+
+        if game_board.is_full():
+            return 0
+
+        table = self.transposition_table
+        if self.use_symmetry:
+            table_key, symmetry, self_symmetries = game_board.canonical_form(whose_turn)
+        else:
+            table_key = game_board.hash_for_turn(whose_turn)
+            symmetry = 0
+            self_symmetries = []
+
+        available_spaces = game_board.candidate_moves(self_symmetries, self.prune_dead_spots, self.neighborhood)
+        if not available_spaces:
+            # Every empty spot is dead, so nobody can win from here
+            return 0
+
+        depth_left = self.search_depth - turn_count
+        if self.use_move_ordering and depth_left >= self.ORDERING_MIN_DEPTH:
+            self.order_moves(game_board, available_spaces, whose_turn, turn_count)
+
+        original_alpha = alpha
+        entry = None
+        if table is not None:
+            entry = table.probe(table_key)
+        if entry is None and self.search_cache is not None:
+            entry = self.search_cache.probe(table_key)
+
+        if entry is not None:
+            _, entry_depth, bound, entry_score, _, entry_move = entry
+            entry_score = self.score_from_table(entry_score, turn_count)
+            if entry_depth >= depth_left and (bound == EXACT or
+                                              (bound == LOWER_BOUND and entry_score >= beta) or
+                                              (bound == UPPER_BOUND and entry_score <= alpha)):
+                self.table_return_count += 1
+                return entry_score
+
+            if entry_move is not None:
+                # Stored moves are in the canonical position's frame, map it back onto this board
+                entry_move = game_board.inverse_symmetries[symmetry][entry_move]
+                if entry_move in available_spaces:
+                    available_spaces.remove(entry_move)
+                    available_spaces.insert(0, entry_move)
+
+        self.expanded_count += 1
+        if turn_count + 2 > self.max_depth_reached:
+            # The moves searched from here are turn_count + 2 plies below the computer's position
+            self.max_depth_reached = turn_count + 2
+
+        best = -self.NEGAMAX_INFINITY
+        best_space = None
+        for moves_tried, space in enumerate(available_spaces):
+            game_board.make_move(space, whose_turn)
+            if not moves_tried:
+                score = -self.negamax_score(whose_turn * -1, game_board, turn_count + 1, -beta, -alpha)
+            else:
+                score = -self.negamax_score(whose_turn * -1, game_board, turn_count + 1, -alpha - 1, -alpha)
+                if alpha < score < beta:
+                    score = -self.negamax_score(whose_turn * -1, game_board, turn_count + 1, -beta, -score)
+            game_board.unmake_move()
+
+            if score > best:
+                best = score
+                best_space = space
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        self.record_cutoff(space, whose_turn, turn_count, depth_left, moves_tried)
+                        break
+
+        self.children_count += moves_tried + 1
+
+        if best <= original_alpha:
+            bound = UPPER_BOUND
+        elif best >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        table_score = self.score_to_table(best, turn_count)
+        table_move = game_board.symmetries[symmetry][best_space]
+        if table is not None:
+            table.store(table_key, depth_left, bound, table_score, turn_count, table_move)
+        if self.search_cache is not None and depth_left >= CACHE_MIN_DEPTH:
+            self.search_cache.record(table_key, depth_left, bound, table_score, table_move)
+
+        return best
+
+    def score_to_table(self, score, turn_count):
+        """
+        Args:
+            score (int): Negamax score of a position
+            turn_count (int): Turns below the computer's move the position was found at
+
+        Returns:
+            (int): The score to store, with wins counted in turns from the position itself rather than from the
+                computer's move, so the entry holds wherever the position comes up again
+        """
+
+        if score > self.NEGAMAX_WIN_BOUND:
+            return score + turn_count
+        if score < -self.NEGAMAX_WIN_BOUND:
+            return score - turn_count
+
+        return score
+
+    def score_from_table(self, score, turn_count):
+        """
+        Args:
+            score (int): Score stored by score_to_table
+            turn_count (int): Turns below the computer's move the position is found at now
+
+        Returns:
+            (int): Negamax score of the position at this turn count
+        """
+
+        if score > self.NEGAMAX_WIN_BOUND:
+            return score - turn_count
+        if score < -self.NEGAMAX_WIN_BOUND:
+            return score + turn_count
+
+        return score
+
+    def order_moves(self, game_board, available_spaces, whose_turn, turn_count):
+        """
+        Sorts moves in place, most promising first:
+            1. Killer moves, which caused a cutoff in another position at the same turn count
+            2. Then by history, credit given to a move each time it causes a cutoff anywhere in the search
+            3. Then by a static score, favoring spots on lines still open for a win, lines with more marks on them,
+               and spots nearer the middle of the board
+
+        Args:
+            game_board (Bitboard): Board being searched
+            available_spaces (list): Bit indexes of the moves to sort
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+            turn_count (int): Turns searched below the root, indexes the killer moves
+        """
+
+        static_move_score = self.static_move_score
+        history = self.history_table[whose_turn]
+        killers = self.killer_moves[turn_count]
+
+        def move_score(space):
+            return (space in killers, history[space], static_move_score(game_board, space))
+
+        available_spaces.sort(key=move_score, reverse=True)
+
+    def static_move_score(self, game_board, space):
+        """
+        Args:
+            game_board (Bitboard): Board the move would be played on
+            space (int): Bit index of the move
+
+        Returns:
+            (int): Higher for spots on more lines still open for a win, lines with more marks on them, and spots
+                nearer the middle of the board
+        """
+
+        x_counts = game_board.x_counts
+        o_counts = game_board.o_counts
+        static_score = -self.center_distance[space]
+        for line in game_board.cell_lines[space]:
+            if not (x_counts[line] and o_counts[line]):
+                static_score += 8 + 4 * (x_counts[line] + o_counts[line])
+
+        return static_score
+
+    def record_cutoff(self, space, whose_turn, turn_count, depth_left, moves_tried):
+        """
+        Counts a cutoff, and credits the move that caused it in the killer moves and history table
+
+        Args:
+            space (int): Bit index of the move that caused the cutoff
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+            turn_count (int): Turns searched below the root
+            depth_left (int): Turns left to search below this position, deeper cutoffs earn more history credit
+            moves_tried (int): Number of moves tried before this one
+        """
+
+        self.cutoff_count += 1
+        self.cutoffs_per_ply[turn_count + 1] += 1
+        if not moves_tried:
+            self.first_move_cutoff_count += 1
+
+        if not self.use_move_ordering:
+            return
+
+        killers = self.killer_moves[turn_count]
+        if killers[0] != space:
+            killers[1] = killers[0]
+            killers[0] = space
+
+        self.history_table[whose_turn][space] += max(depth_left, 1) ** 2
+
+    def find_best_turn(self, next_moves):
+        """
+        Given a list of best possible turns, find the best possible turn in the shortest amount of turn. 
+        Since move count is included in the score, this will just need to maximize score for X, and minimize for O.
+        If multiple turns have the same score, it randomly chooses one.
+
+        Args:
+            next_moves (dict): Keys are next available moves, values are the score for that move
+
+        Returns:
+            (tuple): Coordinates of best possible move
+        """
+        
+        if self.turn == GAME_VALS['X']:
+            final_score = max([score for score in next_moves.values()])
+        else:
+            final_score = min([score for score in next_moves.values()])
+            
+        final_moves = [coords for coords, score in next_moves.items() if score == final_score]
+        
+        if len(final_moves) == 1:
+            return final_moves[0]
+        
+        else:
+            return random.choice(final_moves)
+        
+    def _display_game_board(self, game_size, game_board):
+        print()
+        for rows in range(game_size):
+            for cols in range(game_size):
+                value = [turn for turn, val in GAME_VALS.items() if val == game_board[(rows, cols)]]
+                if value == ['EMPTY']:
+                    value = [""]
+                print(value, end=" ")
+            print("")
+        coordinates = [coords for coords, values in game_board.items()]
+
+_worker_games = {} # One TicTacToeGame per search settings in each worker process, kept between tasks
+
+
+def search_root_move_in_worker(settings, x_bits, o_bits, whose_turn, move, search_depth, deadline, window=None):
+    """
+    Runs in a worker process of TicTacToeGame.search_root_moves_in_parallel, scoring a single move for the computer.
+    The worker's game, and its transposition table, are kept between tasks to save rebuilding them.
+
+    Args:
+        settings (tuple): (game_size, table_size, use_symmetry, use_move_ordering, prune_dead_spots, neighborhood,
+            leaf_evaluator, search_algorithm, use_search_cache) of the game being searched
+        x_bits (int): Mask of X's spots before the move
+        o_bits (int): Mask of O's spots before the move
+        whose_turn (int): -1 for O's turn, 1 for X's turn
+        move (int): Bit index of the move to score
+        search_depth (int): Turn count past which positions are scored by the depth cutoff heuristic
+        deadline (float): time() past which the search gives up with SearchTimeout, None for no limit
+        window (tuple): (alpha, beta) for the computer, for the negamax searches, None for a full window. A score
+            outside the window is only a bound on the move's score.
+
+    Returns:
+        (tuple): (score for X, search counts from TicTacToeGame.search_counts)
+    """
+
+    (game_size, table_size, use_symmetry, use_move_ordering, prune_dead_spots, neighborhood, leaf_evaluator,
+     search_algorithm, use_search_cache) = settings
+    game = _worker_games.get(settings)
+    if game is None:
+        game = TicTacToeGame(game_size, table_size=table_size, use_symmetry=use_symmetry,
+                             use_move_ordering=use_move_ordering, use_opening_book=False,
+                             prune_dead_spots=prune_dead_spots, neighborhood=neighborhood,
+                             leaf_evaluator=leaf_evaluator, search_algorithm=search_algorithm,
+                             use_search_cache=use_search_cache)
+        _worker_games[settings] = game
+
+    game.start_root_move_search()
+    game.reset_search_counts()
+    game.search_depth = search_depth
+    game.search_deadline = deadline
+    game.enforce_search_budget = deadline is not None
+    game.next_budget_check = game.BUDGET_CHECK_INTERVAL
+
+    board = Bitboard.from_bits(game_size, x_bits, o_bits)
+    board.make_move(move, whose_turn)
+    if search_algorithm == 'minimax':
+        score, _ = game.minimax_score_this_turn(whose_turn * -1, board, 0, -1000000, 1000000)
+    else:
+        if window is None:
+            window = (-game.NEGAMAX_INFINITY, game.NEGAMAX_INFINITY)
+        alpha, beta = window
+        score = -game.negamax_score(whose_turn * -1, board, 0, -beta, -alpha) * whose_turn
+        # Workers don't see the end of the game, so they write back after every move they score
+        game.flush_search_cache()
+
+    return score, game.search_counts()
+
+
+def new_game(game_size, first_player=None, **settings):
+    """
+    Starts a game on an empty board
+
+    Args:
+        game_size (integer): Length of one side of the board
+        first_player (integer): 1 for X, -1 for O, None to pick at random
+        settings: Keyword arguments for TicTacToeGame, such as time_budget or workers
+
+    Returns:
+        (TicTacToeGame): The new game, with first_player to move
+    """
+
+    game = TicTacToeGame(game_size, **settings)
+    for rows in range(game_size):
+        for cols in range(game_size):
+            game.add_game_spot((rows, cols))
+
+    if first_player is None:
+        game.find_first_player()
+    else:
+        game.turn = first_player
+
+    return game
+
+
+def parse_board(board_text):
+    """
+    Reads a board written one row at a time, with X, O, and . for an empty spot. Rows may be separated by / or
+    whitespace.
+
+    Args:
+        board_text (string): Such as "X.O/.X./..O"
+
+    Raises:
+        ValueError: The board isn't square, or holds other symbols
+
+    Returns:
+        (tuple): (game_size, x_bits, o_bits)
+    """
+
+    spots = [symbol for symbol in board_text.upper() if symbol not in '/ \n\t']
+    game_size = round(len(spots) ** 0.5)
+    if game_size not in BOARD_SIZES or game_size ** 2 != len(spots):
+        raise ValueError(f"Expected a square board from {BOARD_SIZES[0]}x{BOARD_SIZES[0]} to "
+                         f"{BOARD_SIZES[-1]}x{BOARD_SIZES[-1]}, got {len(spots)} spots")
+
+    x_bits = 0
+    o_bits = 0
+    for index, symbol in enumerate(spots):
+        if symbol not in BOARD_SYMBOLS:
+            raise ValueError(f"Unknown symbol {symbol!r}, use X, O, or .")
+        if BOARD_SYMBOLS[symbol] == GAME_VALS['X']:
+            x_bits |= 1 << index
+        elif BOARD_SYMBOLS[symbol] == GAME_VALS['O']:
+            o_bits |= 1 << index
+
+    return game_size, x_bits, o_bits
+
+
+def format_board(game):
+    """
+    Args:
+        game (TicTacToeGame): Game to draw
+
+    Returns:
+        (string): The board one row per line, in the symbols parse_board reads
+    """
+
+    symbols = {value: symbol for symbol, value in BOARD_SYMBOLS.items()}
+    return '\n'.join(' '.join(symbols[game.game_data[rows, cols]] for cols in range(game.game_size))
+                     for rows in range(game.game_size))
+
+
+def run_best_move(arguments):
+    """Prints the computer's move for the board given on the command line, with its search stats, as JSON"""
+
+    import json
+
+    game_size, x_bits, o_bits = parse_board(arguments.board)
+    game = TicTacToeGame(game_size, time_budget=arguments.time_budget, workers=arguments.workers,
+                         search_algorithm=arguments.algorithm)
+    game.set_position(x_bits, o_bits, BOARD_SYMBOLS[arguments.turn])
+
+    try:
+        if game.status != GAME_STATUS['IN_PROGRESS']:
+            print(json.dumps({'status': game.status, 'move': None}))
+            return
+
+        coordinates, search_stats = game.find_next_move_for_computer()
+    finally:
+        game.shutdown_workers()
+
+    print(json.dumps({'status': game.status, 'move': list(coordinates), 'search_stats': search_stats.to_dict()}))
+
+
+def run_terminal_game(arguments):
+    """Plays a game against the computer in the terminal, with moves typed as row and column"""
+
+    game = new_game(arguments.size, first_player=GAME_VALS['X'], time_budget=arguments.time_budget,
+                    workers=arguments.workers, search_algorithm=arguments.algorithm)
+    human = BOARD_SYMBOLS[arguments.human]
+
+    searcher = game
+    if arguments.ponder:
+        # Imported here, as the ponderer builds on this module
+        from TicTacToe_Ponder import Ponderer
+        searcher = Ponderer(game)
+
+    try:
+        while game.status == GAME_STATUS['IN_PROGRESS']:
+            print(format_board(game), end='\n\n')
+
+            if game.turn == human:
+                if searcher is not game:
+                    searcher.start()
+                try:
+                    row, col = (int(number) for number in input("Your move (row col): ").split())
+                    game.play_move((row, col))
+                except ValueError as error:
+                    print(f"Not a valid move: {error}")
+            else:
+                coordinates, search_stats = searcher.find_next_move_for_computer()
+                print(f"Computer plays {coordinates}. {search_stats.summary()}")
+                game.play_move(coordinates)
+    finally:
+        if searcher is not game:
+            searcher.shutdown()
+        game.shutdown_workers()
+
+    print(format_board(game))
+    print(game.status.replace('_', ' '))
+
+
+def main():
+    """Command line entry point"""
+
+    # Imported here, as programs using the engine from code have no need for it
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless TicTacToe engine")
+    parser.add_argument('--time-budget', type=float, default=1.5, help="seconds the computer may spend per move")
+    parser.add_argument('--workers', type=int, default=1, help="processes to split each search across")
+    parser.add_argument('--algorithm', choices=SEARCH_ALGORITHMS, default=None,
+                        help="how the computer searches, defaults to the board size's DEFAULT_SEARCH_ALGORITHMS entry")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    best_move_parser = commands.add_parser('best-move', help="print the computer's move for a board as JSON")
+    best_move_parser.add_argument('--board', required=True, help='rows of X, O, and ., such as "X.O/.X./..O"')
+    best_move_parser.add_argument('--turn', choices=['X', 'O'], required=True, help="player to move")
+    best_move_parser.set_defaults(run=run_best_move)
+
+    play_parser = commands.add_parser('play', help="play against the computer in the terminal")
+    play_parser.add_argument('--size', type=int, default=3, choices=BOARD_SIZES, help="length of one side")
+    play_parser.add_argument('--human', choices=['X', 'O'], default='X', help="which player you are, X goes first")
+    play_parser.add_argument('--ponder', action='store_true', help="let the computer search during your turn")
+    play_parser.set_defaults(run=run_terminal_game)
+
+    arguments = parser.parse_args()
+    arguments.run(arguments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Depth cutoff evaluators for the TicTacToe search engine, beyond the flat open line count kept by Bitboard.
+
+The weighted evaluators score every open line (one holding marks of only one player) by how many marks it holds,
+from a table of weights, so a line one mark short of a win counts for more than a line with a single mark.
+
+'weighted' scores each leaf in pure Python from the board's running line counts. 'numpy' scores all the moves out
+of a position at the depth cutoff together: one matrix row per move, added to the position's line counts, gives the
+line counts after every move at once, and the wins and weighted scores of all of them are read off with array
+operations. NumPy is optional, without it 'numpy' falls back to 'weighted'.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from TicTacToe_Bitboard import GAME_VALS, build_line_masks
+
+LEAF_EVALUATORS = ('open_lines', 'weighted', 'numpy')
+
+WIN_SCORE = 10 # Score of a won position, as in TicTacToeGame.minimax_score_this_turn
+
+# Marks a line one move from a win inside FrontierEvaluator's per spot sums, larger than any spot's weights add up to
+THREAT_SCORE = 1 << 16
+
+
+def build_line_weights(game_size):
+    """
+    Builds the score of an open line by the number of marks on it
+
+    Args:
+        game_size (int): Length of one side of the board
+
+    Returns:
+        (list): Weight for 0 to game_size marks. 0 marks is worth nothing, 1 mark is worth 2 as in the flat open line
+            count, and each further mark adds 2 more.
+    """
+
+    return [2 * marks for marks in range(game_size + 1)]
+
+
+def score_weighted_lines(board, weights):
+    """
+    Pure Python weighted score of a board, from its running line counts
+
+    Args:
+        board (Bitboard): Board to score
+        weights (list): Score of an open line by its number of marks, from build_line_weights
+
+    Returns:
+        (tuple): Tuple containing max score for X, and min score for O
+    """
+
+    x_score = 0
+    o_score = 0
+    for x_marks, o_marks in zip(board.x_counts, board.o_counts):
+        if not o_marks:
+            x_score += weights[x_marks]
+        elif not x_marks:
+            o_score -= weights[o_marks]
+
+    return x_score, o_score
+
+
+class FrontierEvaluator:
+    """Scores every move out of a position whose moves all reach the depth cutoff, with NumPy"""
+
+    def __init__(self, game_size: int, weights: list):
+        """
+        Constructor. Builds the (spots x lines) matrix with a 1 where a spot lies on a line.
+
+        Args:
+            game_size (integer): Length of one side of the board
+            weights (list): Score of an open line by its number of marks, from build_line_weights
+        """
+
+        self.game_size = game_size
+        line_masks = build_line_masks(game_size)
+        self.membership = np.zeros((game_size ** 2, len(line_masks)), dtype=np.float64)
+        for line, mask in enumerate(line_masks):
+            for index in range(game_size ** 2):
+                if mask >> index & 1:
+                    self.membership[index, line] = 1
+
+        self.weights = np.array(weights, dtype=np.float64)
+
+    def score_moves(self, board, whose_turn):
+        """
+        Scores a move on every spot the way the search scores a position past the depth cutoff: a win is worth
+        WIN_SCORE to the winner, otherwise the position gets the heuristic score of the player to move next.
+
+        Args:
+            board (Bitboard): Position before the move
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+
+        Returns:
+            (list): Score after a move on each spot, by bit index. Spots already played get meaningless scores.
+        """
+
+        x_counts = np.array(board.x_counts)
+        o_counts = np.array(board.o_counts)
+
+        if whose_turn == GAME_VALS['X']:
+            mover_counts, other_counts, sign = x_counts, o_counts, 1
+        else:
+            mover_counts, other_counts, sign = o_counts, x_counts, -1
+
+        # The player moving next is the other one, so their open lines are what gets scored. A move only changes
+        # the score by closing the other player's open lines it lands on, and only wins by landing on a line the
+        # mover is one mark short of. Both are summed over each spot's lines in one product, a win as THREAT_SCORE
+        # so it stands out from the weights.
+        other_open = self.weights[other_counts] * (mover_counts == 0)
+        one_short = (mover_counts == self.game_size - 1) & (other_counts == 0)
+        per_spot = self.membership @ (other_open + THREAT_SCORE * one_short)
+
+        scores = sign * (per_spot - other_open.sum())
+        scores[per_spot >= THREAT_SCORE] = sign * WIN_SCORE
+        return scores.astype(int).tolist()
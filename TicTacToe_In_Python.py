@@ -1,11 +1,15 @@
-from time import time
 from tkinter import messagebox
 from tkinter.font import BOLD
 from math import ceil
 from functools import wraps
 
 import tkinter as tk
-import random
+import queue
+import threading
+
+from TicTacToe_Bitboard import GAME_VALS, MAX_BOARD_SIZE
+from TicTacToe_Engine import TicTacToeGame, SearchCancelled, GAME_STATUS
+from TicTacToe_Ponder import Ponderer
 
 """
 Play TicTacToe!
@@ -13,12 +17,6 @@ This script allows you to play any size grid of TicTacToe with another person, n
 Have fun!
 """
 
-GAME_VALS = {
-    'X': 1,
-    'EMPTY': 0,
-    'O': -1
-}
-
 COLORS = {
     "WindowBackground": "#7DB46C",
     "ButtonBackground": "#9FA49E",
@@ -28,22 +26,35 @@ COLORS = {
     "OBackground": "#B47F6C"
 }
 
-MAX_BOARD_SIZE = 10
 BOARD_SIZES = list(range(3, MAX_BOARD_SIZE + 1))
 
+COMPUTER_MOVE_TIME_BUDGET = 1.5 # Seconds the computer may spend searching for a move
+COMPUTER_MOVE_POLL_MS = 50 # How often the window checks if the computer has picked its move
+SEARCH_STATS_LOG_PATH = None # File to log the search stats of every computer move to as JSON lines, None for no log
+# How the board is drawn: 'canvas' draws it on one tk.Canvas, kept between games, 'buttons' makes a button per spot
+BOARD_RENDERING = 'canvas'
+SPOT_PADDING = 5 # Pixels around each spot on the board
+
 class TicTacToeWindow:
     """Window to play TicTacToe on!"""
 
-    def __init__(self, root):
+    def __init__(self, root, board_rendering=BOARD_RENDERING):
         """Constructor for TicTacToe game board
 
         Args:
             root (tk.Tk()): Main window for tkinter object to start tkinter GUI
+            board_rendering (string): 'canvas' to draw the board on one canvas, 'buttons' for a button per spot
         """
 
         self.root = root
+        self.board_rendering = board_rendering
+        self.board_canvas = None # Canvas the board is drawn on, kept for the next game
+        self.canvas_board_size = None # Board size and spot size the canvas was last drawn for
         self.root.title("TicTacToe!")
         self.root.resizable(width=False, height=False)
+        self.root.protocol("WM_DELETE_WINDOW", self.close_window)
+        self.computer_is_thinking = False
+        self.ponderer = None
         self.start_screen()
         self.original_background = self.root.cget("background") # Store original color for later during replay
     
@@ -63,6 +74,14 @@ class TicTacToeWindow:
         self.two_player_chk = tk.Radiobutton(self.opponent_option_frame, text="2 Player", font=("Helvetica", 13), variable=self.opponent_option, value=1)
         self.two_player_chk.grid(row=0, column=1)
         
+        self.show_search_stats = tk.BooleanVar()
+        self.search_stats_chk = tk.Checkbutton(self.opponent_option_frame, text="Show the computer's search stats", font=("Helvetica", 10), variable=self.show_search_stats)
+        self.search_stats_chk.grid(row=1, column=0, columnspan=2)
+
+        self.ponder_on_player_turn = tk.BooleanVar(value=True)
+        self.ponder_chk = tk.Checkbutton(self.opponent_option_frame, text="Let the computer think during your turn", font=("Helvetica", 10), variable=self.ponder_on_player_turn)
+        self.ponder_chk.grid(row=2, column=0, columnspan=2)
+
         self.opponent_option_frame.grid_columnconfigure(0, weight=1)
         self.opponent_option_frame.grid_columnconfigure(1, weight=1)
         
@@ -97,6 +116,8 @@ class TicTacToeWindow:
         
         self.comp_player_chk["state"] = "disabled"
         self.two_player_chk["state"] = "disabled"
+        self.search_stats_chk["state"] = "disabled"
+        self.ponder_chk["state"] = "disabled"
         self.size_capture["state"] = "disabled"
         self.size_input["state"] = "disabled"
 
@@ -174,12 +195,18 @@ class TicTacToeWindow:
             self.BUTTON_HEIGHT = 100
             self.BUTTON_WIDTH = 100
         
-        self.game_data = TicTacToeGame(self.size_of_board)
+        self.game_data = TicTacToeGame(self.size_of_board, time_budget=COMPUTER_MOVE_TIME_BUDGET,
+                                       search_log_path=SEARCH_STATS_LOG_PATH)
         
         # Set single player or two player option
         self.set_player_option_in_game()
         
         self.gui_game_data = {}
+
+        if self.board_rendering == 'canvas':
+            self.make_canvas_board()
+            self.make_status_frame()
+            return
         
         # Next, loop through and create a square of buttons
         for height in range(self.size_of_board):
@@ -201,7 +228,74 @@ class TicTacToeWindow:
                 
                 self.gui_game_data[(self.row, self.column)] = (self.tictactoe_button)
                 self.game_data.add_game_spot((self.row, self.column))
-        
+
+        self.make_status_frame()
+
+    def make_canvas_board(self):
+        """
+        Draws the board on a single canvas, a rectangle and a label per spot. The canvas and its drawing are kept
+        between games, a new game of the same size only clears the spots that were played.
+        """
+
+        spot_pitch = self.BUTTON_WIDTH + 2 * SPOT_PADDING
+
+        if self.board_canvas is None:
+            self.board_canvas = tk.Canvas(self.root, highlightthickness=0, bg=COLORS["WindowBackground"])
+            self.board_canvas.bind('<Button-1>', self.board_canvas_clicked)
+
+        if self.canvas_board_size != (self.size_of_board, spot_pitch):
+            self.board_canvas.delete('all')
+            self.board_canvas.configure(width=spot_pitch * self.size_of_board, height=spot_pitch * self.size_of_board)
+            self.canvas_spots = {} # Keyed by coordinates, values are the ids of the spot's rectangle and label
+            for row in range(self.size_of_board):
+                for column in range(self.size_of_board):
+                    left = column * spot_pitch + SPOT_PADDING
+                    top = row * spot_pitch + SPOT_PADDING
+                    spot = self.board_canvas.create_rectangle(left, top, left + self.BUTTON_WIDTH,
+                                                              top + self.BUTTON_HEIGHT, width=4,
+                                                              fill=COLORS["ButtonBackground"])
+                    label = self.board_canvas.create_text(left + self.BUTTON_WIDTH // 2, top + self.BUTTON_HEIGHT // 2,
+                                                          text="", font=("Helvetica", 30, BOLD))
+                    self.canvas_spots[(row, column)] = (spot, label)
+            self.canvas_board_size = (self.size_of_board, spot_pitch)
+        else:
+            for coordinates in self.played_spots:
+                spot, label = self.canvas_spots[coordinates]
+                self.board_canvas.itemconfig(spot, fill=COLORS["ButtonBackground"])
+                self.board_canvas.itemconfig(label, text="")
+
+        self.played_spots = []
+        self.canvas_enabled = False # Clicks are ignored until the first player is rolled
+        self.board_canvas.grid(row=0, column=0)
+
+        for coordinates in self.canvas_spots:
+            self.game_data.add_game_spot(coordinates)
+
+        # The status bar and buttons go in the rows below the canvas
+        self.row = 0
+        self.column = 0
+
+    def board_canvas_clicked(self, event):
+        """
+        Plays the spot under a click on the canvas board, if it is empty
+
+        Args:
+            event (tk.Event): The click, x and y are in pixels from the canvas's top left corner
+        """
+
+        spot_pitch = self.canvas_board_size[1]
+        coordinates = (event.y // spot_pitch, event.x // spot_pitch)
+        if not self.canvas_enabled or coordinates not in self.canvas_spots:
+            return
+
+        if self.game_data.game_data[coordinates] != GAME_VALS["EMPTY"]:
+            return
+
+        self.game_button_pressed(coordinates)
+
+    def make_status_frame(self):
+        """Creates the frame below the board for the status bar, with the button to roll for the first player"""
+
         self.status_frame = tk.Frame(self.root, height=50)
         self.status_frame.grid(row=(self.row + 1), columnspan=(self.column+1), padx=5, pady=5, sticky="news")
         self.status_frame.rowconfigure(0, weight=1)
@@ -216,7 +310,10 @@ class TicTacToeWindow:
     def which_player_first(self):
         """Runs TicTacToeGame method that returns 1 for X turn, or -1 for O turn"""       
 
-        [vals.config(state="normal") for _, vals in self.gui_game_data.items()]
+        if self.board_rendering == 'canvas':
+            self.canvas_enabled = True
+        else:
+            [vals.config(state="normal") for _, vals in self.gui_game_data.items()]
         
         self.find_first_player_button.destroy()
         
@@ -233,38 +330,48 @@ class TicTacToeWindow:
         Args:
             coords (tuple): Defined as (row, column), both are integers
         """
-        if self.game_is_over:
+        if self.game_is_over or self.computer_is_thinking:
             return
             
         self.coordinates_of_button = (coords[0], coords[1])
-        self.button_pressed = self.gui_game_data[self.coordinates_of_button]
-        self.button_pressed.config(state='disabled')
-        self.button_pressed['text'] = self.current_turn_label
-        
-        if self.current_turn == GAME_VALS['X']:
-            self.button_pressed['background'] = COLORS['XBackground']
-        else:
-            self.button_pressed['background'] = COLORS['OBackground'] 
+        self.mark_spot(self.coordinates_of_button)
             
-        self.game_data.update_game_spot(self.coordinates_of_button)
-        self.game_data.update_turn_count()
+        game_status = self.game_data.play_move(self.coordinates_of_button)
         
-        if self.game_data.player_check_for_win(self.coordinates_of_button):
-            # Check if winner value is equal to current turn's value
+        if game_status in (GAME_STATUS['X_WON'], GAME_STATUS['O_WON']):
             self.game_over()
+        elif game_status == GAME_STATUS['NO_WIN_POSSIBLE']:
+            self.game_over(possible_moves=False)
+        elif game_status == GAME_STATUS['TIE']:
+            self.game_over(GAME_VALS['EMPTY'])
         else:
-            self.game_data.update_turn()
-            
-            if self.game_data.get_turn_count() > (self.size_of_board * 2) + 2:
-                if not self.game_data.check_if_win_possible():
-                    self.game_over(possible_moves=False)
-                    return
-            
-            if not self.game_data.check_spots_available():
-                self.game_over(GAME_VALS['EMPTY'])
-            else:
-                self.update_turn()
+            self.update_turn()
         
+    def mark_spot(self, coordinates):
+        """
+        Shows the current player's mark on a spot, only redrawing that spot
+
+        Args:
+            coordinates (tuple): Defined as (row, column), both are integers
+        """
+
+        if self.current_turn == GAME_VALS['X']:
+            background = COLORS['XBackground']
+        else:
+            background = COLORS['OBackground']
+
+        if self.board_rendering == 'canvas':
+            spot, label = self.canvas_spots[coordinates]
+            self.board_canvas.itemconfig(spot, fill=background)
+            self.board_canvas.itemconfig(label, text=self.current_turn_label[0])
+            self.played_spots.append(coordinates)
+            return
+
+        self.button_pressed = self.gui_game_data[coordinates]
+        self.button_pressed.config(state='disabled')
+        self.button_pressed['text'] = self.current_turn_label
+        self.button_pressed['background'] = background
+
     def update_turn(self):
         """
         Updates self.current_turn and self.current_turn_label with whoever's turn it is.
@@ -286,11 +393,82 @@ class TicTacToeWindow:
         if self.opponent_option.get() == 0:
             # AI player
             if self.current_turn == self.player_one_x_or_o.get():
-                # Player's turn
+                # Player's turn, the computer ponders its answers meanwhile
+                if self.ponderer is not None:
+                    self.ponderer.start()
                 return
             else:
-                self.computer_chosen_coords = self.game_data.find_next_move_for_computer()
-                self.game_button_pressed(self.computer_chosen_coords)
+                self.start_computer_move()
+
+    def start_computer_move(self):
+        """
+        Searches for the computer's move on a background thread, so the window keeps redrawing while it thinks.
+        The result is picked up by check_computer_move, polled with root.after.
+        """
+
+        self.status_label['text'] = "Computer is thinking..."
+        self.computer_is_thinking = True
+
+        self.game_data.search_cancelled.clear()
+        self.computer_move_queue = queue.Queue(maxsize=1)
+        # The ponderer answers from its pondering when it can, and searches the game as usual when it can't
+        searcher = self.ponderer if self.ponderer is not None else self.game_data
+        self.computer_thread = threading.Thread(target=self.run_computer_search,
+                                                args=(searcher, self.computer_move_queue), daemon=True)
+        self.computer_thread.start()
+        self.computer_poll_id = self.root.after(COMPUTER_MOVE_POLL_MS, self.check_computer_move)
+
+    @staticmethod
+    def run_computer_search(searcher, computer_move_queue):
+        """
+        Runs on the background thread. Touches no widgets, only hands its move back through the queue.
+
+        Args:
+            searcher (TicTacToeGame or Ponderer): Finds the computer's move with find_next_move_for_computer
+            computer_move_queue (queue.Queue): Receives the coordinates of the chosen move, and its SearchStats
+        """
+
+        try:
+            computer_move_queue.put(searcher.find_next_move_for_computer())
+        except SearchCancelled:
+            pass
+
+    def check_computer_move(self):
+        """Plays the computer's move if its search has finished, otherwise checks again shortly"""
+
+        try:
+            self.computer_chosen_coords, search_stats = self.computer_move_queue.get_nowait()
+        except queue.Empty:
+            self.computer_poll_id = self.root.after(COMPUTER_MOVE_POLL_MS, self.check_computer_move)
+            return
+
+        self.computer_is_thinking = False
+        if self.show_search_stats.get():
+            self.search_stats_label['text'] = search_stats.summary()
+        self.game_button_pressed(self.computer_chosen_coords)
+
+    def cancel_computer_move(self):
+        """Stops the computer's search if it is running, waits for its thread to end, and stops polling for its result"""
+
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
+        if not self.computer_is_thinking:
+            return
+
+        self.game_data.search_cancelled.set()
+        self.root.after_cancel(self.computer_poll_id)
+        self.computer_is_thinking = False
+        # The search stops at its next check of search_cancelled. Until then it is still using the game's tables, which
+        # play_again clears.
+        self.computer_thread.join()
+
+    def close_window(self):
+        """Cancels any search in progress before closing the window"""
+
+        self.cancel_computer_move()
+        self.shutdown_ponderer()
+        self.root.destroy()
       
     def game_over(self, who_won=None, possible_moves=True):
         """
@@ -318,19 +496,28 @@ class TicTacToeWindow:
         
         self.status_label['text'] = winning_string
         
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
         self.play_again_button = tk.Button(self.root, text="Play Again?", command=self.play_again)
         self.play_again_button.grid(row=(self.row + 2), columnspan = (self.column+1), padx=5, pady=5, sticky="news")
         self.game_is_over = True
     
     def destroy_root_widgets(self):
-        """Clears all widgets in self.root"""
+        """Clears all widgets in self.root, except the board canvas, which is only hidden until the next game"""
 
         for widgets in self.root.winfo_children():
-            widgets.destroy()
+            if widgets is self.board_canvas:
+                widgets.grid_remove()
+            else:
+                widgets.destroy()
     
     def play_again(self):
         """Restarts GUI for a new round of playing"""
 
+        self.cancel_computer_move()
+        self.shutdown_ponderer()
+        self.game_data.clear_search_state()
         self.destroy_root_widgets()
         self.root["background"] = self.original_background
         self.start_screen()
@@ -345,12 +532,26 @@ class TicTacToeWindow:
 
         if self.opponent_option.get() == 0:
             self.game_data.computer_player = True
+            if self.ponder_on_player_turn.get():
+                self.ponderer = Ponderer(self.game_data)
+
+    def shutdown_ponderer(self):
+        """Stops the computer pondering during the player's turn, for the game's end or the window closing"""
+
+        if self.ponderer is not None:
+            self.ponderer.shutdown()
+            self.ponderer = None
    
     def set_status_bar_in_game_window(self):
         """Sets the status bar in the game window"""
 
         self.status_label = tk.Label(self.status_frame, borderwidth=3, relief="groove", font=("Helvetica", 20, BOLD))
         self.status_label.grid(row=0, sticky="news")
+
+        if self.show_search_stats.get() and self.opponent_option.get() == 0:
+            # Below the play again button's row, so it stays put at the end of the game
+            self.search_stats_label = tk.Label(self.root, text="", font=("Helvetica", 10), bg=COLORS["WindowBackground"])
+            self.search_stats_label.grid(row=(self.row + 3), columnspan=(self.column + 1), padx=5, sticky="news")
         
         self.set_status_bar_background_color(self.game_data.get_turn())
 
@@ -367,486 +568,6 @@ class TicTacToeWindow:
         else:
             self.status_label["bg"] = COLORS['O_LabelBackground']
     
-class TicTacToeGame:
-    """Manages the game data for TicTacToe"""
-
-    def __init__(self, game_size: int):
-        """
-        Constructor. Starts empty game data dictionary, and initializes turn count.
-        
-        Args:
-            game_size (integer): Assuming square board, length of one side of tictactoe board.
-        """
-
-        self.game_data = {}
-        self.turn_count = 0
-        self.game_size = game_size
-        self.computer_player = False
-
-        if self.game_size == 3:
-            self.max_minimax_depth = self.game_size ** 2
-        elif 4 <= self.game_size <= 7:
-            self.max_minimax_depth = (-self.game_size + 9)
-        elif self.game_size == 8:
-            self.max_minimax_depth = 2
-        else:
-            self.max_minimax_depth = 1
-    
-    def set_player(self, computer_player: bool):
-        """
-        Setter for player option
-
-        Args:
-            computer_player (boolean): True for an AI player, False for 2 player
-        """
-
-        self.computer_player = computer_player
-    
-    def add_game_spot(self, coordinates: tuple):
-        """
-        Appends spot to self.game_data dictionary with key being coordinates of new spot, and value being EMPTY game value
-
-        Args:
-            coordinates (tuple): Coordinates of spot to add
-        """
-
-        self.game_data[coordinates] = GAME_VALS["EMPTY"]
-        
-    def update_game_spot(self, coordinates):
-        """
-        Updates the gamespot with either X's or O's spot
-
-        Args:
-            coordinates (tuple): Coordinates of spot to update
-        """
-
-        if self.turn == 1:
-            # Was X's turn, update with X's marker
-            self.game_data[coordinates] = GAME_VALS["X"]
-        else:
-            self.game_data[coordinates] = GAME_VALS["O"]
-    
-    def check_spots_available(self, game_board=None):
-        """
-        Checks if cat's game or not by tracking move counts, or checking available moves on gameboard
-        
-        Returns:
-            True (boolean): if spots available
-            False (boolean): if spots not available
-        """
-        
-        if self.turn_count >= self.game_size ** 2:
-            return False
-        
-        if game_board:
-            available_spaces = [coords for coords, vals in game_board.items() if vals == GAME_VALS["EMPTY"]]
-    
-        else:
-            available_spaces = [coords for coords, vals in self.game_data.items() if vals == 0]
-
-        if available_spaces:
-            return True
-
-        else:
-            return False
-    
-    def check_if_win_possible(self):
-        """
-        Check if a win is even possible - if all rows, columns, and diagonals contain one of each X and O, no wins are possible.
-        
-        If game_tied_count == (Length of board * 2) + 2, True
-        
-        Returns:
-            True (boolean) : If win is still possible
-            False (boolean) : If win is not possible
-        """
-        
-        diag_check = set()
-        anti_diag_check = set()
-        game_board = self.game_data
-        game_tied_count = 0
-
-        for rows in range(self.game_size):
-            rows_check = set()
-            col_check = set()
-            for cols in range(self.game_size):
-                rows_check.add(game_board[rows, cols])
-                col_check.add(game_board[cols, rows])
-                
-            if GAME_VALS['X'] in rows_check and GAME_VALS['O'] in rows_check:
-                game_tied_count += 1
-            
-            if GAME_VALS['X'] in col_check and GAME_VALS['O'] in col_check:
-                game_tied_count += 1
-                
-
-            diag_check.add(game_board[rows, rows])
-            anti_diag_check.add(game_board[rows, self.game_size-rows-1])
-        
-        if GAME_VALS ['X'] in diag_check and GAME_VALS['O'] in diag_check:
-            game_tied_count += 1
-        
-        if GAME_VALS['X'] in anti_diag_check and GAME_VALS['O'] in anti_diag_check:
-            game_tied_count += 1
-            
-        if game_tied_count >= (self.game_size * 2) + 2:
-            return False
-        else:
-            return True
-               
-    def find_first_player(self):
-        """Randomly get first player based on current time being even or odd"""
-
-        if (round(time()) % 2) == 0:
-            self.turn = GAME_VALS["X"]
-        else:
-            self.turn = GAME_VALS["O"]
-
-    def update_turn_count(self):
-        """Update the turn count for this instance via updating self.turn_count"""
-
-        self.turn_count += 1
-        
-    def update_turn(self):
-        """Update whose turn it is via updating self.turn"""
-
-        if self.turn == GAME_VALS["X"]:
-            self.turn = GAME_VALS["O"]
-        else:
-            self.turn = GAME_VALS["X"]
-    
-    def get_turn(self):
-        """
-        Getter for self.turn.
-        
-        Returns:
-            self.turn (integer): 1 for X's turn, -1 for O's turn.
-        """
-
-        return self.turn
-    
-    def get_turn_count(self):
-        """
-        Getter for self.turn_count, number of turns played
-        
-        Returns:
-            self.turn_count (integer): Number of turns played
-        """
-
-        return self.turn_count
-        
-    def computer_check_for_win(self, game_board, score_move=False):
-        """
-        Function checks if the backtracking algorithm minimax produced a win, which is based on all possible move sets being run
-        
-        Args:
-            game_board (dict): The game board to check if there is a win
-            score_move (boolean) : True if desire to score themove
-            
-        Returns:
-            True (boolean): A win
-            False (boolean): A loss
-            score (tuple) : If asking for a score, returns a tuple with first value being maximizer score (X), second being minimzer score (O)
-        """
-
-        diag_check = set()
-        anti_diag_check = set()
-        
-        if score_move:
-            max_depth_score = [0, 0]
-        
-        for rows in range(self.game_size):
-            rows_check = set()
-            col_check = set()
-            for cols in range(self.game_size):
-                rows_check.add(game_board[rows, cols])
-                col_check.add(game_board[cols, rows])
-            
-            if self.find_a_winner([rows_check, col_check]):
-                return True
-            
-            if score_move:
-                maximizer_score, minimizer_score = self.score_the_move([rows_check, col_check])
-                max_depth_score[0] += maximizer_score
-                max_depth_score[1] += minimizer_score
-
-            diag_check.add(game_board[rows, rows])
-            anti_diag_check.add(game_board[rows, self.game_size-rows-1])
-        
-        if self.find_a_winner([diag_check, anti_diag_check]):
-            return True
-        
-        if score_move:
-                maximizer_score, minimizer_score = self.score_the_move([diag_check, anti_diag_check])
-                max_depth_score[0] += maximizer_score
-                max_depth_score[1] += minimizer_score
-                
-                return tuple(max_depth_score)
-  
-        return False
-    
-    def score_the_move(self, score_checks):
-        """
-        Finds a score by looking at all the rows, columns, and diagonals. If any contain one value and empty, assign a point
-        if it was X (maximizer), and a negative point if it was for O (minimizer).
-        
-        Args:
-            score_checks (list) : A list of sets
-                These sets contain all unique values for the associated row/column/diagonal
-        
-        Return:
-            score (tuple) : Tuple containing max score for X, and min score for O
-        """
-
-        score = [0, 0]
-        for checks in score_checks:
-            if len(checks) == 2:
-                if GAME_VALS['EMPTY'] in checks:
-                    if GAME_VALS['X'] in checks:
-                        score[0] += 2
-                    else:
-                        score[1] += -2
-        
-        return tuple(score)
-    
-    def player_check_for_win(self, coordinates):
-        """
-        Checks if one of the player's won! Reads in the current instance's gameboard.
-        Only checks for diagonal win if coordinates chosen lie on a diagonal.
-        Only checks for win after first player has made 3 possible moves
-
-        Args:
-            coordinates (tuple): Tuple of coordinates of location player chose
-            
-        Returns:
-            True (boolean): A win
-            False (boolean): A loss
-        """
-        
-        if self.turn_count < (2 * self.game_size) - 1:
-            # Not enough moves to win a game
-            return
-
-        else:
-            rows_check = set()
-            col_check = set()
-            diag_check = set()
-            anti_diag_check = set()
-
-            row = coordinates[0]
-            col = coordinates[1]
-            
-            is_diagonal = self.check_if_diagonal(row, col)
-            
-            if is_diagonal:
-                winning_checks = [rows_check, col_check, diag_check, anti_diag_check]
-            else:
-                winning_checks = [rows_check, col_check]
-            
-            for vals in range(self.game_size):
-                rows_check.add(self.game_data[(row, vals)])
-                col_check.add(self.game_data[(vals, col)])
-                
-                if is_diagonal:
-                    diag_check.add(self.game_data[(vals, vals)])
-                    anti_diag_check.add(self.game_data[(vals, self.game_size-vals-1)])
-                    
-            return self.find_a_winner(winning_checks)
-               
-    def check_if_diagonal(self, row, col):
-        """
-        Checks if the coordinate user chose lie on a diagonal
-
-        Args:
-            row (int): Row coordinate of user chosen spot
-            col (int): Column coordinate of user chosen spot
-        
-        Return:
-            True (boolean): If lies on diagonal of board (or anti-diagonal)
-            False (boolean): Does not lie on diagonal (or anti-diagonal)
-        """
-
-        if (row == col) or (row + col == self.game_size - 1):
-            return True
-        else:
-            return False
-       
-    def random_move_supplier(self):
-        """
-        Provides a random set of coordinates for the computer to choose 
-        
-        Return:
-            (tuple): Coordinates that are currently unoccupied
-        """
-
-        self.empty_spots = [coords for coords, vals in self.game_data.items() if vals == GAME_VALS["EMPTY"]]
-        
-        return random.choice(self.empty_spots)
-
-    def find_a_winner(self, winner_checks):
-        """
-        Finds a winner from a set of given checks, checks being the values listed in a row, column, diagonal, or anti-diagonal
-        from the game board.
-        
-        Args:
-            winner_checks (list) : A list of sets
-                These sets contain all unique values for the associated row/column/diagonal
-                If a single set contains only one unique non-empty value (i.e. 1 or -1), then someone has won
-        
-        Return:
-            True (boolean) : There was a winner
-            False (boolean) : There was no winner
-        """
-
-        for checks in winner_checks:
-            if len(checks) == 1:
-                if GAME_VALS['EMPTY'] not in checks:
-                    return True
-        
-        return False
-    
-    def find_next_move_for_computer(self):
-        """Function runs each possible move available through MINIMAX algorithm to determine a score for the next move.
-
-        Returns:
-            (tuple): Coordinates of best available next move
-        """
-        if self.game_size == 4:
-            if self.turn_count <= 3:
-                return self.random_move_supplier()
-        elif self.game_size > 4:
-            if self.turn_count <= (self.game_size):
-                return self.random_move_supplier()
-        
-        available_moves = [coordinates for coordinates, value in self.game_data.items() if value == GAME_VALS["EMPTY"]]
-        
-        self.minimax_count = 0
-        
-        alpha = -1000000
-        beta = 1000000
-        
-        self.possible_final_moves = {}
-        gameboard_for_next_move = self.game_data
-        for moves in available_moves:
-            gameboard_for_next_move[moves] = self.turn
-            # _ is returned turn count from minimax, and is ignored
-            score_for_this_turn, _ = self.minimax_score_this_turn(self.turn * -1, gameboard_for_next_move, 0, alpha, beta)
-            self.possible_final_moves[moves] = score_for_this_turn
-            gameboard_for_next_move[moves] = GAME_VALS["EMPTY"]
-            
-        print(f"It took {self.minimax_count} iterations to get a move.")
-                
-        return self.find_best_turn(self.possible_final_moves)
-
-    def minimax_score_this_turn(self, whose_turn, game_board, turn_count, alpha, beta):
-        """
-        Implements minimax algorithm, reads in a TicTacToe gameboard, performs algorithm to find potential best move
-        This involves determining whether best move is offensive or defensive
-        It creates a 'game tree', with each branch being a different possible game option
-        It scores each tree based on its final state, per the score key below
-        Scores assigned for gameboard positions:
-        
-        -10 for O win
-        10 for X win
-        Add # of turns to O score
-        Subtract # of turns to X score
-        
-        Args:
-            whose_turn (int): -1 for O's turn, 1 for X's turn
-            game_board (dict): Keys = coordinates of spots, vals are -1 if O spot, 0 if EMPTY, 1 if X spot
-            turn_count (int): Initialized at 0, counts the # of turns needed for a win in order to find optimal move
-            alpha (int): Begins at negative infinity, starts low and is used as comparison in max evaluation
-            beta (int): Begings at positive infinity, starts high and is used as comparison in min evaluation
-        """
-
-        self.minimax_count += 1
-        
-        if whose_turn == GAME_VALS["X"]:
-            best = float('-inf')
-        else:
-            best = float('inf')
-        
-        if self.computer_check_for_win(game_board):
-            if whose_turn == GAME_VALS["X"]:
-                return -10, turn_count
-            else:
-                return 10, turn_count
-
-        if turn_count > self.max_minimax_depth:
-            # Insert heuristic here to give some points depending on situation of the board
-            max_depth_score = self.computer_check_for_win(game_board, True)
-            if whose_turn == GAME_VALS["X"]:
-                return max_depth_score[0], turn_count
-            else:
-                return max_depth_score[1], turn_count
-            
-        if not self.check_spots_available(game_board):
-            return 0, turn_count
-                
-        available_spaces = [coords for coords, vals in game_board.items() if vals == 0]
-        scores = {}
-        turns = {}
-        for space in available_spaces:
-            game_board[space] = whose_turn
-            final_score, final_turn_count = self.minimax_score_this_turn(whose_turn * -1, game_board, turn_count + 1, alpha, beta)
-
-            scores[space] = final_score
-            turns[space] = final_turn_count
-            game_board[space] = 0
-            
-            if whose_turn == GAME_VALS['X']:
-                best = max(best, final_score)
-                alpha = max(alpha, best)
-                if beta <= alpha:
-                    break
-            else:
-                best = min(best, final_score)
-                beta = min(beta, best)
-                if beta <= alpha:
-                    break
-            
-        if whose_turn == GAME_VALS["O"]:
-            return min(scores.values()) + min(turns.values()), min(turns.values())
-        else:
-            return max(scores.values()) - min(turns.values()), min(turns.values())
-
-    def find_best_turn(self, next_moves):
-        """
-        Given a list of best possible turns, find the best possible turn in the shortest amount of turn. 
-        Since move count is included in the score, this will just need to maximize score for X, and minimize for O.
-        If multiple turns have the same score, it randomly chooses one.
-
-        Args:
-            next_moves (dict): Keys are next available moves, values are the score for that move
-
-        Returns:
-            (tuple): Coordinates of best possible move
-        """
-        
-        if self.turn == GAME_VALS['X']:
-            final_score = max([score for score in next_moves.values()])
-        else:
-            final_score = min([score for score in next_moves.values()])
-            
-        final_moves = [coords for coords, score in next_moves.items() if score == final_score]
-        
-        if len(final_moves) == 1:
-            return final_moves[0]
-        
-        else:
-            return random.choice(final_moves)
-        
-    def _display_game_board(self, game_size, game_board):
-        print()
-        for rows in range(game_size):
-            for cols in range(game_size):
-                value = [turn for turn, val in GAME_VALS.items() if val == game_board[(rows, cols)]]
-                if value == ['EMPTY']:
-                    value = [""]
-                print(value, end=" ")
-            print("")
-        coordinates = [coords for coords, values in game_board.items()]
-
 if __name__ == "__main__":
     root = tk.Tk()
     TicTacToeWindow(root)  
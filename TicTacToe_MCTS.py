@@ -0,0 +1,446 @@
+"""
+Monte Carlo tree search for the TicTacToe search engine, for the large boards.
+
+On 8x8 and up the minimax searches only look a turn or two ahead. Monte Carlo tree search (UCT) instead grows a tree
+of the positions it has visited, one position per pass. Each pass walks down the tree picking the move with the best
+UCB1 score, which balances how well a move has done so far against how little it has been tried. It adds one new
+position at the bottom, and finishes the game from there with random moves. The result of that playout is then
+credited to every position on the way back up. The move played is the one tried most often.
+
+Playouts run on plain lists of per line mark counts, copied from the board, and stop as soon as every line holds
+both an X and an O, as nobody can win from there. The search is anytime: it runs until its time or playout budget is
+spent, and always has a move to play. Between moves the tree is kept, and the next search starts from the part of it
+below the moves played since, so what was learned about the likely replies carries over.
+
+With workers > 1, the other processes each grow their own tree from the same position for the same time, and their
+visit counts for the moves are added to this process's before the move is picked.
+"""
+
+from math import log, sqrt
+from time import time
+
+import random
+
+from TicTacToe_Bitboard import Bitboard, GAME_VALS
+
+UCT_EXPLORATION = 1.4 # Weight of the exploration term of UCB1, about sqrt(2) for results between 0 and 1
+DEFAULT_MCTS_TIME_BUDGET = 1.0 # Seconds per move when the game sets no time or playout budget
+CANCEL_CHECK_INTERVAL = 64 # Passes between checks of the budget and the cancel event
+
+# Results of a game for the player who made the last move into a position
+WIN = 1.0
+DRAW = 0.5
+LOSS = 0.0
+
+
+class MonteCarloNode:
+    """One position in the search tree, reached by a move"""
+
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'score', 'terminal')
+
+    def __init__(self, move, player, parent):
+        """
+        Constructor. Starts a position with no visits.
+
+        Args:
+            move (int): Bit index of the move that reached the position, None for the root
+            player (int): Player who made the move, -1 for O, 1 for X
+            parent (MonteCarloNode): Position the move was made from, None for the root
+        """
+
+        self.move = move
+        self.player = player
+        self.parent = parent
+        self.children = []
+        self.untried = [] # Moves not yet added as children, in random order
+        self.visits = 0
+        self.score = 0.0 # Sum of the results of the playouts through the position, for player
+        self.terminal = None # Result for player if the game is over at the position
+
+
+class MonteCarloSearch:
+    """UCT search that keeps its tree from one move of the game to the next"""
+
+    def __init__(self, game_size: int, workers: int = 1, exploration: float = UCT_EXPLORATION,
+                 neighborhood: int = None, seed: int = None):
+        """
+        Constructor. Starts without a tree, the first search builds one.
+
+        Args:
+            game_size (integer): Length of one side of the board
+            workers (integer): Processes to run playouts in, 1 to run them all in this process
+            exploration (float): Weight of the exploration term of UCB1
+            neighborhood (integer): Only add moves at most this many rows or columns from a mark to the tree, None
+                for moves anywhere. Playouts may still play anywhere.
+            seed (integer): Seed for the playouts' random moves, None for a random seed
+        """
+
+        self.game_size = game_size
+        self.workers = workers
+        self.exploration = exploration
+        self.neighborhood = neighborhood
+        self.random = random.Random(seed)
+        self.process_pool = None
+
+        self.board = None # Position of the root of the tree
+        self.root = None
+        self.clear_counts()
+
+    def clear(self):
+        """Drops the tree, for a new game"""
+
+        self.board = None
+        self.root = None
+
+    def clear_counts(self):
+        """Zeroes the counts of the last search"""
+
+        self.playouts = 0
+        self.nodes_added = 0
+        self.max_depth = 0
+        self.reused_visits = 0 # Visits of the root carried over from the last search
+
+    def shutdown(self):
+        """Stops the process pool used for parallel playouts, if one was started"""
+
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
+            self.process_pool = None
+
+    def set_root(self, x_bits, o_bits, whose_turn):
+        """
+        Moves the root of the tree to a position. When the position follows from the root's by moves the tree has
+        already tried, the subtree below them becomes the tree, otherwise a new tree is started.
+
+        Args:
+            x_bits (int): Mask of X's spots
+            o_bits (int): Mask of O's spots
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+        """
+
+        node = self.advance_root(x_bits, o_bits)
+        if node is None or node.player != -whose_turn:
+            self.board = Bitboard.from_bits(self.game_size, x_bits, o_bits)
+            node = self.new_node(None, -whose_turn, None)
+
+        node.parent = None
+        self.root = node
+        self.reused_visits = node.visits
+
+    def advance_root(self, x_bits, o_bits):
+        """
+        Follows the moves from the root's position to a later one down the tree, playing them on self.board
+
+        Args:
+            x_bits (int): Mask of X's spots in the later position
+            o_bits (int): Mask of O's spots in the later position
+
+        Returns:
+            (MonteCarloNode): The later position's node, None if the tree doesn't reach it
+        """
+
+        board = self.board
+        node = self.root
+        if node is None or board.x_bits & ~x_bits or board.o_bits & ~o_bits:
+            return None
+
+        while (board.x_bits, board.o_bits) != (x_bits, o_bits):
+            mover = -node.player
+            if mover == GAME_VALS['X']:
+                new_marks = x_bits & ~board.x_bits
+            else:
+                new_marks = o_bits & ~board.o_bits
+
+            # Players take turns, so each step down adds exactly one mark for the player to move
+            if not new_marks or new_marks & (new_marks - 1):
+                return None
+
+            move = new_marks.bit_length() - 1
+            node = next((child for child in node.children if child.move == move), None)
+            if node is None:
+                return None
+            board.make_move(move, mover)
+
+        return node
+
+    def new_node(self, move, player, parent):
+        """
+        Adds a position to the tree, the position must be on self.board
+
+        Args:
+            move (int): Bit index of the move that reached the position, None for the root
+            player (int): Player who made the move
+            parent (MonteCarloNode): Position the move was made from, None for the root
+
+        Returns:
+            (MonteCarloNode): The new position
+        """
+
+        node = MonteCarloNode(move, player, parent)
+        self.nodes_added += 1
+
+        if move is not None and self.board.is_winning_spot(move):
+            node.terminal = WIN
+            return node
+
+        node.untried = self.board.candidate_moves([], True, self.neighborhood)
+        if not node.untried:
+            # Full, or every line holds both an X and an O
+            node.terminal = DRAW
+        self.random.shuffle(node.untried)
+
+        return node
+
+    def decisive_move(self, whose_turn):
+        """
+        Looks for a move that wins at once, or failing that, the only spot that stops the other player winning at once
+
+        Args:
+            whose_turn (int): Player to move at the root
+
+        Returns:
+            (int): Bit index of the move, None if neither is there
+        """
+
+        board = self.board
+        moves = board.available_moves()
+        for player in (whose_turn, -whose_turn):
+            threats = []
+            for move in moves:
+                board.make_move(move, player)
+                if board.is_winning_spot(move):
+                    threats.append(move)
+                board.unmake_move()
+            if threats and (player == whose_turn or len(threats) == 1):
+                return threats[0]
+
+        return None
+
+    def search(self, x_bits, o_bits, whose_turn, time_budget=None, playout_budget=None, cancelled=None):
+        """
+        Searches a position until the time or playout budget is spent
+
+        Args:
+            x_bits (int): Mask of X's spots
+            o_bits (int): Mask of O's spots
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+            time_budget (float): Seconds to search for, None for no time limit
+            playout_budget (integer): Most playouts to run, across every process, None for no limit
+            cancelled (threading.Event): Set from another thread to stop the search
+
+        Raises:
+            SearchCancelled: cancelled was set during the search
+
+        Returns:
+            (dict): Keys are bit indexes of the moves tried, values are (visits, average result for the player to
+                move). A move that wins, or is the only one that doesn't lose, at once is the only key.
+        """
+
+        self.clear_counts()
+        if time_budget is None and playout_budget is None:
+            time_budget = DEFAULT_MCTS_TIME_BUDGET
+        deadline = None if time_budget is None else time() + time_budget
+
+        self.set_root(x_bits, o_bits, whose_turn)
+        decisive_move = self.decisive_move(whose_turn)
+        if decisive_move is not None:
+            return {decisive_move: (0, WIN)}
+
+        futures = []
+        if self.workers > 1:
+            # Imported here, so processes that never search in parallel don't load multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(max_workers=self.workers - 1)
+            if playout_budget is not None:
+                playout_budget = -(-playout_budget // self.workers)
+            futures = [self.process_pool.submit(search_in_worker, self.game_size, x_bits, o_bits, whose_turn,
+                                                self.exploration, self.neighborhood, deadline, playout_budget,
+                                                self.random.getrandbits(32))
+                       for _ in range(self.workers - 1)]
+
+        try:
+            self.run_playouts(deadline, playout_budget, cancelled)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        move_stats = {child.move: [child.visits, child.score] for child in self.root.children}
+        for future in futures:
+            worker_stats, playouts, nodes_added, max_depth = future.result()
+            self.playouts += playouts
+            self.nodes_added += nodes_added
+            self.max_depth = max(self.max_depth, max_depth)
+            for move, (visits, score) in worker_stats.items():
+                stats = move_stats.setdefault(move, [0, 0.0])
+                stats[0] += visits
+                stats[1] += score
+
+        return {move: (visits, score / visits if visits else DRAW) for move, (visits, score) in move_stats.items()}
+
+    def run_playouts(self, deadline, playout_budget, cancelled):
+        """
+        Grows the tree one pass at a time until the budget is spent. At least one pass is run, so there is a move to
+        play however small the budget.
+
+        Args:
+            deadline (float): time() to stop at, None for no time limit
+            playout_budget (integer): Most passes to run, None for no limit
+            cancelled (threading.Event): Set from another thread to stop the search
+
+        Raises:
+            SearchCancelled: cancelled was set during the search
+        """
+
+        while True:
+            for _ in range(CANCEL_CHECK_INTERVAL):
+                self.run_pass()
+                if playout_budget is not None and self.playouts >= playout_budget:
+                    return
+
+            if cancelled is not None and cancelled.is_set():
+                # Imported here, as the engine imports this module only when it is used
+                from TicTacToe_Engine import SearchCancelled
+                raise SearchCancelled()
+            if deadline is not None and time() >= deadline:
+                return
+            root = self.root
+            if not root.untried and all(child.terminal is not None for child in root.children):
+                # Every move ends the game, more passes learn nothing
+                return
+
+    def run_pass(self):
+        """Walks down the tree by UCB1, adds a position, plays the game out from it, and credits the result"""
+
+        board = self.board
+        node = self.root
+        exploration = self.exploration
+        depth = 0
+
+        # Walk down while every move of the position is in the tree
+        while node.terminal is None and not node.untried:
+            log_visits = log(node.visits)
+            best_child = None
+            best_value = -1.0
+            for child in node.children:
+                value = child.score / child.visits + exploration * sqrt(log_visits / child.visits)
+                if value > best_value:
+                    best_value = value
+                    best_child = child
+            node = best_child
+            board.make_move(node.move, node.player)
+            depth += 1
+
+        if node.terminal is None:
+            move = node.untried.pop()
+            board.make_move(move, -node.player)
+            depth += 1
+            child = self.new_node(move, -node.player, node)
+            node.children.append(child)
+            node = child
+
+        if node.terminal is not None:
+            result = node.terminal
+        else:
+            winner = self.playout(-node.player)
+            if winner == node.player:
+                result = WIN
+            elif winner == -node.player:
+                result = LOSS
+            else:
+                result = DRAW
+
+        self.playouts += 1
+        self.max_depth = max(self.max_depth, depth)
+
+        # Each position's result is for the player who moved into it, so it flips on the way up
+        while node is not None:
+            node.visits += 1
+            node.score += result
+            result = WIN - result
+            node = node.parent
+
+        for _ in range(depth):
+            board.unmake_move()
+
+    def playout(self, whose_turn):
+        """
+        Finishes the game on self.board with random moves, without changing the board
+
+        Args:
+            whose_turn (int): Player to move first
+
+        Returns:
+            (int): 1 if X wins, -1 if O wins, 0 for a draw
+        """
+
+        board = self.board
+        game_size = self.game_size
+        cell_lines = board.cell_lines
+        x_counts = board.x_counts[:]
+        o_counts = board.o_counts[:]
+        live_lines = len(board.line_masks) - board.dead_lines
+
+        spots = board.available_moves()
+        self.random.shuffle(spots)
+        for spot in spots:
+            if whose_turn == GAME_VALS['X']:
+                own_counts, other_counts = x_counts, o_counts
+            else:
+                own_counts, other_counts = o_counts, x_counts
+
+            for line in cell_lines[spot]:
+                if not own_counts[line] and other_counts[line]:
+                    live_lines -= 1
+                own_counts[line] += 1
+                if own_counts[line] == game_size:
+                    return whose_turn
+
+            if not live_lines:
+                # Every line holds both an X and an O, nobody can win
+                return 0
+            whose_turn = -whose_turn
+
+        return 0
+
+
+_worker_searches = {} # One MonteCarloSearch per search settings in each worker process
+
+
+def search_in_worker(game_size, x_bits, o_bits, whose_turn, exploration, neighborhood, deadline, playout_budget,
+                     seed):
+    """
+    Runs in a worker process: grows a tree of its own from a position until the deadline or playout budget
+
+    Args:
+        game_size (integer): Length of one side of the board
+        x_bits (int): Mask of X's spots
+        o_bits (int): Mask of O's spots
+        whose_turn (int): -1 for O's turn, 1 for X's turn
+        exploration (float): Weight of the exploration term of UCB1
+        neighborhood (integer): Neighborhood of the moves added to the tree, None for anywhere
+        deadline (float): time() to stop at, None for no time limit
+        playout_budget (integer): Most playouts to run, None for no limit
+        seed (integer): Seed for the playouts' random moves
+
+    Returns:
+        (tuple): (keys are bit indexes of the moves tried, values are (visits, summed results), playouts, positions
+            added to the tree, deepest pass)
+    """
+
+    settings = (game_size, exploration, neighborhood)
+    search = _worker_searches.get(settings)
+    if search is None:
+        search = MonteCarloSearch(game_size, exploration=exploration, neighborhood=neighborhood)
+        _worker_searches[settings] = search
+    search.random.seed(seed)
+    search.clear_counts()
+
+    # The worker's tree is kept too, and reused when it is handed a later position of the same game
+    search.set_root(x_bits, o_bits, whose_turn)
+    search.run_playouts(deadline, playout_budget, None)
+
+    move_stats = {child.move: (child.visits, child.score) for child in search.root.children}
+    return move_stats, search.playouts, search.nodes_added, search.max_depth
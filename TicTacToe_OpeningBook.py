@@ -0,0 +1,273 @@
+"""
+Precomputed opening book for the TicTacToe search engine.
+
+The book maps the canonical hash of a position (with the player to move folded in, see Bitboard.canonical_form) to
+the best move found for it and that move's score. Moves are stored in the canonical position's frame, so one record
+covers every mirror image of a position.
+
+Books are written offline, one file per board size, as a fixed size header followed by fixed size records sorted by
+hash. At startup the engine memory-maps the file and binary searches the records in place, so nothing is parsed or
+loaded up front, and pages are only read from disk as lookups touch them.
+
+Build the books by running this script:
+
+    python TicTacToe_OpeningBook.py --sizes 3 4 5 --time-budget 5
+"""
+
+from time import time
+
+import mmap
+import os
+import struct
+
+from TicTacToe_Bitboard import Bitboard, GAME_VALS, BOARD_SIZES
+
+BOOK_MAGIC = b'TTTBOOK1'
+BOOK_HEADER = struct.Struct('<8sBBI') # Magic, board size, plies covered, number of records
+BOOK_RECORD = struct.Struct('<QHh') # Canonical hash, move in the canonical frame, score
+
+BOOK_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_books')
+
+# Plies from the empty board covered by a book built with default settings. Small boards are covered deeper, as
+# symmetry leaves few distinct positions and each one searches quickly.
+BOOK_PLIES = {
+    3: 9,
+    4: 4,
+    5: 3,
+    6: 2,
+    7: 2,
+    8: 2,
+    9: 1,
+    10: 1
+}
+
+BOOK_TIME_BUDGET = 5.0 # Seconds of search per book position, by default
+
+# Search the books are built with, whatever the board size's default is. From 8x8 up the default is Monte Carlo tree
+# search, which search_next_move doesn't run, so those books would have been built by the minimax search instead.
+BOOK_SEARCH_ALGORITHM = 'pvs'
+
+SCORE_LIMIT = 2 ** 15 - 1 # Scores are clamped to fit in the record's 16 bits
+
+
+def book_path(game_size, directory=None):
+    """
+    Args:
+        game_size (integer): Length of one side of the board
+        directory (string): Folder holding the books, None for BOOK_DIRECTORY
+
+    Returns:
+        (string): Path of the book for the board size
+    """
+
+    return os.path.join(directory or BOOK_DIRECTORY, f"opening_book_{game_size}x{game_size}.bin")
+
+
+class OpeningBook:
+    """Read-only, memory-mapped opening book for a single board size"""
+
+    _loaded_books = {} # Books already opened in this process, keyed by path
+
+    def __init__(self, path: str):
+        """
+        Constructor. Maps the book file into memory and checks its header.
+
+        Args:
+            path (string): Path of a book written by write_opening_book
+
+        Raises:
+            ValueError: The file is not an opening book, or is cut short
+        """
+
+        self.path = path
+        with open(path, 'rb') as book_file:
+            self.book_map = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.book_map) < BOOK_HEADER.size:
+            self.book_map.close()
+            raise ValueError(f"{path} is too short to be an opening book")
+
+        magic, self.game_size, self.plies, self.record_count = BOOK_HEADER.unpack_from(self.book_map, 0)
+        if magic != BOOK_MAGIC or len(self.book_map) != BOOK_HEADER.size + self.record_count * BOOK_RECORD.size:
+            self.book_map.close()
+            raise ValueError(f"{path} is not a valid opening book")
+
+    @classmethod
+    def load(cls, game_size, directory=None):
+        """
+        Opens the book for a board size, sharing one mapping per file across every game in the process
+
+        Args:
+            game_size (integer): Length of one side of the board
+            directory (string): Folder holding the books, None for BOOK_DIRECTORY
+
+        Returns:
+            (OpeningBook): The book, or None if there is no valid book for the board size
+        """
+
+        path = book_path(game_size, directory)
+        if path in cls._loaded_books:
+            return cls._loaded_books[path]
+
+        try:
+            book = cls(path)
+        except (OSError, ValueError):
+            book = None
+
+        if book is not None and book.game_size != game_size:
+            book.close()
+            book = None
+
+        if book is not None:
+            # Missing books aren't remembered, so one built while the process runs is picked up by later games
+            cls._loaded_books[path] = book
+        return book
+
+    def __len__(self):
+        return self.record_count
+
+    def close(self):
+        """Unmaps the book file"""
+
+        self.book_map.close()
+        self._loaded_books.pop(self.path, None)
+
+    def lookup(self, key):
+        """
+        Binary searches the records for a position
+
+        Args:
+            key (int): Canonical hash of the position together with the player to move
+
+        Returns:
+            (tuple): (bit index of the best move in the canonical frame, score) if the position is in the book,
+                otherwise None
+        """
+
+        low = 0
+        high = self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, move, score = BOOK_RECORD.unpack_from(self.book_map, BOOK_HEADER.size + middle * BOOK_RECORD.size)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return move, score
+
+        return None
+
+
+def write_opening_book(path, game_size, plies, entries):
+    """
+    Writes a book file. It is written alongside and then moved into place, so a running game never maps half a book.
+
+    Args:
+        path (string): Where to write the book
+        game_size (integer): Length of one side of the board
+        plies (integer): Plies from the empty board the book covers
+        entries (dict): Keys are canonical hashes with the player to move, values are (move in the canonical frame,
+            score)
+    """
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_path = path + '.tmp'
+
+    with open(temporary_path, 'wb') as book_file:
+        book_file.write(BOOK_HEADER.pack(BOOK_MAGIC, game_size, plies, len(entries)))
+        for key in sorted(entries):
+            move, score = entries[key]
+            score = max(-SCORE_LIMIT, min(SCORE_LIMIT, score))
+            book_file.write(BOOK_RECORD.pack(key, move, score))
+
+    os.replace(temporary_path, path)
+
+
+def build_opening_book(game_size, plies, time_budget=BOOK_TIME_BUDGET, workers=1):
+    """
+    Searches every distinct position within the first plies of the game, with either player starting, and records
+    the move the engine picks for each. Mirror images are searched once, and finished games are skipped. Every board
+    size is searched with BOOK_SEARCH_ALGORITHM.
+
+    Args:
+        game_size (integer): Length of one side of the board
+        plies (integer): Plies from the empty board to cover
+        time_budget (float): Seconds of search per position
+        workers (integer): Processes each search is split across
+
+    Returns:
+        (dict): Keys are canonical hashes with the player to move, values are (move in the canonical frame, score)
+    """
+
+    # Imported here, as the game imports this module to read the books
+    from TicTacToe_Engine import TicTacToeGame
+
+    game = TicTacToeGame(game_size, time_budget=time_budget, workers=workers, use_opening_book=False,
+                         search_algorithm=BOOK_SEARCH_ALGORITHM)
+    entries = {}
+
+    try:
+        for first_player in (GAME_VALS['X'], GAME_VALS['O']):
+            # Each position is kept as the masks of both players, the player to move follows from the ply
+            positions = [(0, 0)]
+            for ply in range(plies):
+                whose_turn = first_player if ply % 2 == 0 else -first_player
+                next_positions = []
+
+                for x_bits, o_bits in positions:
+                    board = Bitboard.from_bits(game_size, x_bits, o_bits)
+                    key, symmetry, self_symmetries = board.canonical_form(whose_turn)
+                    if key in entries:
+                        continue
+
+                    game.set_position(x_bits, o_bits, whose_turn)
+                    coordinates = game.search_next_move()
+                    best_move = board.index_of(coordinates)
+                    entries[key] = (board.symmetries[symmetry][best_move], game.possible_final_moves[coordinates])
+
+                    if ply == plies - 1:
+                        continue
+
+                    for move in board.unique_moves(self_symmetries):
+                        board.make_move(move, whose_turn)
+                        if not board.last_move_won() and not board.is_full():
+                            next_positions.append((board.x_bits, board.o_bits))
+                        board.unmake_move()
+
+                positions = next_positions
+    finally:
+        game.shutdown_workers()
+
+    return entries
+
+
+def main():
+    """Builds the books for the board sizes asked for on the command line"""
+
+    # Imported here, so the engine doesn't load it when it reads the books
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build TicTacToe opening books")
+    parser.add_argument('--sizes', type=int, nargs='+', default=BOARD_SIZES, choices=BOARD_SIZES,
+                        help="board sizes to build books for")
+    parser.add_argument('--plies', type=int, default=None,
+                        help="plies from the empty board to cover, defaults to a depth picked per board size")
+    parser.add_argument('--time-budget', type=float, default=BOOK_TIME_BUDGET,
+                        help="seconds of search per position")
+    parser.add_argument('--workers', type=int, default=1, help="processes each search is split across")
+    parser.add_argument('--directory', default=BOOK_DIRECTORY, help="folder to write the books to")
+    arguments = parser.parse_args()
+
+    for game_size in arguments.sizes:
+        plies = arguments.plies if arguments.plies is not None else BOOK_PLIES[game_size]
+        start_time = time()
+        entries = build_opening_book(game_size, plies, arguments.time_budget, arguments.workers)
+        path = book_path(game_size, arguments.directory)
+        write_opening_book(path, game_size, plies, entries)
+        print(f"{game_size}x{game_size}: {len(entries)} positions over {plies} plies "
+              f"in {time() - start_time:.1f}s, written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Pondering for the TicTacToe search engine: searching during the human's turn.
+
+While the human thinks, a Ponderer searches the computer's answer to each of the human's likely replies on a
+background thread, most likely first, ranked the way move ordering ranks moves. The searches run on a second
+TicTacToeGame with the same settings, so the game being played is never touched from the thread. Mirror images of
+a reply are answered by the mirror image of its answer, so each group of them is searched once.
+
+When the human's move was pondered, the computer answers at once. When it is still being pondered, the computer
+waits for that search to finish, which has already had some of its time. Otherwise the pondering is stopped and the
+computer searches as it would have without it.
+
+    ponderer = Ponderer(game)
+    ponderer.start() # When it is the human's turn
+    game.play_move(human_move)
+    coordinates, search_stats = ponderer.find_next_move_for_computer()
+"""
+
+from copy import copy
+from functools import partial
+
+import threading
+
+from TicTacToe_Bitboard import GAME_VALS
+from TicTacToe_Engine import TicTacToeGame, SearchCancelled, GAME_STATUS
+
+DEFAULT_PONDER_REPLIES = 8 # Most groups of mirror image replies of the human's pondered per turn
+
+
+class Ponderer:
+    """Searches the computer's answers to the human's likely replies on a background thread"""
+
+    def __init__(self, game: TicTacToeGame, max_replies: int = DEFAULT_PONDER_REPLIES):
+        """
+        Constructor. Builds the game the pondering searches run on.
+
+        Args:
+            game (TicTacToeGame): Game being played, its moves are only read, and only by the caller's thread
+            max_replies (integer): Most groups of mirror image replies to ponder per turn
+        """
+
+        self.game = game
+        self.max_replies = max_replies
+        if game.search_algorithm in ('pvs', 'mtdf'):
+            # The two games never search at the same time, see find_next_move_for_computer, so they share a table.
+            # A reply that wasn't pondered to the end still starts its search with what the pondering found.
+            self.ponder_game = TicTacToeGame(game.game_size, **dict(game.search_settings(), table_size=0))
+            self.ponder_game.transposition_table = game.transposition_table
+            self.ponder_game.table_size = game.table_size
+        else:
+            # The minimax search clears its table for every root move, so nothing the pondering found would last
+            # into the game's own search, and sharing one would only have each game clear the other's entries
+            self.ponder_game = TicTacToeGame(game.game_size, **game.search_settings())
+
+        self.lock = threading.Lock() # Guards the fields below, shared with the pondering thread
+        self.position = None # (x_bits, o_bits, whose_turn) the human is replying to
+        self.answers = {} # Keyed by bit index of a reply, values are (coordinates of the answer, SearchStats)
+        self.pondering_reply = None # Reply being searched, None between searches
+        self.stop_after_reply = False # Set to stop once the reply being searched is answered
+
+        self.thread = None
+
+    def start(self):
+        """Starts pondering the replies to the game's position, call when it is the human's turn"""
+
+        self.stop()
+
+        game = self.game
+        if game.status != GAME_STATUS['IN_PROGRESS']:
+            return
+
+        board = game.board.copy()
+        if game.use_symmetry:
+            _, _, self_symmetries = board.canonical_form(game.turn)
+        else:
+            self_symmetries = []
+
+        replies = board.candidate_moves(self_symmetries, game.prune_dead_spots, game.neighborhood)
+        replies.sort(key=partial(game.static_move_score, board), reverse=True)
+
+        with self.lock:
+            self.position = (board.x_bits, board.o_bits, game.turn)
+            self.answers = {}
+            self.pondering_reply = None
+            self.stop_after_reply = False
+
+        self.ponder_game.search_cancelled.clear()
+        self.thread = threading.Thread(target=self.ponder,
+                                       args=(board, game.turn, replies[:self.max_replies], self_symmetries), daemon=True)
+        self.thread.start()
+
+    def ponder(self, board, human, replies, self_symmetries):
+        """
+        Runs on the background thread, answering each reply in turn until they are all answered or it is stopped
+
+        Args:
+            board (Bitboard): Position the human is replying to, a copy of the game's
+            human (int): -1 if the human plays O, 1 if X
+            replies (list): Bit indexes of the replies, most likely first
+            self_symmetries (list): Symmetries that leave the position unchanged, from canonical_form
+        """
+
+        ponder_game = self.ponder_game
+
+        for reply in replies:
+            with self.lock:
+                if self.stop_after_reply:
+                    return
+                self.pondering_reply = reply
+
+            board.make_move(reply, human)
+            ponder_game.set_position(board.x_bits, board.o_bits, -human)
+            board.unmake_move()
+            if ponder_game.status != GAME_STATUS['IN_PROGRESS']:
+                continue
+
+            try:
+                coordinates, search_stats = ponder_game.find_next_move_for_computer()
+            except SearchCancelled:
+                return
+
+            if search_stats.source == 'search':
+                search_stats.source = 'ponder'
+            answer = board.index_of(coordinates)
+            with self.lock:
+                for symmetry in [0] + self_symmetries:
+                    mirrored_stats = copy(search_stats)
+                    mirrored_stats.move = board.coordinates_of(board.symmetries[symmetry][answer])
+                    self.answers[board.symmetries[symmetry][reply]] = (mirrored_stats.move, mirrored_stats)
+                self.pondering_reply = None
+
+    def stop(self):
+        """Stops the pondering if it is running, and waits for its thread to finish"""
+
+        # Set even without a thread, find_next_move_for_computer may be waiting on one
+        self.ponder_game.search_cancelled.set()
+        thread, self.thread = self.thread, None
+        if thread is not None:
+            thread.join()
+
+    def shutdown(self):
+        """Stops the pondering, and the pondering game's process pool if it started one"""
+
+        self.stop()
+        self.ponder_game.shutdown_workers()
+
+    def human_reply(self):
+        """
+        Returns:
+            (int): Bit index of the move the human played in reply to the pondered position, None if the game has
+                moved on some other way
+        """
+
+        if self.position is None:
+            return None
+
+        x_bits, o_bits, human = self.position
+        board = self.game.board
+        if self.game.turn != -human or not board.move_stack:
+            return None
+
+        reply = board.move_stack[-1]
+        if human == GAME_VALS['X']:
+            x_bits |= 1 << reply
+        else:
+            o_bits |= 1 << reply
+        if (board.x_bits, board.o_bits) != (x_bits, o_bits):
+            return None
+
+        return reply
+
+    def find_next_move_for_computer(self):
+        """
+        Picks the computer's move as TicTacToeGame.find_next_move_for_computer does, from the pondering when it
+        answered or is answering the human's move. Stops the pondering either way.
+
+        Raises:
+            SearchCancelled: The game's search_cancelled was set during the search
+
+        Returns:
+            (tuple): Coordinates of the move, and the SearchStats of picking it
+        """
+
+        reply = self.human_reply()
+        thread, self.thread = self.thread, None
+        if thread is not None:
+            with self.lock:
+                waiting = reply is not None and reply == self.pondering_reply
+                self.stop_after_reply = True
+            if not waiting:
+                self.ponder_game.search_cancelled.set()
+            thread.join()
+
+        with self.lock:
+            answer = self.answers.get(reply)
+            self.position = None
+            self.answers = {}
+
+        if answer is None:
+            return self.game.find_next_move_for_computer()
+
+        game = self.game
+        coordinates, search_stats = answer
+        game.search_stats = search_stats
+        if game.search_log_path is not None:
+            search_stats.write_json_line(game.search_log_path)
+
+        return coordinates, search_stats
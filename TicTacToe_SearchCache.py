@@ -0,0 +1,178 @@
+"""
+Persistent search cache for the TicTacToe search engine.
+
+The transposition table only lives for one search, so positions solved in an earlier game are searched all over
+again. The search cache keeps the deeper results of the negamax searches (see TicTacToeGame.negamax_score) in an
+SQLite file instead, keyed by the canonical hash of the position with the player to move, and holding the depth
+searched, the kind of bound, the score, and the best move in the canonical frame.
+
+When a game starts, the deepest entries that fit in a memory budget are read into a dictionary, which the search
+checks whenever the transposition table misses. New results are kept in memory and written back in one transaction
+at the end of the game. Every process opening the same file shares its results, so parallel search workers and later
+games all pick up what the others found.
+
+Only the negamax searches use the cache. Their scores don't depend on the path to a position, where the minimax
+search's do. Results depend on how leaves are scored and which moves are searched, so each combination of those
+settings gets its own file.
+"""
+
+import os
+
+CACHE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'search_cache')
+
+DEFAULT_CACHE_MEMORY = 64 * 1024 ** 2 # Bytes of entries read into memory when a cache is opened
+ENTRY_MEMORY_BYTES = 200 # Rough size in memory of one entry, its tuple and its slot in the dictionary
+
+CACHE_MIN_DEPTH = 2 # Shallower results are quicker to search again than to store and read back
+
+SQLITE_TIMEOUT = 30.0 # Seconds to wait for another process writing to the same file
+
+KEY_OFFSET = 1 << 63 # SQLite integers are signed, hashes are shifted down into their range
+
+
+def cache_path(game_size, signature, directory=None):
+    """
+    Args:
+        game_size (integer): Length of one side of the board
+        signature (string): Settings the cached results depend on, see TicTacToeGame.search_cache_signature
+        directory (string): Folder holding the caches, None for CACHE_DIRECTORY
+
+    Returns:
+        (string): Path of the cache for the board size and settings
+    """
+
+    return os.path.join(directory or CACHE_DIRECTORY, f"search_cache_{game_size}x{game_size}_{signature}.sqlite")
+
+
+class SearchCache:
+    """Search results kept on disk between games, with the deepest ones read into memory"""
+
+    _loaded_caches = {} # Caches already opened, keyed by path and process ID, so forked workers read the file anew
+
+    def __init__(self, path: str, memory_budget: int = DEFAULT_CACHE_MEMORY):
+        """
+        Constructor. Creates the file if it is missing, and reads in as many of the deepest entries as fit in the
+        memory budget.
+
+        Args:
+            path (string): SQLite file holding the cache
+            memory_budget (integer): Bytes of entries to hold in memory, read from the file and added by the search
+        """
+
+        self.path = path
+        self.max_entries = max(0, memory_budget // ENTRY_MEMORY_BYTES)
+        self.entries = {} # Keyed by hash, values are in TranspositionTable.probe's format
+        self.pending = {} # Entries recorded since the last flush, keyed by hash
+        self.probes = 0
+        self.hits = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS entries (key INTEGER PRIMARY KEY, depth INTEGER, "
+                               "bound INTEGER, score INTEGER, best_move INTEGER)")
+            rows = connection.execute("SELECT key, depth, bound, score, best_move FROM entries "
+                                      "ORDER BY depth DESC LIMIT ?", (self.max_entries,))
+            for key, depth, bound, score, best_move in rows:
+                key += KEY_OFFSET
+                self.entries[key] = (key, depth, bound, score, 0, best_move)
+        connection.close()
+
+    @classmethod
+    def load(cls, game_size, signature, memory_budget=DEFAULT_CACHE_MEMORY, directory=None):
+        """
+        Opens the cache for a board size and settings, sharing one per file across every game in the process
+
+        Args:
+            game_size (integer): Length of one side of the board
+            signature (string): Settings the cached results depend on, see TicTacToeGame.search_cache_signature
+            memory_budget (integer): Bytes of entries to hold in memory, used when the file is first opened
+            directory (string): Folder holding the caches, None for CACHE_DIRECTORY
+
+        Returns:
+            (SearchCache): The cache, or None if the file can't be opened
+        """
+
+        # Imported here, so the engine can import this module's settings without loading SQLite
+        import sqlite3
+
+        path = cache_path(game_size, signature, directory)
+        loaded_key = (path, os.getpid())
+        if loaded_key not in cls._loaded_caches:
+            try:
+                cls._loaded_caches[loaded_key] = cls(path, memory_budget)
+            except (OSError, sqlite3.Error):
+                cls._loaded_caches[loaded_key] = None
+
+        return cls._loaded_caches[loaded_key]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def connect(self):
+        """
+        Returns:
+            (sqlite3.Connection): New connection to the file. Connections aren't kept open, so a cache is safe to
+                carry into forked worker processes.
+        """
+
+        import sqlite3
+
+        connection = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def probe(self, key):
+        """
+        Looks up a position
+
+        Args:
+            key (int): Canonical hash of the position and player to move
+
+        Returns:
+            (tuple): (key, depth, bound, score, turn count, best move) as in TranspositionTable.probe if held in
+                memory, otherwise None
+        """
+
+        self.probes += 1
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+
+        return entry
+
+    def record(self, key, depth, bound, score, best_move):
+        """
+        Keeps a search result to write back at the next flush, unless a deeper one is already held
+
+        Args:
+            key (int): Canonical hash of the position and player to move
+            depth (int): Number of turns searched below the position
+            bound (int): EXACT, LOWER_BOUND, or UPPER_BOUND
+            score (int): Score found for the position, with wins counted from the position itself
+            best_move (int): Bit index of the best move found, in the canonical frame
+        """
+
+        current = self.entries.get(key)
+        if current is not None and current[1] > depth:
+            return
+
+        entry = (key, depth, bound, score, 0, best_move)
+        if current is not None or len(self.entries) < self.max_entries:
+            self.entries[key] = entry
+        self.pending[key] = entry
+
+    def flush(self):
+        """Writes the results recorded since the last flush to the file in one transaction, keeping deeper ones"""
+
+        if not self.pending:
+            return
+
+        rows = [(key - KEY_OFFSET, depth, bound, score, best_move)
+                for key, depth, bound, score, _, best_move in self.pending.values()]
+        with self.connect() as connection:
+            connection.executemany("INSERT INTO entries (key, depth, bound, score, best_move) VALUES (?, ?, ?, ?, ?) "
+                                   "ON CONFLICT (key) DO UPDATE SET depth = excluded.depth, bound = excluded.bound, "
+                                   "score = excluded.score, best_move = excluded.best_move "
+                                   "WHERE excluded.depth >= entries.depth", rows)
+        connection.close()
+        self.pending.clear()
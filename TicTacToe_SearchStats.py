@@ -0,0 +1,204 @@
+"""
+Statistics from the computer's search for a move.
+
+TicTacToeGame.find_next_move_for_computer returns a SearchStats alongside every move it picks, and keeps the latest
+on the game as search_stats. They can be appended to a log file as JSON lines, one move per line, to see where the
+search spends its time over whole games. percentile summarizes move latencies for the arena and the move service.
+"""
+
+from math import ceil
+from time import time
+
+from TicTacToe_Bitboard import GAME_VALS
+
+MOVE_SOURCES = ('search', 'book', 'random', 'ponder', 'tablebase', 'mcts') # Where the computer's move came from
+
+
+def percentile(values, fraction):
+    """
+    Args:
+        values (list): Numbers to pick from
+        fraction (float): 0.99 for the 99th percentile
+
+    Returns:
+        (float): Smallest value with at least the fraction of values at or below it, 0 for no values
+    """
+
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    return ordered[max(0, ceil(fraction * len(ordered)) - 1)]
+
+
+class SearchStats:
+    """Counts and timings from picking one computer move"""
+
+    def __init__(self, game_size: int, turn_count: int, whose_turn: int, move: tuple, source: str, elapsed: float,
+                 nodes: int = 0, expanded: int = 0, table_returns: int = 0, children: int = 0, cutoffs: int = 0,
+                 first_move_cutoffs: int = 0, cutoffs_per_ply: list = None, table_probes: int = 0,
+                 table_hits: int = 0, max_depth: int = 0, completed_depth: int = None):
+        """
+        Constructor. Counts default to zero, for moves that came from the tablebase or opening book, or were picked at
+        random.
+
+        Args:
+            game_size (integer): Length of one side of the board
+            turn_count (integer): Turns played before the move
+            whose_turn (integer): -1 for O's turn, 1 for X's turn
+            move (tuple): Coordinates of the move picked
+            source (string): One of MOVE_SOURCES
+            elapsed (float): Seconds taken to pick the move
+            nodes (integer): Positions searched, or playouts run by the Monte Carlo tree search
+            expanded (integer): Positions whose moves were searched, or added to the Monte Carlo tree
+            table_returns (integer): Positions answered from the transposition table without being expanded
+            children (integer): Moves searched across all expanded positions
+            cutoffs (integer): Expanded positions cut off before all their moves were searched
+            first_move_cutoffs (integer): Cutoffs made by the first move tried
+            cutoffs_per_ply (list): Cutoffs at each number of plies below the computer's position
+            table_probes (integer): Transposition table lookups
+            table_hits (integer): Transposition table lookups that found their position
+            max_depth (integer): Most plies below the computer's position that were searched
+            completed_depth (integer): Depth cutoff of the deepest search that finished, None if nothing was searched
+        """
+
+        self.timestamp = time()
+        self.game_size = game_size
+        self.turn_count = turn_count
+        self.whose_turn = whose_turn
+        self.move = move
+        self.source = source
+        self.elapsed = elapsed
+        self.nodes = nodes
+        self.expanded = expanded
+        self.table_returns = table_returns
+        self.children = children
+        self.cutoffs = cutoffs
+        self.first_move_cutoffs = first_move_cutoffs
+        self.cutoffs_per_ply = list(cutoffs_per_ply or [])
+        self.table_probes = table_probes
+        self.table_hits = table_hits
+        self.max_depth = max_depth
+        self.completed_depth = completed_depth
+
+        # Trailing plies the search never reached carry no information
+        while self.cutoffs_per_ply and not self.cutoffs_per_ply[-1]:
+            self.cutoffs_per_ply.pop()
+
+    @property
+    def leaf_evaluations(self):
+        """Positions scored without searching their moves: wins, full boards, and the depth cutoff heuristic"""
+
+        return self.nodes - self.expanded - self.table_returns
+
+    @property
+    def cache_hit_rate(self):
+        """Fraction of transposition table lookups that found their position, 0 if there were none"""
+
+        if not self.table_probes:
+            return 0.0
+
+        return self.table_hits / self.table_probes
+
+    @property
+    def branching_factor(self):
+        """Average moves searched per expanded position, after cutoffs"""
+
+        if not self.expanded:
+            return 0.0
+
+        return self.children / self.expanded
+
+    @property
+    def cutoff_rate(self):
+        """Fraction of expanded positions that were cut off"""
+
+        if not self.expanded:
+            return 0.0
+
+        return self.cutoffs / self.expanded
+
+    @property
+    def first_move_cutoff_rate(self):
+        """Fraction of cutoffs made by the first move tried"""
+
+        if not self.cutoffs:
+            return 0.0
+
+        return self.first_move_cutoffs / self.cutoffs
+
+    @property
+    def nodes_per_second(self):
+        """Positions searched per second, 0 if no time was measured"""
+
+        if not self.elapsed:
+            return 0.0
+
+        return self.nodes / self.elapsed
+
+    def to_dict(self):
+        """
+        Returns:
+            (dict): Every count, rate, and timing, ready to be written as JSON
+        """
+
+        return {
+            'timestamp': self.timestamp,
+            'game_size': self.game_size,
+            'turn_count': self.turn_count,
+            'whose_turn': 'X' if self.whose_turn == GAME_VALS['X'] else 'O',
+            'move': list(self.move) if self.move is not None else None,
+            'source': self.source,
+            'elapsed': self.elapsed,
+            'nodes': self.nodes,
+            'nodes_per_second': self.nodes_per_second,
+            'leaf_evaluations': self.leaf_evaluations,
+            'expanded': self.expanded,
+            'table_returns': self.table_returns,
+            'branching_factor': self.branching_factor,
+            'cutoffs': self.cutoffs,
+            'cutoff_rate': self.cutoff_rate,
+            'first_move_cutoff_rate': self.first_move_cutoff_rate,
+            'cutoffs_per_ply': self.cutoffs_per_ply,
+            'table_probes': self.table_probes,
+            'cache_hit_rate': self.cache_hit_rate,
+            'max_depth': self.max_depth,
+            'completed_depth': self.completed_depth
+        }
+
+    def write_json_line(self, path):
+        """
+        Appends the stats to a log file as a single line of JSON
+
+        Args:
+            path (string): Log file to append to, created if missing
+        """
+
+        # Imported here, so importing the engine doesn't load json until something is logged
+        import json
+
+        with open(path, 'a') as log_file:
+            log_file.write(json.dumps(self.to_dict()) + '\n')
+
+    def summary(self):
+        """
+        Returns:
+            (string): Short one line description, for the GUI's status bar
+        """
+
+        if self.source == 'tablebase':
+            return "Perfect move from the tablebase"
+        if self.source in ('book', 'random'):
+            return f"Move from the {'opening book' if self.source == 'book' else 'random opening'}"
+
+        if self.source == 'mcts':
+            return (f"Monte Carlo: {self.nodes:,} playouts in {self.elapsed:.2f}s ({self.nodes_per_second:,.0f}/s), "
+                    f"tree depth {self.max_depth}")
+
+        summary = (f"{self.nodes:,} nodes in {self.elapsed:.2f}s ({self.nodes_per_second:,.0f}/s), "
+                   f"depth {self.max_depth}, branching {self.branching_factor:.1f}, "
+                   f"{self.cache_hit_rate:.0%} cache hits")
+        if self.source == 'ponder':
+            return f"Pondered during your turn: {summary}"
+
+        return summary
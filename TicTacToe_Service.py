@@ -0,0 +1,682 @@
+"""
+Local move service: many TicTacToe games at once over JSON lines on TCP.
+
+Each request is one line of JSON, and is answered with one line of JSON carrying the same "id". A connection holds
+any number of games, which are dropped when it closes:
+
+    {"id": 1, "op": "new_game", "size": 4, "first_player": "X", "settings": {"time_budget": 0.5}}
+    {"id": 2, "op": "move", "game_id": 1, "move": [1, 2]}
+    {"id": 3, "op": "best_move", "game_id": 1, "play": true, "deadline": 2.0}
+    {"id": 4, "op": "best_move", "board": "X.O/.X./...", "turn": "O"}
+    {"id": 5, "op": "close_game", "game_id": 1}
+    {"id": 6, "op": "metrics"}
+
+Searches run on a bounded process pool, never in the event loop. Every best_move request has a deadline: it fails
+with "deadline_exceeded" if no worker frees up in time, and otherwise the search gets what is left of the deadline
+as its time budget. Past max_queue waiting searches, new ones are turned away at once with "overloaded", and each
+connection only has a few requests read at a time, so a client sending faster than it is answered is slowed down.
+The metrics request reports queue depth, searches running, and search latency.
+
+    python TicTacToe_Service.py serve --port 8765 --workers 4
+    python TicTacToe_Service.py load-test --sessions 200 --size 3
+
+load-test starts its own service on a free port unless given --port of one already running.
+"""
+
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from time import perf_counter
+
+import argparse
+import asyncio
+import json
+import os
+import random
+
+from TicTacToe_Bitboard import GAME_VALS, BOARD_SIZES
+from TicTacToe_Engine import TicTacToeGame, GAME_STATUS, BOARD_SYMBOLS, new_game, parse_board
+from TicTacToe_SearchStats import percentile
+
+DEFAULT_PORT = 8765
+DEFAULT_DEADLINE = 5.0 # Seconds a best_move request may take, when it doesn't give its own deadline
+DEADLINE_MARGIN = 0.05 # Seconds of a deadline kept back from the search, for getting the result back
+MAX_QUEUE_PER_WORKER = 16 # Searches allowed to wait for each worker before new ones are turned away
+MAX_IN_FLIGHT_PER_CONNECTION = 4 # Requests read from one connection before its earlier ones are answered
+MAX_LINE_BYTES = 64 * 1024
+LATENCY_WINDOW = 1000 # Recent searches the latency metrics are taken over
+MAX_WORKER_GAMES = 4 # Games kept in each worker process, one per board size and settings, least recently used go first
+
+SERVICE_OPS = ('new_game', 'move', 'best_move', 'close_game', 'metrics')
+
+PLAYER_NAMES = {
+    'X': GAME_VALS['X'],
+    'O': GAME_VALS['O']
+}
+
+# Settings chosen by the service, whatever the client sends: each search already has a worker to itself
+FIXED_SETTINGS = {
+    'workers': 1,
+    'search_log_path': None
+}
+
+# Settings that only limit a search, set on a worker's game for each search rather than building a game of their own
+BUDGET_SETTINGS = ('time_budget', 'node_budget')
+
+
+class ServiceError(Exception):
+    """A request that can't be served, answered with its code and message"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+_worker_games = OrderedDict() # Up to MAX_WORKER_GAMES TicTacToeGames per worker process, kept between searches
+
+
+def search_in_worker(game_size, x_bits, o_bits, whose_turn, settings, time_budget):
+    """
+    Runs in a worker process of the service's pool, finding the computer's move for one position
+
+    Args:
+        game_size (integer): Length of one side of the board
+        x_bits (int): Mask of X's spots
+        o_bits (int): Mask of O's spots
+        whose_turn (int): -1 for O's turn, 1 for X's turn
+        settings (dict): Keyword arguments for TicTacToeGame
+        time_budget (float): Seconds the search may take, the tighter of this and the settings' own budget is used
+
+    Returns:
+        (tuple): (coordinates of the move as a list, search stats as a dictionary)
+    """
+
+    search_settings = {name: value for name, value in settings.items() if name not in BUDGET_SETTINGS}
+    games_key = (game_size, json.dumps(search_settings, sort_keys=True))
+    game = _worker_games.get(games_key)
+    if game is None:
+        game = TicTacToeGame(game_size, **search_settings)
+        _worker_games[games_key] = game
+        if len(_worker_games) > MAX_WORKER_GAMES:
+            _, evicted_game = _worker_games.popitem(last=False)
+            evicted_game.flush_search_cache()
+    else:
+        _worker_games.move_to_end(games_key)
+
+    budget = settings.get('time_budget')
+    game.time_budget = time_budget if budget is None else min(budget, time_budget)
+    game.node_budget = settings.get('node_budget')
+    game.set_position(x_bits, o_bits, whose_turn)
+    coordinates, search_stats = game.find_next_move_for_computer()
+
+    return list(coordinates), search_stats.to_dict()
+
+
+def board_text(game):
+    """
+    Args:
+        game (TicTacToeGame): Game to write out
+
+    Returns:
+        (string): The board's rows separated by /, in the symbols parse_board reads
+    """
+
+    symbols = {value: symbol for symbol, value in BOARD_SYMBOLS.items()}
+    return '/'.join(''.join(symbols[game.game_data[rows, cols]] for cols in range(game.game_size))
+                    for rows in range(game.game_size))
+
+
+class MoveService:
+    """The service's games, worker pool, and metrics, shared by every connection"""
+
+    def __init__(self, workers: int = None, max_queue: int = None, default_deadline: float = DEFAULT_DEADLINE):
+        """
+        Constructor. Starts the worker pool.
+
+        Args:
+            workers (integer): Searches run at once, None for one per CPU
+            max_queue (integer): Searches allowed to wait for a worker, None for MAX_QUEUE_PER_WORKER per worker
+            default_deadline (float): Seconds a best_move request may take when it doesn't give a deadline
+        """
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue if max_queue is not None else self.workers * MAX_QUEUE_PER_WORKER
+        self.default_deadline = default_deadline
+        self.process_pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.worker_slots = asyncio.Semaphore(self.workers)
+        self.next_game_id = 1
+        self.start_time = perf_counter()
+
+        self.connections = 0
+        self.games = 0
+        self.queue_depth = 0 # Searches waiting for a worker
+        self.max_queue_depth = 0
+        self.running = 0 # Searches in the workers
+        self.counts = Counter() # Requests by op, and searches by outcome
+        self.latencies = deque(maxlen=LATENCY_WINDOW) # Seconds from request to result, of recent searches
+
+    def shutdown(self):
+        """Stops the worker pool, dropping searches still waiting"""
+
+        self.process_pool.shutdown(wait=False, cancel_futures=True)
+
+    def restart_workers(self, broken_pool):
+        """
+        Replaces a worker pool that broke when one of its processes died
+
+        Args:
+            broken_pool (ProcessPoolExecutor): The pool that broke, left alone if another search already replaced it
+        """
+
+        if self.process_pool is broken_pool:
+            self.process_pool = ProcessPoolExecutor(max_workers=self.workers)
+        broken_pool.shutdown(wait=False, cancel_futures=True)
+
+    async def serve(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """
+        Starts listening for connections
+
+        Args:
+            host (string): Address to listen on
+            port (integer): Port to listen on, 0 for any free port
+
+        Returns:
+            (asyncio.Server): The listening server, its sockets give the port picked
+        """
+
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_BYTES)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Reads requests off one connection and answers each as soon as it is done, so a slow search doesn't hold up
+        quicker requests behind it. Only MAX_IN_FLIGHT_PER_CONNECTION requests are read before earlier ones are
+        answered. Once the client stops sending, the requests already read are still answered, and are only given up
+        on when the connection drops or the service shuts down.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's incoming side
+            writer (asyncio.StreamWriter): The connection's outgoing side
+        """
+
+        self.connections += 1
+        games = {} # This connection's games, keyed by game ID
+        in_flight = asyncio.Semaphore(MAX_IN_FLIGHT_PER_CONNECTION)
+        tasks = set()
+
+        try:
+            while True:
+                await in_flight.acquire()
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    # Dropped connection, or a line longer than MAX_LINE_BYTES
+                    break
+                if not line:
+                    # The client is done sending, but may still be reading, so its requests are answered
+                    if tasks:
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                    break
+
+                task = asyncio.create_task(self.answer(line, games, writer, in_flight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except asyncio.CancelledError:
+            # The service is shutting down
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.connections -= 1
+            self.games -= len(games)
+            writer.close()
+
+    async def answer(self, line, games, writer, in_flight):
+        """
+        Serves one request and writes its reply
+
+        Args:
+            line (bytes): The request's line of JSON
+            games (dict): The connection's games, keyed by game ID
+            writer (asyncio.StreamWriter): Where the reply goes
+            in_flight (asyncio.Semaphore): The connection's request slots, one is given back when the reply is sent
+        """
+
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ServiceError('bad_request', "Requests are JSON objects")
+                request_id = request.get('id')
+                reply = await self.dispatch(request, games)
+                reply['ok'] = True
+            except ServiceError as error:
+                reply = {'ok': False, 'error': error.code, 'message': str(error)}
+            except (ValueError, TypeError, KeyError) as error:
+                # Bad JSON, or fields of the wrong type, or settings TicTacToeGame doesn't take
+                reply = {'ok': False, 'error': 'bad_request', 'message': str(error)}
+            except Exception as error:
+                # A bug, or a worker that died, is reported to the client rather than leaving it waiting
+                self.counts['internal_errors'] += 1
+                reply = {'ok': False, 'error': 'internal_error', 'message': f"{type(error).__name__}: {error}"}
+
+            reply['id'] = request_id
+            try:
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            # Given back however the request ends, cancelled included, so the connection keeps its slots
+            in_flight.release()
+
+    async def dispatch(self, request, games):
+        """
+        Args:
+            request (dict): The decoded request
+            games (dict): The connection's games, keyed by game ID
+
+        Raises:
+            ServiceError: The request can't be served
+
+        Returns:
+            (dict): Fields of the reply
+        """
+
+        op = request.get('op')
+        self.counts[f"op_{op}" if op in SERVICE_OPS else 'op_unknown'] += 1
+
+        if op == 'new_game':
+            return self.new_game(request, games)
+        if op == 'move':
+            return self.play_move(games, request['game_id'], tuple(request['move']))
+        if op == 'best_move':
+            return await self.best_move(request, games)
+        if op == 'close_game':
+            if games.pop(request['game_id'], None) is not None:
+                self.games -= 1
+            return {}
+        if op == 'metrics':
+            return {'metrics': self.metrics()}
+
+        raise ServiceError('bad_request', f"Unknown op {op!r}")
+
+    def new_game(self, request, games):
+        """
+        Args:
+            request (dict): Fields "size", and optionally "first_player" ("X" or "O", random if missing) and
+                "settings" (keyword arguments for TicTacToeGame, used for the computer's searches)
+            games (dict): The connection's games, the new one is added
+
+        Returns:
+            (dict): The new game's ID, board, player to move, and status
+        """
+
+        game_size = request['size']
+        if game_size not in BOARD_SIZES:
+            raise ServiceError('bad_request', f"size must be from {BOARD_SIZES[0]} to {BOARD_SIZES[-1]}")
+
+        settings = dict(request.get('settings') or {}, **FIXED_SETTINGS)
+        # Check the settings now, so a mistake is reported here rather than by every search
+        TicTacToeGame(game_size, **dict(settings, table_size=0, use_opening_book=False))
+
+        first_player = request.get('first_player')
+        if first_player is not None:
+            first_player = PLAYER_NAMES[first_player]
+
+        # The service's copy only keeps the rules, the searches happen in the workers with the game's settings
+        game = new_game(game_size, first_player, table_size=0, use_opening_book=False, leaf_evaluator='open_lines')
+        game.service_settings = settings
+
+        game_id = self.next_game_id
+        self.next_game_id += 1
+        games[game_id] = game
+        self.games += 1
+
+        return self.game_reply(game_id, game)
+
+    def game_reply(self, game_id, game):
+        """
+        Returns:
+            (dict): The game's ID, board, player to move, and status
+        """
+
+        return {
+            'game_id': game_id,
+            'board': board_text(game),
+            'turn': 'X' if game.turn == GAME_VALS['X'] else 'O',
+            'status': game.status
+        }
+
+    def play_move(self, games, game_id, coordinates):
+        """
+        Args:
+            games (dict): The connection's games
+            game_id (integer): Game to play in
+            coordinates (tuple): Spot to play for whoever's turn it is
+
+        Returns:
+            (dict): The game after the move
+        """
+
+        game = games.get(game_id)
+        if game is None:
+            raise ServiceError('unknown_game', f"No game {game_id} on this connection")
+
+        game.play_move(coordinates)
+        return self.game_reply(game_id, game)
+
+    async def best_move(self, request, games):
+        """
+        Finds the computer's move for a game on the connection, or for a board sent with the request
+
+        Args:
+            request (dict): Either "game_id", and optionally "play" to play the move in the game, or "board" (as
+                parse_board reads it), "turn" ("X" or "O"), and optionally "settings". Optionally "deadline", seconds
+                the request may take.
+            games (dict): The connection's games
+
+        Returns:
+            (dict): The move, its search stats, and with "play" the game after it
+        """
+
+        deadline = float(request.get('deadline', self.default_deadline))
+
+        if 'game_id' in request:
+            game_id = request['game_id']
+            game = games.get(game_id)
+            if game is None:
+                raise ServiceError('unknown_game', f"No game {game_id} on this connection")
+            game_size = game.game_size
+            x_bits, o_bits, whose_turn = game.board.x_bits, game.board.o_bits, game.turn
+            settings = game.service_settings
+            status = game.status
+        else:
+            game = None
+            game_size, x_bits, o_bits = parse_board(request['board'])
+            whose_turn = PLAYER_NAMES[request['turn']]
+            settings = dict(request.get('settings') or {}, **FIXED_SETTINGS)
+            position = TicTacToeGame(game_size, table_size=0, use_opening_book=False, leaf_evaluator='open_lines')
+            position.set_position(x_bits, o_bits, whose_turn)
+            status = position.status
+
+        if status != GAME_STATUS['IN_PROGRESS']:
+            raise ServiceError('game_over', f"The game is over: {status}")
+
+        coordinates, search_stats = await self.search(game_size, x_bits, o_bits, whose_turn, settings, deadline)
+        reply = {'move': coordinates, 'search_stats': search_stats}
+
+        if game is not None and request.get('play'):
+            if (game.board.x_bits, game.board.o_bits, game.turn) != (x_bits, o_bits, whose_turn):
+                raise ServiceError('conflict', "The game changed while its move was being searched")
+            reply.update(self.play_move(games, game_id, tuple(coordinates)))
+
+        return reply
+
+    async def search(self, game_size, x_bits, o_bits, whose_turn, settings, deadline):
+        """
+        Queues a search for a worker, holding it to the deadline
+
+        Args:
+            game_size (integer): Length of one side of the board
+            x_bits (int): Mask of X's spots
+            o_bits (int): Mask of O's spots
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+            settings (dict): Keyword arguments for TicTacToeGame
+            deadline (float): Seconds from now the result is due
+
+        Raises:
+            ServiceError: Too many searches are already waiting, or no worker freed up before the deadline
+
+        Returns:
+            (tuple): (coordinates of the move as a list, search stats as a dictionary)
+        """
+
+        if self.queue_depth >= self.max_queue:
+            self.counts['searches_overloaded'] += 1
+            raise ServiceError('overloaded', f"{self.queue_depth} searches are already waiting, try again later")
+
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            await asyncio.wait_for(self.worker_slots.acquire(), deadline - DEADLINE_MARGIN)
+        except asyncio.TimeoutError:
+            self.counts['searches_deadline_exceeded'] += 1
+            raise ServiceError('deadline_exceeded', f"No worker was free within the {deadline}s deadline")
+        finally:
+            self.queue_depth -= 1
+
+        self.running += 1
+        time_budget = max(0.0, deadline - DEADLINE_MARGIN - (loop.time() - start_time))
+        process_pool = self.process_pool
+        try:
+            try:
+                search_future = process_pool.submit(search_in_worker, game_size, x_bits, o_bits, whose_turn, settings,
+                                                    time_budget)
+            except Exception:
+                self.search_finished()
+                raise
+
+            def release_slot(_):
+                try:
+                    loop.call_soon_threadsafe(self.search_finished)
+                except RuntimeError:
+                    # The event loop has already closed, and the service with it
+                    pass
+
+            # The worker is only free once the search itself ends, which can be after this request is cancelled, so
+            # the slot is given back from the search's future (on the pool's thread) rather than from here
+            search_future.add_done_callback(release_slot)
+            result = await asyncio.wrap_future(search_future)
+        except BrokenProcessPool:
+            # A worker died, and took the pool with it. Later searches get a new pool.
+            self.counts['searches_failed'] += 1
+            self.restart_workers(process_pool)
+            raise
+
+        self.counts['searches_completed'] += 1
+        self.latencies.append(loop.time() - start_time)
+        return result
+
+    def search_finished(self):
+        """Gives a search's worker slot back, once the worker is done with it"""
+
+        self.running -= 1
+        self.worker_slots.release()
+
+    def metrics(self):
+        """
+        Returns:
+            (dict): Current load, request and search counts, and latency of recent searches in seconds
+        """
+
+        latencies = list(self.latencies)
+        return {
+            'uptime': perf_counter() - self.start_time,
+            'workers': self.workers,
+            'connections': self.connections,
+            'games': self.games,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'max_queue': self.max_queue,
+            'running': self.running,
+            'counts': dict(self.counts),
+            'mean_latency': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50_latency': percentile(latencies, 0.5),
+            'p99_latency': percentile(latencies, 0.99)
+        }
+
+
+async def send_request(reader, writer, request):
+    """
+    Args:
+        reader (asyncio.StreamReader): Connection to the service
+        writer (asyncio.StreamWriter): Connection to the service
+        request (dict): Request to send
+
+    Returns:
+        (dict): The service's reply
+    """
+
+    writer.write(json.dumps(request).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def play_load_test_session(host, port, game_size, settings, deadline, rng, results):
+    """
+    Plays one game against the service: random moves for X, the service's best_move for O
+
+    Args:
+        host (string): Service's address
+        port (integer): Service's port
+        game_size (integer): Length of one side of the board
+        settings (dict): Keyword arguments for the service's TicTacToeGame
+        deadline (float): Seconds each best_move request may take
+        rng (random.Random): Picks X's moves
+        results (dict): 'latencies' list and 'errors' Counter, added to
+    """
+
+    reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+    try:
+        reply = await send_request(reader, writer, {'op': 'new_game', 'size': game_size, 'first_player': 'X',
+                                                    'settings': settings})
+        game_id = reply['game_id']
+        while reply.get('status', GAME_STATUS['IN_PROGRESS']) == GAME_STATUS['IN_PROGRESS']:
+            board = reply['board'].replace('/', '')
+            empty_spots = [divmod(index, game_size) for index, symbol in enumerate(board) if symbol == '.']
+            reply = await send_request(reader, writer, {'op': 'move', 'game_id': game_id,
+                                                        'move': rng.choice(empty_spots)})
+            if reply['status'] != GAME_STATUS['IN_PROGRESS']:
+                break
+
+            start_time = perf_counter()
+            reply = await send_request(reader, writer, {'op': 'best_move', 'game_id': game_id, 'play': True,
+                                                        'deadline': deadline})
+            if not reply['ok']:
+                results['errors'][reply['error']] += 1
+                break
+            results['latencies'].append(perf_counter() - start_time)
+
+        results['games'] += 1
+    except (ConnectionError, KeyError, ValueError):
+        results['errors']['connection'] += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load_test(host, port, sessions, game_size, settings, deadline, seed, workers=None):
+    """
+    Plays many games against the service at once, and reports how it kept up
+
+    Args:
+        host (string): Service's address
+        port (integer): Service's port, None to start a service on a free port for the test
+        sessions (integer): Games played at once, each on its own connection
+        game_size (integer): Length of one side of the board
+        settings (dict): Keyword arguments for the service's TicTacToeGame
+        deadline (float): Seconds each best_move request may take
+        seed (integer): Seed for X's random moves
+        workers (integer): Search workers of the service started for the test, None for one per CPU
+
+    Returns:
+        (dict): Games finished, searches, errors by kind, wall time, and the service's metrics at the end
+    """
+
+    service = None
+    server = None
+    if port is None:
+        service = MoveService(workers)
+        server = await service.serve(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    rng = random.Random(seed)
+    results = {'games': 0, 'latencies': [], 'errors': Counter()}
+    start_time = perf_counter()
+    try:
+        await asyncio.gather(*(play_load_test_session(host, port, game_size, settings, deadline,
+                                                      random.Random(rng.getrandbits(32)), results)
+                               for _ in range(sessions)))
+        elapsed = perf_counter() - start_time
+
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        metrics = (await send_request(reader, writer, {'op': 'metrics'}))['metrics']
+        writer.close()
+        await writer.wait_closed()
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            service.shutdown()
+
+    latencies = results['latencies']
+    return {
+        'games': results['games'],
+        'searches': len(latencies),
+        'errors': dict(results['errors']),
+        'seconds': elapsed,
+        'searches_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_latency': percentile(latencies, 0.5),
+        'p99_latency': percentile(latencies, 0.99),
+        'metrics': metrics
+    }
+
+
+async def run_service(host, port, workers, max_queue, default_deadline):
+    """Serves until interrupted"""
+
+    service = MoveService(workers, max_queue, default_deadline)
+    server = await service.serve(host, port)
+    print(f"Serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)} with {service.workers} "
+          f"search workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+
+def main():
+    """Runs the service, or a load test against it, with the settings given on the command line"""
+
+    parser = argparse.ArgumentParser(description="TicTacToe move service, JSON lines over TCP")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on, or of the service to test")
+    parser.add_argument('--workers', type=int, default=None, help="searches run at once, defaults to one per CPU")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help="run the service")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument('--max-queue', type=int, default=None,
+                              help=f"searches allowed to wait, defaults to {MAX_QUEUE_PER_WORKER} per worker")
+    serve_parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE,
+                              help="seconds a best_move request may take when it doesn't say")
+
+    load_test_parser = commands.add_parser('load-test', help="play many games against the service at once")
+    load_test_parser.add_argument('--port', type=int, default=None,
+                                  help="port of a running service, by default one is started for the test")
+    load_test_parser.add_argument('--sessions', type=int, default=100, help="games played at once")
+    load_test_parser.add_argument('--size', type=int, default=3, choices=BOARD_SIZES, help="board size")
+    load_test_parser.add_argument('--settings', default='{}', help="TicTacToeGame keyword arguments, as JSON")
+    load_test_parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE,
+                                  help="seconds each best_move request may take")
+    load_test_parser.add_argument('--seed', type=int, default=2022, help="seed for the random moves played")
+    arguments = parser.parse_args()
+
+    if arguments.command == 'serve':
+        try:
+            asyncio.run(run_service(arguments.host, arguments.port, arguments.workers, arguments.max_queue,
+                                    arguments.deadline))
+        except KeyboardInterrupt:
+            pass
+    else:
+        report = asyncio.run(load_test(arguments.host, arguments.port, arguments.sessions, arguments.size,
+                                       json.loads(arguments.settings), arguments.deadline, arguments.seed,
+                                       arguments.workers))
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
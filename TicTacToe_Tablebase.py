@@ -0,0 +1,465 @@
+"""
+Endgame tablebases for the TicTacToe search engine: the exact value of every position on the smaller boards.
+
+A tablebase holds, for every position, whether the player to move wins, draws, or loses with perfect play. It is
+worked out by retrograde analysis: every move adds a mark, so the positions are solved a layer at a time from the
+full board back to the empty one, and each position's value follows from the values of the positions its moves lead
+to, which are already known. Layers are solved with NumPy, a batch of positions at a time, and their batches can be
+spread over worker processes.
+
+Positions are kept from the point of view of the player to move, so one table covers either player moving, and
+either player having started. The index of a position is its board read as a base-3 number, one digit per spot in
+bit index order: 0 for empty, 1 for a mark of the player to move, 2 for a mark of the other player. Each value takes
+2 bits, 4 to a byte, so the 4x4 table (3^16 positions) takes about 10 MiB, and the engine memory-maps it rather than
+reading it in.
+
+Build the tablebases once by running this script (NumPy is only needed to build them, not to read them):
+
+    python TicTacToe_Tablebase.py --sizes 3 4 --workers 4
+"""
+
+from time import time
+
+import mmap
+import os
+import struct
+
+from TicTacToe_Bitboard import GAME_VALS, build_line_masks
+
+TABLEBASE_MAGIC = b'TTTBASE1'
+TABLEBASE_HEADER = struct.Struct('<8sBQ') # Magic, board size, number of positions
+
+TABLEBASE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tablebases')
+
+TABLEBASE_SIZES = (3, 4) # Board sizes small enough to solve, 5x5 would take 3^25 positions
+
+# Values of a position, for the player to move. UNKNOWN is left for positions no game reaches.
+UNKNOWN = 0
+LOSS = 1
+DRAW = 2
+WIN = 3
+
+VALUE_NAMES = {
+    UNKNOWN: 'unknown',
+    LOSS: 'loss',
+    DRAW: 'draw',
+    WIN: 'win'
+}
+
+BATCH_POSITIONS = 1 << 20 # Positions solved together in one batch of NumPy operations
+
+
+def tablebase_path(game_size, directory=None):
+    """
+    Args:
+        game_size (integer): Length of one side of the board
+        directory (string): Folder holding the tablebases, None for TABLEBASE_DIRECTORY
+
+    Returns:
+        (string): Path of the tablebase for the board size
+    """
+
+    return os.path.join(directory or TABLEBASE_DIRECTORY, f"tablebase_{game_size}x{game_size}.bin")
+
+
+def base3_weights(game_size):
+    """
+    Args:
+        game_size (integer): Length of one side of the board
+
+    Returns:
+        (list): For every mask of spots, the sum of 3 to the power of each spot's bit index, so a position's index
+            is weights[mover_bits] + 2 * weights[other_bits]
+    """
+
+    spots = game_size ** 2
+    weights = [0] * (1 << spots)
+    for mask in range(1, 1 << spots):
+        lowest_bit = mask & -mask
+        weights[mask] = weights[mask ^ lowest_bit] + 3 ** (lowest_bit.bit_length() - 1)
+
+    return weights
+
+
+class Tablebase:
+    """Read-only, memory-mapped tablebase for a single board size"""
+
+    _loaded_tablebases = {} # Tablebases already opened in this process, keyed by path
+
+    def __init__(self, path: str):
+        """
+        Constructor. Maps the tablebase file into memory and checks its header.
+
+        Args:
+            path (string): Path of a tablebase written by write_tablebase
+
+        Raises:
+            ValueError: The file is not a tablebase, or is cut short
+        """
+
+        self.path = path
+        with open(path, 'rb') as tablebase_file:
+            self.tablebase_map = mmap.mmap(tablebase_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.tablebase_map) < TABLEBASE_HEADER.size:
+            self.tablebase_map.close()
+            raise ValueError(f"{path} is too short to be a tablebase")
+
+        magic, self.game_size, self.position_count = TABLEBASE_HEADER.unpack_from(self.tablebase_map, 0)
+        if (magic != TABLEBASE_MAGIC or self.position_count != 3 ** (self.game_size ** 2) or
+                len(self.tablebase_map) != TABLEBASE_HEADER.size + (self.position_count + 3) // 4):
+            self.tablebase_map.close()
+            raise ValueError(f"{path} is not a valid tablebase")
+
+        # Powers of 3 by bit index, for indexing positions one spot at a time
+        self.powers = [3 ** index for index in range(self.game_size ** 2)]
+
+    @classmethod
+    def load(cls, game_size, directory=None):
+        """
+        Opens the tablebase for a board size, sharing one mapping per file across every game in the process
+
+        Args:
+            game_size (integer): Length of one side of the board
+            directory (string): Folder holding the tablebases, None for TABLEBASE_DIRECTORY
+
+        Returns:
+            (Tablebase): The tablebase, or None if there is no valid tablebase for the board size
+        """
+
+        path = tablebase_path(game_size, directory)
+        if path in cls._loaded_tablebases:
+            return cls._loaded_tablebases[path]
+
+        try:
+            tablebase = cls(path)
+        except (OSError, ValueError):
+            tablebase = None
+
+        if tablebase is not None and tablebase.game_size != game_size:
+            tablebase.close()
+            tablebase = None
+
+        if tablebase is not None:
+            # Missing tablebases aren't remembered, so one built while the process runs is picked up by later games
+            cls._loaded_tablebases[path] = tablebase
+        return tablebase
+
+    def close(self):
+        """Unmaps the tablebase file"""
+
+        self.tablebase_map.close()
+        self._loaded_tablebases.pop(self.path, None)
+
+    def position_index(self, mover_bits, other_bits):
+        """
+        Args:
+            mover_bits (int): Mask of the player to move's spots
+            other_bits (int): Mask of the other player's spots
+
+        Returns:
+            (int): Base-3 index of the position
+        """
+
+        powers = self.powers
+        index = 0
+        while mover_bits:
+            lowest_bit = mover_bits & -mover_bits
+            index += powers[lowest_bit.bit_length() - 1]
+            mover_bits ^= lowest_bit
+        while other_bits:
+            lowest_bit = other_bits & -other_bits
+            index += 2 * powers[lowest_bit.bit_length() - 1]
+            other_bits ^= lowest_bit
+
+        return index
+
+    def value(self, mover_bits, other_bits):
+        """
+        Args:
+            mover_bits (int): Mask of the player to move's spots
+            other_bits (int): Mask of the other player's spots
+
+        Returns:
+            (int): WIN, DRAW, or LOSS for the player to move with perfect play, UNKNOWN for a position no game reaches
+        """
+
+        index = self.position_index(mover_bits, other_bits)
+        packed = self.tablebase_map[TABLEBASE_HEADER.size + (index >> 2)]
+        return packed >> ((index & 3) * 2) & 3
+
+    def move_values(self, x_bits, o_bits, whose_turn):
+        """
+        Values every move of a position
+
+        Args:
+            x_bits (int): Mask of X's spots
+            o_bits (int): Mask of O's spots
+            whose_turn (int): -1 for O's turn, 1 for X's turn
+
+        Returns:
+            (dict): Keys are bit indexes of the empty spots, values are WIN, DRAW, or LOSS for the player moving there,
+                UNKNOWN where the move leads to a position no game reaches
+        """
+
+        if whose_turn == GAME_VALS['X']:
+            mover_bits, other_bits = x_bits, o_bits
+        else:
+            mover_bits, other_bits = o_bits, x_bits
+
+        empty = ~(x_bits | o_bits) & ((1 << self.game_size ** 2) - 1)
+        values = {}
+        while empty:
+            lowest_bit = empty & -empty
+            # After the move it is the other player's turn, and their loss is the mover's win
+            child_value = self.value(other_bits, mover_bits | lowest_bit)
+            if child_value != UNKNOWN:
+                child_value = WIN + LOSS - child_value
+            values[lowest_bit.bit_length() - 1] = child_value
+            empty ^= lowest_bit
+
+        return values
+
+
+def solve_batch(game_size, mover_masks, other_masks, values):
+    """
+    Solves a batch of positions whose moves all lead to positions already solved, writing their values in place
+
+    Args:
+        game_size (integer): Length of one side of the board
+        mover_masks (numpy.ndarray): Masks of the player to move's spots, one per position
+        other_masks (numpy.ndarray): Masks of the other player's spots, one per position
+        values (numpy.ndarray): Value of every position by index, as uint8
+    """
+
+    import numpy as np
+
+    weights = _solver_weights(game_size)
+    spots = game_size ** 2
+    full_mask = (1 << spots) - 1
+
+    other_won = np.zeros(len(mover_masks), dtype=bool)
+    mover_won = np.zeros(len(mover_masks), dtype=bool)
+    for line in build_line_masks(game_size):
+        other_won |= (other_masks & line) == line
+        mover_won |= (mover_masks & line) == line
+
+    taken = mover_masks | other_masks
+    # After a move the players swap sides, the other player becomes the one to move
+    other_weights = weights[other_masks]
+    best = np.full(len(mover_masks), UNKNOWN, dtype=np.uint8)
+    for spot in range(spots):
+        bit = 1 << spot
+        empty = (taken & bit) == 0
+        # Taken spots look up the empty board instead, and are masked out below
+        child_values = values[np.where(empty, other_weights + 2 * weights[mover_masks | bit], 0)]
+        move_values = np.where(empty & (child_values != UNKNOWN), WIN + LOSS - child_values, UNKNOWN)
+        np.maximum(best, move_values.astype(np.uint8), out=best)
+
+    result = np.where(taken == full_mask, DRAW, best)
+    # A win ends the game. A position where the player to move has already won is never reached.
+    result = np.where(mover_won, UNKNOWN, result)
+    result = np.where(other_won, LOSS, result)
+    values[weights[mover_masks] + 2 * other_weights] = result
+
+
+_solver_tables = {} # Per board size, base-3 weights of every mask as a NumPy array
+
+
+def _solver_weights(game_size):
+    """
+    Returns:
+        (numpy.ndarray): base3_weights for the board size, built once per process
+    """
+
+    if game_size not in _solver_tables:
+        import numpy as np
+
+        _solver_tables[game_size] = np.array(base3_weights(game_size), dtype=np.int64)
+
+    return _solver_tables[game_size]
+
+
+def layer_batches(game_size, mover_count, other_count):
+    """
+    Splits every placement of mover_count and other_count marks into batches of about BATCH_POSITIONS positions
+
+    Args:
+        game_size (integer): Length of one side of the board
+        mover_count (integer): Marks of the player to move
+        other_count (integer): Marks of the other player
+
+    Yields:
+        (tuple): (mover masks, other masks) as NumPy arrays of equal length
+    """
+
+    import numpy as np
+
+    all_masks = np.arange(1 << game_size ** 2, dtype=np.int64)
+    mark_counts = np.zeros(len(all_masks), dtype=np.int64)
+    for spot in range(game_size ** 2):
+        mark_counts += (all_masks >> spot) & 1
+
+    mover_options = all_masks[mark_counts == mover_count]
+    other_options = all_masks[mark_counts == other_count]
+
+    mover_batch = []
+    other_batch = []
+    batch_size = 0
+    for mover_mask in mover_options:
+        others = other_options[(other_options & mover_mask) == 0]
+        mover_batch.append(np.full(len(others), mover_mask, dtype=np.int64))
+        other_batch.append(others)
+        batch_size += len(others)
+        if batch_size >= BATCH_POSITIONS:
+            yield np.concatenate(mover_batch), np.concatenate(other_batch)
+            mover_batch = []
+            other_batch = []
+            batch_size = 0
+
+    if mover_batch:
+        yield np.concatenate(mover_batch), np.concatenate(other_batch)
+
+
+_worker_values = None # The shared value array, attached once per worker process
+
+
+def _attach_worker(memory_name, position_count):
+    """Runs once in each worker process, attaching it to the shared value array"""
+
+    global _worker_values
+    from multiprocessing import shared_memory
+
+    import numpy as np
+
+    memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_values = (memory, np.ndarray(position_count, dtype=np.uint8, buffer=memory.buf))
+
+
+def solve_batch_in_worker(game_size, mover_masks, other_masks):
+    """Runs in a worker process of solve_tablebase, solving one batch into the shared value array"""
+
+    solve_batch(game_size, mover_masks, other_masks, _worker_values[1])
+
+
+def solve_tablebase(game_size, workers=1):
+    """
+    Solves every position of a board size by retrograde analysis, from the full board back to the empty one. Every
+    move adds a mark, so each layer of positions with the same number of marks only needs the layer after it.
+
+    Args:
+        game_size (integer): Length of one side of the board
+        workers (integer): Processes each layer's batches are spread over, 1 to solve them in this process
+
+    Raises:
+        RuntimeError: NumPy isn't installed
+
+    Returns:
+        (numpy.ndarray): Value of every position by index, as uint8
+    """
+
+    try:
+        # Imported here, so games that only read the tablebases don't load NumPy
+        import numpy as np
+    except ImportError:
+        raise RuntimeError("Building a tablebase needs NumPy (pip install numpy)") from None
+
+    position_count = 3 ** game_size ** 2
+    spots = game_size ** 2
+
+    # Each layer holds the positions with the player to move having started (equal marks), or not (one fewer)
+    layers = []
+    for marks in range(spots, -1, -1):
+        for mover_count in range(marks // 2, -1, -1):
+            other_count = marks - mover_count
+            if other_count in (mover_count, mover_count + 1):
+                layers.append((mover_count, other_count))
+
+    if workers <= 1:
+        values = np.zeros(position_count, dtype=np.uint8)
+        for mover_count, other_count in layers:
+            for mover_masks, other_masks in layer_batches(game_size, mover_count, other_count):
+                solve_batch(game_size, mover_masks, other_masks, values)
+        return values
+
+    # Imported here, so solving in one process doesn't load multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    memory = shared_memory.SharedMemory(create=True, size=position_count)
+    try:
+        values = np.ndarray(position_count, dtype=np.uint8, buffer=memory.buf)
+        values[:] = UNKNOWN
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                 initargs=(memory.name, position_count)) as process_pool:
+            for mover_count, other_count in layers:
+                # Batches of a layer only read the layer after it, so they are solved together
+                futures = [process_pool.submit(solve_batch_in_worker, game_size, mover_masks, other_masks)
+                           for mover_masks, other_masks in layer_batches(game_size, mover_count, other_count)]
+                for future in futures:
+                    future.result()
+
+        result = values.copy()
+        del values
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return result
+
+
+def write_tablebase(path, game_size, values):
+    """
+    Packs the values 4 to a byte and writes the tablebase file. It is written alongside and then moved into place,
+    so a running game never maps half a tablebase.
+
+    Args:
+        path (string): Where to write the tablebase
+        game_size (integer): Length of one side of the board
+        values (numpy.ndarray): Value of every position by index, from solve_tablebase
+    """
+
+    import numpy as np
+
+    padded = np.zeros((len(values) + 3) // 4 * 4, dtype=np.uint8)
+    padded[:len(values)] = values
+    quads = padded.reshape(-1, 4)
+    packed = quads[:, 0] | quads[:, 1] << 2 | quads[:, 2] << 4 | quads[:, 3] << 6
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_path = path + '.tmp'
+
+    with open(temporary_path, 'wb') as tablebase_file:
+        tablebase_file.write(TABLEBASE_HEADER.pack(TABLEBASE_MAGIC, game_size, len(values)))
+        tablebase_file.write(packed.astype(np.uint8).tobytes())
+
+    os.replace(temporary_path, path)
+
+
+def main():
+    """Builds the tablebases for the board sizes asked for on the command line"""
+
+    # Imported here, so the engine doesn't load it when it reads the tablebases
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build TicTacToe endgame tablebases")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(TABLEBASE_SIZES), choices=TABLEBASE_SIZES,
+                        help="board sizes to build tablebases for")
+    parser.add_argument('--workers', type=int, default=1, help="processes to solve each layer of positions across")
+    parser.add_argument('--directory', default=TABLEBASE_DIRECTORY, help="folder to write the tablebases to")
+    arguments = parser.parse_args()
+
+    for game_size in arguments.sizes:
+        start_time = time()
+        values = solve_tablebase(game_size, arguments.workers)
+        path = tablebase_path(game_size, arguments.directory)
+        write_tablebase(path, game_size, values)
+
+        empty_value = VALUE_NAMES[int(values[0])]
+        solved = int((values != UNKNOWN).sum())
+        print(f"{game_size}x{game_size}: {solved:,} positions solved in {time() - start_time:.1f}s, the empty board "
+              f"is a {empty_value}, written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Transposition table for the TicTacToe search engine.
+
+Positions reached through different move orders share a Zobrist hash, so their search results can be stored once and
+reused. Each bucket holds two entries: a depth-preferred slot that keeps whichever result was searched deepest, and
+an always-replace slot for everything else. Together they cap the table at a fixed number of entries.
+
+Every entry is stamped with the table's generation when stored. new_search starts a generation, so entries from
+earlier searches are still found but give up their depth-preferred slots to anything stored by the new one, and age
+out of the table as it fills. clear starts a generation too, and ignores every entry stamped before it, which empties
+the table without rebuilding its lists.
+"""
+
+EXACT = 0
+LOWER_BOUND = 1 # Search failed high, true score is at least the stored score
+UPPER_BOUND = 2 # Search failed low, true score is at most the stored score
+
+DEFAULT_TABLE_SIZE = 1 << 20
+
+
+class TranspositionTable:
+    """Fixed size cache of search results, keyed by Zobrist hash"""
+
+    def __init__(self, max_entries: int = DEFAULT_TABLE_SIZE):
+        """
+        Constructor. Starts an empty table.
+
+        Args:
+            max_entries (integer): Most entries the table will hold, split evenly between the two slots of each bucket
+        """
+
+        self.bucket_count = max(1, max_entries // 2)
+        self.depth_slots = [None] * self.bucket_count
+        self.recent_slots = [None] * self.bucket_count
+        self.depth_generations = [0] * self.bucket_count # Generation each slot's entry was stored in
+        self.recent_generations = [0] * self.bucket_count
+        self.generation = 1 # Stamped on the entries stored, raised by new_search and clear
+        self.oldest_valid = 1 # Entries stamped before this were stored before the last clear, and are ignored
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self):
+        oldest_valid = self.oldest_valid
+        return (sum(1 for entry, generation in zip(self.depth_slots, self.depth_generations)
+                    if entry and generation >= oldest_valid) +
+                sum(1 for entry, generation in zip(self.recent_slots, self.recent_generations)
+                    if entry and generation >= oldest_valid))
+
+    def clear(self):
+        """Empties the table and resets its hit counters"""
+
+        self.generation += 1
+        self.oldest_valid = self.generation
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """Ages the entries stored so far, they are still found but any entry stored from here on may replace them"""
+
+        self.generation += 1
+
+    def probe(self, key):
+        """
+        Looks up a position
+
+        Args:
+            key (int): Zobrist hash of the position and player to move
+
+        Returns:
+            (tuple): (key, depth, bound, score, turn count, best move) if stored, otherwise None
+        """
+
+        self.probes += 1
+        bucket = key % self.bucket_count
+
+        entry = self.depth_slots[bucket]
+        if entry is None or entry[0] != key or self.depth_generations[bucket] < self.oldest_valid:
+            entry = self.recent_slots[bucket]
+            if entry is None or entry[0] != key or self.recent_generations[bucket] < self.oldest_valid:
+                return None
+
+        self.hits += 1
+        return entry
+
+    def store(self, key, depth, bound, score, turn_count, best_move):
+        """
+        Saves a search result. It goes in the depth-preferred slot if it was searched at least as deep as what is
+        there, or is the same position, or what is there is from an earlier search. Otherwise it overwrites the
+        always-replace slot.
+
+        Args:
+            key (int): Zobrist hash of the position and player to move
+            depth (int): Number of turns searched below the position
+            bound (int): EXACT, LOWER_BOUND, or UPPER_BOUND
+            score (int): Score found for the position
+            turn_count (int): Turn count returned alongside the score
+            best_move (int): Bit index of the best move found, or None
+        """
+
+        bucket = key % self.bucket_count
+        entry = (key, depth, bound, score, turn_count, best_move)
+        generation = self.generation
+
+        current = self.depth_slots[bucket]
+        current_generation = self.depth_generations[bucket]
+        if current is None or current_generation < generation or current[0] == key or depth >= current[1]:
+            if current is not None and current[0] != key and current_generation >= self.oldest_valid:
+                # Keep the shallower or older result around until something else needs the slot
+                self.recent_slots[bucket] = current
+                self.recent_generations[bucket] = current_generation
+            self.depth_slots[bucket] = entry
+            self.depth_generations[bucket] = generation
+        else:
+            self.recent_slots[bucket] = entry
+            self.recent_generations[bucket] = generation
+
+    def hit_rate(self):
+        """
+        Returns:
+            (float): Fraction of probes that found their position, 0 if nothing was probed
+        """
+
+        if not self.probes:
+            return 0.0
+
+        return self.hits / self.probes
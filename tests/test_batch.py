@@ -0,0 +1,107 @@
+"""The NumPy batch evaluators agree with the bitboard, board by board and move by move"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from TicTacToe_Batch import evaluate_boards, heuristic_scores, line_counts, STATUS_NAMES
+from TicTacToe_Bitboard import Bitboard, GAME_VALS, BOARD_SIZES
+from TicTacToe_Engine import GAME_STATUS
+from TicTacToe_Evaluation import FrontierEvaluator, build_line_weights, score_weighted_lines, WIN_SCORE
+
+POSITIONS_PER_SIZE = 40
+
+
+def random_positions(game_size, seed):
+    """Boards partway through random games, some of them won, each with the player to move next"""
+
+    chooser = random.Random(seed)
+    positions = []
+    for _ in range(POSITIONS_PER_SIZE):
+        board = Bitboard(game_size)
+        whose_turn = chooser.choice([GAME_VALS['X'], GAME_VALS['O']])
+        spots = list(range(game_size ** 2))
+        chooser.shuffle(spots)
+        for index in spots[:chooser.randint(0, len(spots))]:
+            board.make_move(index, whose_turn)
+            whose_turn *= -1
+            if board.last_move_won():
+                break
+        positions.append((board, whose_turn))
+    return positions
+
+
+def bitboard_status(board):
+    if board.game_size in board.x_counts:
+        return GAME_STATUS['X_WON']
+    if board.game_size in board.o_counts:
+        return GAME_STATUS['O_WON']
+    if board.is_full():
+        return GAME_STATUS['TIE']
+    if not board.is_win_possible():
+        return GAME_STATUS['NO_WIN_POSSIBLE']
+    return GAME_STATUS['IN_PROGRESS']
+
+
+def wins_on(board, index, player):
+    board.make_move(index, player)
+    won = board.last_move_won()
+    board.unmake_move()
+    return won
+
+
+@pytest.mark.parametrize('game_size', BOARD_SIZES)
+def test_evaluate_boards_matches_the_bitboard(game_size):
+    positions = random_positions(game_size, game_size)
+    boards = np.array([[[board.to_game_data()[row, col] for col in range(game_size)] for row in range(game_size)]
+                       for board, _ in positions])
+
+    evaluation = evaluate_boards(boards, [whose_turn for _, whose_turn in positions])
+
+    for number, (board, whose_turn) in enumerate(positions):
+        assert STATUS_NAMES[evaluation['status'][number]] == bitboard_status(board)
+        assert (evaluation['x_score'][number], evaluation['o_score'][number]) == board.score_open_lines()
+
+        for index in board.available_moves():
+            row, col = board.coordinates_of(index)
+            assert evaluation['winning_moves'][number, row, col] == wins_on(board, index, whose_turn)
+            assert evaluation['blocking_moves'][number, row, col] == wins_on(board, index, -whose_turn)
+
+
+@pytest.mark.parametrize('game_size', BOARD_SIZES)
+def test_heuristic_scores_match_the_bitboard(game_size):
+    # Every spot filled at random, so full lines, and lines full for both players, come up often
+    boards = np.random.default_rng(game_size).integers(-1, 2, size=(POSITIONS_PER_SIZE, game_size, game_size),
+                                                      dtype=np.int8)
+
+    x_scores, o_scores = heuristic_scores(boards, *line_counts(boards))
+
+    for number, spots in enumerate(boards):
+        board = Bitboard.from_game_data({(row, col): int(spots[row, col]) for row in range(game_size)
+                                         for col in range(game_size)}, game_size)
+        assert (x_scores[number], o_scores[number]) == board.score_open_lines()
+
+
+@pytest.mark.parametrize('game_size', BOARD_SIZES)
+def test_frontier_evaluator_matches_scoring_each_move(game_size):
+    weights = build_line_weights(game_size)
+    evaluator = FrontierEvaluator(game_size, weights)
+
+    for board, whose_turn in random_positions(game_size, 100 + game_size):
+        if board.has_winner():
+            continue
+
+        scores = evaluator.score_moves(board, whose_turn)
+        for index in board.available_moves():
+            board.make_move(index, whose_turn)
+            if board.last_move_won():
+                expected = whose_turn * WIN_SCORE
+            else:
+                # Scored for the player moving next, as the search scores a position past the depth cutoff
+                x_score, o_score = score_weighted_lines(board, weights)
+                expected = o_score if whose_turn == GAME_VALS['X'] else x_score
+            board.unmake_move()
+
+            assert scores[index] == expected
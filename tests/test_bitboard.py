@@ -0,0 +1,109 @@
+"""The bitboard agrees with the original game's row by row win check and scoring, and its symmetry hashing"""
+
+import random
+
+import pytest
+
+from TicTacToe_Bitboard import Bitboard, GAME_VALS, BOARD_SIZES
+
+GAMES_PER_SIZE = 10
+
+
+def board_lines(game_data, game_size):
+    """Sets of the values on every row, column, and diagonal, as the original computer_check_for_win gathered them"""
+
+    lines = []
+    for rows in range(game_size):
+        lines.append({game_data[rows, cols] for cols in range(game_size)})
+        lines.append({game_data[cols, rows] for cols in range(game_size)})
+    lines.append({game_data[rows, rows] for rows in range(game_size)})
+    lines.append({game_data[rows, game_size - rows - 1] for rows in range(game_size)})
+    return lines
+
+
+def original_has_winner(game_data, game_size):
+    return any(len(checks) == 1 and GAME_VALS['EMPTY'] not in checks for checks in board_lines(game_data, game_size))
+
+
+def original_score(game_data, game_size):
+    """The original depth cutoff score: 2 per line of only X's and empty spots, -2 per line of only O's and empty"""
+
+    score = [0, 0]
+    for checks in board_lines(game_data, game_size):
+        if len(checks) == 2 and GAME_VALS['EMPTY'] in checks:
+            if GAME_VALS['X'] in checks:
+                score[0] += 2
+            else:
+                score[1] -= 2
+    return tuple(score)
+
+
+def random_games(game_size, seed):
+    """Yields the board after every move of random games, played until someone wins or the board fills up"""
+
+    chooser = random.Random(seed)
+    for _ in range(GAMES_PER_SIZE):
+        board = Bitboard(game_size)
+        whose_turn = chooser.choice([GAME_VALS['X'], GAME_VALS['O']])
+        spots = list(range(game_size ** 2))
+        chooser.shuffle(spots)
+        for index in spots:
+            board.make_move(index, whose_turn)
+            yield board
+            if board.last_move_won():
+                break
+            whose_turn *= -1
+
+
+@pytest.mark.parametrize('game_size', BOARD_SIZES)
+def test_win_check_matches_the_original(game_size):
+    for board in random_games(game_size, game_size):
+        game_data = board.to_game_data()
+        assert board.last_move_won() == original_has_winner(game_data, game_size)
+        assert board.has_winner() == original_has_winner(game_data, game_size)
+        if not board.last_move_won():
+            assert board.score_open_lines() == original_score(game_data, game_size)
+
+
+def test_unmake_move_restores_the_board():
+    board = Bitboard(4)
+    board.make_move(5, GAME_VALS['X'])
+    before = (board.x_bits, board.o_bits, board.hash, list(board.x_counts), list(board.o_counts),
+              board.score_open_lines())
+
+    board.make_move(6, GAME_VALS['O'])
+    board.unmake_move()
+
+    assert (board.x_bits, board.o_bits, board.hash, list(board.x_counts), list(board.o_counts),
+            board.score_open_lines()) == before
+
+
+def transformed(board, symmetry):
+    """The board's position moved by one of its symmetries"""
+
+    permutation = board.symmetries[symmetry]
+    x_bits = sum(1 << permutation[index] for index in range(board.game_size ** 2) if board.x_bits >> index & 1)
+    o_bits = sum(1 << permutation[index] for index in range(board.game_size ** 2) if board.o_bits >> index & 1)
+    return Bitboard.from_bits(board.game_size, x_bits, o_bits)
+
+
+@pytest.mark.parametrize('game_size', BOARD_SIZES)
+def test_canonical_form_is_the_same_for_every_mirror_image(game_size):
+    for board in random_games(game_size, 100 + game_size):
+        for whose_turn in (GAME_VALS['X'], GAME_VALS['O']):
+            key, symmetry, self_symmetries = board.canonical_form(whose_turn)
+            for other_symmetry in range(8):
+                assert transformed(board, other_symmetry).canonical_form(whose_turn)[0] == key
+
+            # The symmetry reported maps the position onto the one the key was taken from
+            assert transformed(board, symmetry).hash_for_turn(whose_turn) == key
+            for self_symmetry in self_symmetries:
+                image = transformed(board, self_symmetry)
+                assert (image.x_bits, image.o_bits) == (board.x_bits, board.o_bits)
+
+
+def test_canonical_form_tells_the_player_to_move_apart():
+    board = Bitboard(3)
+    board.make_move(4, GAME_VALS['X'])
+
+    assert board.canonical_form(GAME_VALS['X'])[0] != board.canonical_form(GAME_VALS['O'])[0]
@@ -0,0 +1,53 @@
+"""Checks on TicTacToeGame's search that don't need a tablebase or an opening book"""
+
+import os
+import subprocess
+import sys
+
+from TicTacToe_Bitboard import GAME_VALS
+from TicTacToe_Engine import TicTacToeGame, parse_board
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_game(board_text, whose_turn, **settings):
+    game_size, x_bits, o_bits = parse_board(board_text)
+    game = TicTacToeGame(game_size, use_opening_book=False, use_tablebase=False, **settings)
+    game.set_position(x_bits, o_bits, whose_turn)
+    return game
+
+
+def test_deepening_stops_at_the_end_of_a_set_position():
+    game = make_game("XO./.X./O.X", GAME_VALS['O'], time_budget=5.0)
+
+    game.search_next_move()
+
+    # Four empty spots, so depth 3 already searches to the end of the game
+    assert game.completed_depth == 3
+
+
+def test_move_ordering_defaults_on_for_negamax_searches_only():
+    assert not make_game("X../.O./...", GAME_VALS['X'], search_algorithm='minimax').use_move_ordering
+    assert make_game("X../.O./...", GAME_VALS['X'], search_algorithm='pvs').use_move_ordering
+    assert make_game("X../.O./...", GAME_VALS['X'], search_algorithm='mtdf').use_move_ordering
+
+
+def test_minimax_scores_match_the_unordered_search():
+    default_game = make_game("X.../.O../..X./....", GAME_VALS['O'], search_algorithm='minimax')
+    unordered_game = make_game("X.../.O../..X./....", GAME_VALS['O'], search_algorithm='minimax',
+                               use_move_ordering=False)
+
+    default_game.search_next_move()
+    unordered_game.search_next_move()
+
+    assert default_game.possible_final_moves == unordered_game.possible_final_moves
+
+
+def test_default_game_leaves_build_dependencies_unloaded():
+    # Run in a fresh interpreter, as other tests load these modules into this one
+    check = ("import sys; from TicTacToe_Engine import new_game; new_game(3); "
+             "print(sorted(name for name in ('numpy', 'sqlite3') if name in sys.modules))")
+    loaded = subprocess.run([sys.executable, '-c', check], cwd=REPO_DIRECTORY, capture_output=True, text=True,
+                            check=True).stdout.strip()
+
+    assert loaded == '[]'
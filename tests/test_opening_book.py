@@ -0,0 +1,17 @@
+"""Opening books written to disk are read back, and picked up once built"""
+
+from TicTacToe_Bitboard import Bitboard, GAME_VALS
+from TicTacToe_OpeningBook import OpeningBook, write_opening_book, book_path
+
+
+def test_book_built_after_a_failed_load_is_picked_up(tmp_path):
+    directory = str(tmp_path)
+    assert OpeningBook.load(3, directory) is None
+
+    key, _, _ = Bitboard(3).canonical_form(GAME_VALS['X'])
+    write_opening_book(book_path(3, directory), 3, 1, {key: (4, 0)})
+    book = OpeningBook.load(3, directory)
+    try:
+        assert book.lookup(key) == (4, 0)
+    finally:
+        book.close()
@@ -0,0 +1,27 @@
+"""The parallel root search plays moves as good as the single process search, at the same depth"""
+
+import pytest
+
+from TicTacToe_Benchmark import benchmark_positions
+from TicTacToe_Bitboard import GAME_VALS
+from TicTacToe_Engine import TicTacToeGame
+
+
+def best_score(game_size, x_bits, o_bits, whose_turn, **settings):
+    game = TicTacToeGame(game_size, use_opening_book=False, use_tablebase=False, **settings)
+    game.set_position(x_bits, o_bits, whose_turn)
+    try:
+        game.search_next_move()
+    finally:
+        game.shutdown_workers()
+
+    scores = game.possible_final_moves.values()
+    return max(scores) if whose_turn == GAME_VALS['X'] else min(scores)
+
+
+@pytest.mark.parametrize('search_algorithm', ['minimax', 'pvs', 'mtdf'])
+def test_parallel_best_score_matches(search_algorithm):
+    for _, game_size, x_bits, o_bits, whose_turn in benchmark_positions([3, 4, 5]):
+        serial = best_score(game_size, x_bits, o_bits, whose_turn, search_algorithm=search_algorithm)
+        parallel = best_score(game_size, x_bits, o_bits, whose_turn, search_algorithm=search_algorithm, workers=2)
+        assert parallel == serial
@@ -0,0 +1,176 @@
+"""Round trips through the move service: games, searches, and the errors a client can get back"""
+
+import asyncio
+import json
+
+import pytest
+
+import TicTacToe_Service
+from TicTacToe_Bitboard import GAME_VALS
+from TicTacToe_Service import MoveService, send_request, search_in_worker, MAX_IN_FLIGHT_PER_CONNECTION
+
+REPLY_TIMEOUT = 30.0
+
+
+def run_session(requests, patch_service=None):
+    """Starts a service on a free port, sends the requests in order on one connection, and returns the replies"""
+
+    async def session():
+        service = MoveService(workers=1)
+        if patch_service is not None:
+            patch_service(service)
+        server = await service.serve(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            # A request left unanswered fails the test rather than hanging it
+            return [await asyncio.wait_for(send_request(reader, writer, request), REPLY_TIMEOUT)
+                    for request in requests]
+        finally:
+            writer.close()
+            await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+            service.shutdown()
+
+    return asyncio.run(session())
+
+
+def test_game_round_trip():
+    replies = run_session([
+        {'id': 1, 'op': 'new_game', 'size': 3, 'first_player': 'X', 'settings': {'use_opening_book': False}},
+        {'id': 2, 'op': 'move', 'game_id': 1, 'move': [1, 1]},
+        {'id': 3, 'op': 'best_move', 'game_id': 1, 'play': True},
+        {'id': 4, 'op': 'close_game', 'game_id': 1},
+        {'id': 5, 'op': 'metrics'}
+    ])
+
+    assert [reply['id'] for reply in replies] == [1, 2, 3, 4, 5]
+    assert all(reply['ok'] for reply in replies)
+    assert replies[1]['board'] == '.../.X./...'
+    assert replies[2]['turn'] == 'X'
+    assert replies[2]['board'].count('O') == 1
+    assert replies[4]['metrics']['counts']['searches_completed'] == 1
+
+
+def test_best_move_for_a_board():
+    reply, = run_session([{'id': 1, 'op': 'best_move', 'board': 'XX./OO./...', 'turn': 'X'}])
+
+    assert reply['ok']
+    assert reply['move'] in ([0, 2], [1, 2], [2, 0], [2, 1], [2, 2])
+
+
+@pytest.mark.parametrize('request_fields, error', [
+    ({'op': 'fly'}, 'bad_request'),
+    ({'op': 'new_game', 'size': 2}, 'bad_request'),
+    ({'op': 'new_game', 'size': 3, 'settings': {'not_a_setting': 1}}, 'bad_request'),
+    ({'op': 'move', 'game_id': 7, 'move': [0, 0]}, 'unknown_game'),
+    ({'op': 'best_move', 'board': 'XXX/OO./...', 'turn': 'O'}, 'game_over')
+])
+def test_errors(request_fields, error):
+    reply, = run_session([dict(request_fields, id=1)])
+
+    assert reply == {'ok': False, 'error': error, 'message': reply['message'], 'id': 1}
+
+
+def test_bad_json_is_answered():
+    async def session():
+        service = MoveService(workers=1)
+        server = await service.serve(port=0)
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+        writer.write(b'{not json\n')
+        await writer.drain()
+        reply = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+        server.close()
+        service.shutdown()
+        return reply
+
+    assert b'"bad_request"' in asyncio.run(session())
+
+
+def test_requests_are_answered_after_the_client_stops_sending():
+    async def session():
+        service = MoveService(workers=1)
+        server = await service.serve(port=0)
+        reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+        writer.write(b'{"id": 1, "op": "best_move", "board": "X../.O./...", "turn": "X"}\n'
+                     b'{"id": 2, "op": "metrics"}\n')
+        await writer.drain()
+        writer.write_eof()
+        try:
+            return [json.loads(await asyncio.wait_for(reader.readline(), REPLY_TIMEOUT)) for _ in range(2)]
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            service.shutdown()
+
+    replies = asyncio.run(session())
+
+    assert sorted(reply['id'] for reply in replies) == [1, 2]
+    assert all(reply['ok'] for reply in replies)
+
+
+def test_new_game_takes_a_table_size():
+    reply, = run_session([{'id': 1, 'op': 'new_game', 'size': 3, 'settings': {'table_size': 1024}}])
+
+    assert reply['ok']
+
+
+def test_internal_errors_are_answered_and_free_their_slot():
+    failures = MAX_IN_FLIGHT_PER_CONNECTION + 1
+
+    def break_dispatch(service):
+        original_dispatch = service.dispatch
+
+        async def dispatch(request, games):
+            if request['op'] == 'metrics' and request['id'] <= failures:
+                raise RuntimeError("boom")
+            return await original_dispatch(request, games)
+
+        service.dispatch = dispatch
+
+    replies = run_session([{'id': number, 'op': 'metrics'} for number in range(1, failures + 2)], break_dispatch)
+
+    assert [reply['error'] for reply in replies[:failures]] == ['internal_error'] * failures
+    assert replies[-1]['ok']
+    assert replies[-1]['metrics']['counts']['internal_errors'] == failures
+
+
+def test_worker_games_ignore_budgets_and_stay_bounded(monkeypatch):
+    monkeypatch.setattr(TicTacToe_Service, '_worker_games', TicTacToe_Service.OrderedDict())
+    settings = {'use_opening_book': False, 'workers': 1, 'search_log_path': None, 'table_size': 1024}
+
+    for budget in (0.1, 0.2, 0.3):
+        search_in_worker(3, 0, 0, 1, dict(settings, time_budget=budget), 1.0)
+    assert len(TicTacToe_Service._worker_games) == 1
+
+    for depth in range(1, 8):
+        search_in_worker(3, 0, 0, 1, dict(settings, max_depth=depth), 1.0)
+    assert len(TicTacToe_Service._worker_games) == TicTacToe_Service.MAX_WORKER_GAMES
+
+
+def test_cancelled_search_keeps_its_worker_until_it_ends():
+    settings = {'use_opening_book': False, 'use_tablebase': False, 'workers': 1, 'search_log_path': None}
+
+    async def session():
+        service = MoveService(workers=1)
+        try:
+            # A 4x4 search from the empty board deepens until the time budget taken from its deadline runs out
+            search = asyncio.create_task(service.search(4, 0, 0, GAME_VALS['X'], settings, 1.0))
+            await asyncio.sleep(0.3)
+            search.cancel()
+            await asyncio.sleep(0.1)
+            while_searching = (service.running, service.worker_slots.locked())
+
+            await asyncio.sleep(2.0)
+            return while_searching, (service.running, service.worker_slots.locked())
+        finally:
+            service.shutdown()
+
+    while_searching, after = asyncio.run(session())
+
+    assert while_searching == (1, True)
+    assert after == (0, False)
@@ -0,0 +1,100 @@
+"""Checks the 3x3 tablebase against a full search, and that the engine only plays from it where it is solved"""
+
+import pytest
+
+from TicTacToe_Bitboard import Bitboard, GAME_VALS
+from TicTacToe_Engine import TicTacToeGame, parse_board
+from TicTacToe_Tablebase import Tablebase, solve_tablebase, write_tablebase, tablebase_path, WIN, DRAW, LOSS, UNKNOWN
+
+pytest.importorskip('numpy', reason="building a tablebase needs NumPy")
+
+
+@pytest.fixture(scope='module')
+def tablebase(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('tablebases'))
+    write_tablebase(tablebase_path(3, directory), 3, solve_tablebase(3))
+    tablebase = Tablebase.load(3, directory)
+    yield tablebase
+    tablebase.close()
+
+
+def negamax_value(board, whose_turn, cache):
+    """Exact value of a 3x3 position for the player to move: 1 win, 0 draw, -1 loss"""
+
+    key = (board.x_bits, board.o_bits, whose_turn)
+    if key not in cache:
+        if board.last_move_won():
+            value = -1
+        elif board.is_full():
+            value = 0
+        else:
+            value = -1
+            for move in board.available_moves():
+                board.make_move(move, whose_turn)
+                value = max(value, -negamax_value(board, -whose_turn, cache))
+                board.unmake_move()
+        cache[key] = value
+    return cache[key]
+
+
+def test_values_match_a_full_search(tablebase):
+    cache = {}
+    board = Bitboard(3)
+    negamax_value(board, GAME_VALS['X'], cache)
+
+    assert len(cache) > 5000
+    for (x_bits, o_bits, whose_turn), value in cache.items():
+        if whose_turn == GAME_VALS['X']:
+            mover_bits, other_bits = x_bits, o_bits
+        else:
+            mover_bits, other_bits = o_bits, x_bits
+        assert tablebase.value(mover_bits, other_bits) == {1: WIN, 0: DRAW, -1: LOSS}[value]
+
+
+def test_empty_board_is_a_draw(tablebase):
+    assert tablebase.value(0, 0) == DRAW
+    assert set(tablebase.move_values(0, 0, GAME_VALS['X']).values()) == {DRAW}
+
+
+def test_unreached_positions_stay_unknown(tablebase):
+    _, x_bits, o_bits = parse_board("XX./.../...")
+    assert set(tablebase.move_values(x_bits, o_bits, GAME_VALS['X']).values()) == {UNKNOWN}
+
+
+def test_engine_searches_positions_missing_from_the_tablebase(tablebase):
+    _, x_bits, o_bits = parse_board("XX./.../...")
+    game = TicTacToeGame(3, use_opening_book=False)
+    game.tablebase = tablebase
+    game.set_position(x_bits, o_bits, GAME_VALS['X'])
+
+    coordinates, search_stats = game.find_next_move_for_computer()
+
+    assert search_stats.source == 'search'
+    assert game.game_data[coordinates] == GAME_VALS['EMPTY']
+
+
+def test_engine_plays_from_the_tablebase(tablebase):
+    _, x_bits, o_bits = parse_board("XO./.X./..O")
+    game = TicTacToeGame(3, use_opening_book=False)
+    game.tablebase = tablebase
+    game.set_position(x_bits, o_bits, GAME_VALS['X'])
+
+    coordinates, search_stats = game.find_next_move_for_computer()
+
+    assert search_stats.source == 'tablebase'
+    # Any move that keeps the win, the tablebase prefers those that win at once
+    board = Bitboard.from_bits(3, x_bits, o_bits)
+    board.make_move(board.index_of(coordinates), GAME_VALS['X'])
+    assert tablebase.value(board.o_bits, board.x_bits) == LOSS
+
+
+def test_tablebase_built_after_a_failed_load_is_picked_up(tmp_path):
+    directory = str(tmp_path)
+    assert Tablebase.load(3, directory) is None
+
+    write_tablebase(tablebase_path(3, directory), 3, solve_tablebase(3))
+    tablebase = Tablebase.load(3, directory)
+    try:
+        assert tablebase is not None
+    finally:
+        tablebase.close()